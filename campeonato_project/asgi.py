@@ -3,6 +3,11 @@ ASGI config for campeonato_project project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Os eventos ao vivo (/ao-vivo/) precisam deste ponto de entrada para manter
+as conexões abertas sem uma thread por cliente, por exemplo:
+
+    uvicorn campeonato_project.asgi:application
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
@@ -31,6 +31,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricasConsultasMiddleware',
+    'core.middleware.ReplicaLeituraMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -65,13 +67,77 @@ WSGI_APPLICATION = 'campeonato_project.wsgi.application'
 
 
 # Database
+# LIGAPRO_BANCO=<arquivo> troca o banco (ex.: uma cópia descartável)
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('LIGAPRO_BANCO', BASE_DIR / 'db.sqlite3'),
     }
 }
 
+# Perfil do SQLite (opt-in com LIGAPRO_SQLITE=producao): WAL, para leituras e
+# escritas não esperarem umas pelas outras, e os demais PRAGMAs de
+# core.sqlite.PERFIS, aplicados a cada conexão nova; conexões reaproveitadas
+# entre requisições; e transações que pedem a trava de escrita já no BEGIN,
+# onde o busy_timeout funciona (com DEFERRED, duas escritas simultâneas
+# falham com "database is locked"). Compare com "manage.py benchmark_sqlite".
+SQLITE_PERFIL = os.environ.get('LIGAPRO_SQLITE', 'padrao')
+if SQLITE_PERFIL == 'producao':
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+    })
+
+# Réplica de leitura (opt-in com LIGAPRO_REPLICA=<arquivo>, mantido em dia
+# por uma ferramenta de replicação do SQLite): os GETs das views públicas
+# (core.views e core.api) leem dela; escritas, painel, admin e worker usam o
+# primário (core.roteamento). A réplica pode estar até REPLICA_ATRASO_MAXIMO
+# segundos atrás: nesse intervalo depois de uma escrita, quem escreveu lê do
+# primário, e todos leem de lá se a escrita foi nos dados da liga.
+DATABASE_ROUTERS = ['core.roteamento.RoteadorReplica']
+REPLICA_ATRASO_MAXIMO = 10
+if os.environ.get('LIGAPRO_REPLICA'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['LIGAPRO_REPLICA'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+
+# Cache
+# O cache de páginas públicas (core/cache.py) é invalidado trocando uma versão
+# guardada no próprio cache, e o worker entrega a simulação da temporada por
+# ele: todos os processos (servidor, worker, comandos do manage.py) precisam
+# enxergar o mesmo cache. O FileBasedCache (LIGAPRO_CACHE=<pasta>) é
+# compartilhado pelos processos da mesma máquina; com servidores em mais de
+# uma máquina, use Redis ou Memcached.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('LIGAPRO_CACHE', BASE_DIR / 'cache'),
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+}
+
+# Os testes usam um cache próprio, numa pasta temporária (core/testes.py)
+TEST_RUNNER = 'core.testes.ExecutorTestes'
+
+# Validade máxima das páginas em cache, em segundos. As escritas já invalidam
+# tudo; o limite cobre o que muda só com o relógio (ex.: próximos jogos).
+CACHE_PAGINAS_TIMEOUT = 300
+
+# Pub/sub dos eventos ao vivo (SSE em /ao-vivo/). O BarramentoLocal vale só
+# dentro do processo; com vários processos use um backend compartilhado.
+EVENTOS_BACKEND = 'core.eventos.BarramentoLocal'
+
+# Simulações e processos usados pelo worker na simulação da temporada
+# (/probabilidades/). Com o numpy (requirements.txt), 100 mil simulações
+# levam cerca de um segundo; sem ele o cálculo cai para Python puro, uns
+# 30 s. O resultado chega às páginas pelo cache compartilhado (CACHES).
+SIMULACAO_QUANTIDADE = 100_000
+SIMULACAO_PROCESSOS = 1
+
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -107,10 +173,16 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# As miniaturas em media/miniaturas/ têm o hash do conteúdo no nome (core.imagens):
+# em produção, sirva essa pasta com "Cache-Control: public, max-age=31536000, immutable"
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Métricas de consultas SQL por requisição (cabeçalho Server-Timing sempre;
+# log no logger 'core.consultas' apenas quando ativado)
+LOG_CONSULTAS = False
+
 # Authentication settings
 LOGIN_REDIRECT_URL = '/times/'
 LOGOUT_REDIRECT_URL = '/times/'
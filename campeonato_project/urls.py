@@ -9,6 +9,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('core.urls')),
     path('painel/', include('painel.urls')),
+    path('api/v1/', include('core.urls_api')),
     path('accounts/', include('django.contrib.auth.urls')),  # <-- ADICIONE ESTA LINHA
 ]
 
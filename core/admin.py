@@ -1,7 +1,11 @@
 # core/admin.py
 
 from django.contrib import admin
-from .models import Time, Jogador, Jogo, Gol
+from django.db import transaction
+from django.utils import timezone
+from .imagens import agendar_miniaturas
+from .models import Time, Jogador, Jogo, Gol, Tarefa
+from .standings import contribuicao, atualizar_classificacao, reconstruir_classificacao
 
 class JogadorInline(admin.TabularInline):
     model = Jogador
@@ -40,6 +44,23 @@ class TimeAdmin(admin.ModelAdmin):
     )
     
     readonly_fields = ['data_criacao']
+    
+    def save_model(self, request, obj, form, change):
+        if 'logo' in form.changed_data:
+            obj.logo_assinatura = ''
+        super().save_model(request, obj, form, change)
+        if 'logo' in form.changed_data:
+            agendar_miniaturas(obj, 'logo')
+    
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            reconstruir_classificacao()
+    
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            super().delete_queryset(request, queryset)
+            reconstruir_classificacao()
 
 
 @admin.register(Jogador)
@@ -56,6 +77,13 @@ class JogadorAdmin(admin.ModelAdmin):
             'classes': ('wide',)
         }),
     )
+    
+    def save_model(self, request, obj, form, change):
+        if 'foto' in form.changed_data:
+            obj.foto_assinatura = ''
+        super().save_model(request, obj, form, change)
+        if 'foto' in form.changed_data:
+            agendar_miniaturas(obj, 'foto')
 
 
 @admin.register(Jogo)
@@ -80,15 +108,43 @@ class JogoAdmin(admin.ModelAdmin):
         request._obj_ = obj
         return super().get_form(request, obj, **kwargs)
     
+    def save_model(self, request, obj, form, change):
+        antes = contribuicao(Jogo.objects.get(pk=obj.pk)) if change else {}
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            atualizar_classificacao(antes, contribuicao(obj))
+    
+    def delete_model(self, request, obj):
+        antes = contribuicao(obj)
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            atualizar_classificacao(antes)
+    
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            antes = contribuicao(*queryset)
+            super().delete_queryset(request, queryset)
+            atualizar_classificacao(antes)
+    
     actions = ['marcar_como_realizado', 'marcar_como_nao_realizado']
     
+    def _alterar_realizado(self, queryset, realizado):
+        with transaction.atomic():
+            jogos = list(queryset.exclude(realizado=realizado))
+            antes = contribuicao(*jogos)
+            count = queryset.update(realizado=realizado)
+            for jogo in jogos:
+                jogo.realizado = realizado
+            atualizar_classificacao(antes, contribuicao(*jogos))
+        return count
+    
     def marcar_como_realizado(self, request, queryset):
-        count = queryset.update(realizado=True)
+        count = self._alterar_realizado(queryset, True)
         self.message_user(request, f"{count} jogo{'s' if count > 1 else ''} marcado{'s' if count > 1 else ''} como realizado{'s' if count > 1 else ''}.")
     marcar_como_realizado.short_description = "Marcar como realizados"
     
     def marcar_como_nao_realizado(self, request, queryset):
-        count = queryset.update(realizado=False)
+        count = self._alterar_realizado(queryset, False)
         self.message_user(request, f"{count} jogo{'s' if count > 1 else ''} marcado{'s' if count > 1 else ''} como não realizado{'s' if count > 1 else ''}.")
     marcar_como_nao_realizado.short_description = "Marcar como não realizados"
 
@@ -105,4 +161,21 @@ class GolAdmin(admin.ModelAdmin):
             'fields': ('jogo', 'jogador', 'time', 'minuto', 'tipo', 'contra'),
             'classes': ('wide',)
         }),
-    )
\ No newline at end of file
+    )
+
+@admin.register(Tarefa)
+class TarefaAdmin(admin.ModelAdmin):
+    list_display = ['nome', 'estado', 'tentativas', 'executar_em', 'criada_em', 'concluida_em']
+    list_filter = ['estado', 'nome']
+    search_fields = ['nome', 'chave']
+    readonly_fields = ['nome', 'argumentos', 'chave', 'tentativas', 'erro', 'criada_em', 'iniciada_em', 'reservada_ate', 'concluida_em']
+    list_per_page = 50
+    
+    actions = ['reenfileirar']
+    
+    def reenfileirar(self, request, queryset):
+        count = queryset.exclude(estado=Tarefa.EXECUTANDO).update(
+            estado=Tarefa.PENDENTE, tentativas=0, erro='', executar_em=timezone.now()
+        )
+        self.message_user(request, f"{count} tarefa{'s' if count > 1 else ''} de volta à fila.")
+    reenfileirar.short_description = "Executar novamente"
@@ -0,0 +1,182 @@
+# core/api.py
+"""
+API JSON somente leitura (``/api/v1/``), para apps e widgets de placar.
+As views são assíncronas e usam as mesmas consultas agregadas das
+páginas, serializando as linhas direto do ``.values()``.
+"""
+
+from dataclasses import asdict
+from datetime import datetime, timezone as dt_timezone
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from django.http import JsonResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.views.decorators.cache import cache_control
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import condition, require_safe
+
+from .busca import LIMITE, buscar
+from .cache import validadores
+from .metricas import orcamento_consultas
+from .models import Time, Jogador, Jogo
+from .paginacao import codificar_cursor, converter_cursor, decodificar_cursor, filtro_keyset
+from .scorers import artilheiros
+from .standings import CAMPOS_CLASSIFICACAO, classificacao_na_rodada, ler_classificacao
+
+POR_PAGINA = 50
+MAX_POR_PAGINA = 200
+
+CAMPOS_JOGO = ('id', 'rodada', 'data_jogo', 'local', 'realizado', 'gols_casa', 'gols_visitante')
+NOMES_JOGO = {'casa': F('time_casa__nome'), 'visitante': F('time_visitante__nome')}
+
+
+def _etag(request, *args, **kwargs):
+    return validadores('api')[0]
+
+
+def _modificado(request, *args, **kwargs):
+    return datetime.fromtimestamp(validadores('api')[1], tz=dt_timezone.utc)
+
+
+def endpoint(orcamento):
+    """
+    Decoradores comuns dos endpoints: só GET/HEAD, gzip, ETag e Last-Modified
+    pela versão dos dados (304 sem consultar o banco) e revalidação sempre.
+    """
+    def decorador(view):
+        view = condition(etag_func=_etag, last_modified_func=_modificado)(view)
+        view = cache_control(no_cache=True)(view)
+        view = gzip_page(view)
+        view = require_safe(view)
+        return orcamento_consultas(orcamento)(view)
+    return decorador
+
+
+def _erro(mensagem, status):
+    return JsonResponse({'erro': mensagem}, status=status)
+
+
+def _inteiro(valor, padrao=None):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return padrao
+
+
+async def _pagina(request, queryset, campos_cursor):
+    """
+    Resposta com a página de ``queryset`` (já ordenado e com ``.values()``)
+    a partir do ``?cursor=``, com ``limite`` linhas. ``campos_cursor`` são
+    as chaves da linha que formam o cursor, na mesma ordem do ``order_by``.
+    Cursor com valores adulterados: 400.
+    """
+    limite = min(max(_inteiro(request.GET.get('limite'), POR_PAGINA), 1), MAX_POR_PAGINA)
+    ordem = queryset.query.order_by
+    valores = decodificar_cursor(request.GET.get('cursor'), len(ordem))
+    if valores is not None:
+        try:
+            valores = converter_cursor(queryset, valores)
+        except (ValidationError, ValueError, TypeError):
+            return _erro('Cursor inválido.', 400)
+        queryset = queryset.filter(filtro_keyset(ordem, valores))
+
+    linhas = [linha async for linha in queryset[:limite + 1]]
+    proximo = None
+    if len(linhas) > limite:
+        linhas = linhas[:limite]
+        proximo = codificar_cursor([linhas[-1][campo] for campo in campos_cursor])
+    return JsonResponse({'resultados': linhas, 'proximo': proximo})
+
+
+@endpoint(orcamento=2)
+async def tabela(request):
+    """Classificação atual, ou como estava ao fim de ``?rodada=``."""
+    rodada = _inteiro(request.GET.get('rodada'))
+    rodada_efetiva = None
+    if rodada is not None:
+        rodada_efetiva, classificacao = await sync_to_async(classificacao_na_rodada)(rodada)
+        if classificacao is None:
+            return _erro('Rodada sem jogos realizados.', 404)
+    else:
+        classificacao = ler_classificacao()
+
+    linhas = classificacao.values('time_id', *CAMPOS_CLASSIFICACAO, time_nome=F('time__nome'))
+    resultados = [
+        {'posicao': posicao, **linha}
+        async for posicao, linha in _enumerar(linhas)
+    ]
+    return JsonResponse({'rodada': rodada_efetiva, 'resultados': resultados})
+
+
+async def _enumerar(linhas, inicio=1):
+    posicao = inicio
+    async for linha in linhas:
+        yield posicao, linha
+        posicao += 1
+
+
+@endpoint(orcamento=1)
+async def jogos(request):
+    """Jogos do mais recente para o mais antigo, filtráveis por rodada, time e situação."""
+    consulta = Jogo.objects.all()
+    rodada = _inteiro(request.GET.get('rodada'))
+    if rodada is not None:
+        consulta = consulta.filter(rodada=rodada)
+    time_id = _inteiro(request.GET.get('time'))
+    if time_id is not None:
+        consulta = consulta.filter(Q(time_casa_id=time_id) | Q(time_visitante_id=time_id))
+    situacao = request.GET.get('situacao')
+    if situacao == 'realizados':
+        consulta = consulta.filter(realizado=True)
+    elif situacao == 'agendados':
+        consulta = consulta.filter(realizado=False, data_jogo__gte=timezone.now())
+
+    consulta = consulta.order_by('-data_jogo', '-id').values(
+        *CAMPOS_JOGO, 'time_casa_id', 'time_visitante_id', **NOMES_JOGO
+    )
+    return await _pagina(request, consulta, ['data_jogo', 'id'])
+
+
+@endpoint(orcamento=1)
+async def artilharia(request):
+    """Ranking de artilheiros, geral ou de um time (``?time=``)."""
+    time_id = _inteiro(request.GET.get('time'))
+    # Mesma consulta da página de artilharia; a ordem do ranking já termina em ``id``
+    consulta = artilheiros(time_id).values('id', 'nome', 'time_id', 'total_gols', time_nome=F('time__nome'))
+    return await _pagina(request, consulta, ['total_gols', 'nome', 'id'])
+
+
+@endpoint(orcamento=3)
+async def detalhe_time(request, time_id):
+    """Time, campanha (da classificação persistida) e elenco ativo."""
+    time = await Time.objects.filter(id=time_id).values('id', 'nome').afirst()
+    if time is None:
+        return _erro('Time não encontrado.', 404)
+
+    campanha = await ler_classificacao().filter(time_id=time_id).values(*CAMPOS_CLASSIFICACAO).afirst()
+    elenco = Jogador.objects.filter(time_id=time_id, ativo=True).order_by('posicao', 'numero').values(
+        'id', 'nome', 'numero', 'posicao', 'gols_marcados'
+    )
+    return JsonResponse({
+        **time,
+        'campanha': campanha or dict.fromkeys(CAMPOS_CLASSIFICACAO, 0),
+        'elenco': [jogador async for jogador in elenco],
+    })
+
+
+@endpoint(orcamento=2)
+async def busca(request):
+    """
+    Autocompletar de times e jogadores (``?q=``, prefixo de cada palavra,
+    sem diferenciar acentos), do mais relevante para o menos.
+    """
+    limite = min(max(_inteiro(request.GET.get('limite'), LIMITE), 1), MAX_POR_PAGINA)
+    resultados = await sync_to_async(buscar)(request.GET.get('q', ''), limite)
+    return JsonResponse({'resultados': [
+        {**asdict(resultado), 'url': reverse('detalhe_time', args=[resultado.time_id])}
+        for resultado in resultados
+    ]})
+
@@ -0,0 +1,103 @@
+# core/benchmark.py
+
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from importlib import import_module
+
+from django.urls import reverse
+
+from .metricas import medir_consultas
+from .models import Time, Jogador, Jogo, Gol
+
+# (urlconf, namespace, exige login de staff)
+URLCONFS = [
+    ('core.urls', '', False),
+    ('painel.urls', 'painel:', True),
+    ('core.urls_api', 'api:', False),
+]
+
+
+@dataclass(slots=True)
+class ResultadoRota:
+    rota: str
+    url: str
+    status: int
+    p50_ms: float
+    p95_ms: float
+    consultas: int
+    orcamento: int | None
+    pico_memoria_kb: float
+
+    def como_dict(self):
+        return asdict(self)
+
+
+def argumentos_rotas():
+    """Ids usados para montar as URLs com parâmetro (o primeiro de cada tabela)."""
+    return {
+        'time_id': Time.objects.order_by('id').values_list('id', flat=True).first(),
+        'jogador_id': Jogador.objects.order_by('id').values_list('id', flat=True).first(),
+        'jogo_id': Jogo.objects.order_by('id').values_list('id', flat=True).first(),
+        'gol_id': Gol.objects.order_by('id').values_list('id', flat=True).first(),
+    }
+
+
+def rotas(urlconf, namespace='', kwargs=None):
+    """(nome, url, view) de cada rota do urlconf, com os parâmetros de ``kwargs``."""
+    kwargs = kwargs or {}
+    for padrao in import_module(urlconf).urlpatterns:
+        url = reverse(namespace + padrao.name, kwargs={nome: kwargs[nome] for nome in padrao.pattern.converters})
+        yield namespace + padrao.name, url, padrao.callback
+
+
+def percentil(valores, p):
+    """Percentil ``p`` (0-100) pelo método do posto mais próximo."""
+    ordenados = sorted(valores)
+    posto = max(1, -(-len(ordenados) * p // 100))
+    return ordenados[int(posto) - 1]
+
+
+def medir_rota(client, url, repeticoes=20):
+    """
+    Faz ``repeticoes`` GETs em ``url`` e mede latência (p50/p95), consultas
+    por requisição e pico de memória alocada. A memória é medida em uma
+    requisição à parte, para o ``tracemalloc`` não distorcer as latências.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        with medir_consultas() as coletor:
+            inicio = time.perf_counter()
+            response = client.get(url)
+            tempos.append((time.perf_counter() - inicio) * 1000)
+
+    ja_rastreando = tracemalloc.is_tracing()
+    if not ja_rastreando:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    client.get(url)
+    pico = tracemalloc.get_traced_memory()[1] - base
+    if not ja_rastreando:
+        tracemalloc.stop()
+
+    return response.status_code, percentil(tempos, 50), percentil(tempos, 95), coletor.total, pico / 1024
+
+
+def medir_rotas(client, urlconf, namespace='', kwargs=None, repeticoes=20):
+    """Mede todas as rotas de um urlconf; retorna uma lista de ``ResultadoRota``."""
+    resultados = []
+    for nome, url, view in rotas(urlconf, namespace, kwargs):
+        client.get(url)  # aquecimento (templates, caches do Django)
+        status, p50, p95, consultas, pico = medir_rota(client, url, repeticoes)
+        resultados.append(ResultadoRota(
+            rota=nome,
+            url=url,
+            status=status,
+            p50_ms=round(p50, 2),
+            p95_ms=round(p95, 2),
+            consultas=consultas,
+            orcamento=getattr(view, 'orcamento_consultas', None),
+            pico_memoria_kb=round(pico, 1),
+        ))
+    return resultados
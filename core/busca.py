@@ -0,0 +1,106 @@
+# core/busca.py
+
+import re
+from dataclasses import dataclass
+
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Jogador, Time
+
+# Tabela FTS5 criada na migração 0014_busca (rowid 2 * id para jogadores,
+# 2 * id + 1 para times)
+TABELA = 'core_busca'
+# Peso de cada coluna no bm25: o nome conta mais que o time do jogador
+PESOS = (10.0, 1.0)
+LIMITE = 10
+
+_disponivel = {}
+
+
+@dataclass(slots=True)
+class Resultado:
+    tipo: str
+    id: int
+    nome: str
+    time_id: int
+    # Nome do time do jogador (vazio nos resultados de time)
+    time: str
+
+
+def fts_disponivel(using='default'):
+    """Se o banco tem o índice FTS5 (SQLite com FTS5). Consultado uma vez por banco."""
+    conexao = connections[using]
+    chave = (using, str(conexao.settings_dict['NAME']))
+    if chave not in _disponivel:
+        _disponivel[chave] = conexao.vendor == 'sqlite' and TABELA in conexao.introspection.table_names()
+    return _disponivel[chave]
+
+
+def consulta_fts(texto):
+    """
+    Expressão MATCH do FTS5 para o texto digitado: cada palavra vira um
+    prefixo entre aspas ("sao"* "pau"*), todas obrigatórias. Acentos e
+    maiúsculas são ignorados pelo tokenizador do índice. None sem palavras.
+    """
+    palavras = re.findall(r'\w+', texto or '')
+    if not palavras:
+        return None
+    return ' '.join(f'"{palavra}"*' for palavra in palavras)
+
+
+def filtro_jogadores(texto, using='default'):
+    """
+    ``Q`` dos jogadores cujo nome ou time casam com ``texto``. Com FTS5 é
+    uma subconsulta no índice (prefixo, sem acentos); nos demais bancos,
+    ``icontains`` no nome do jogador e do time.
+    """
+    consulta = consulta_fts(texto)
+    if consulta is None:
+        return Q()
+    if not fts_disponivel(using):
+        return _filtro_sem_fts(texto)
+    return Q(id__in=RawSQL(
+        f'SELECT rowid / 2 FROM {TABELA} WHERE {TABELA} MATCH %s AND rowid & 1 = 0', (consulta,)
+    ))
+
+
+def buscar(texto, limite=LIMITE, using='default'):
+    """
+    Times e jogadores que casam com ``texto``, do mais para o menos
+    relevante (bm25). Sem FTS5, nomes que começam com o texto vêm antes.
+    """
+    consulta = consulta_fts(texto)
+    if consulta is None:
+        return []
+    if not fts_disponivel(using):
+        return _buscar_sem_fts(texto.strip(), limite)
+
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid, nome, time, time_id FROM {TABELA} WHERE {TABELA} MATCH %s '
+            f'ORDER BY bm25({TABELA}, %s, %s) LIMIT %s',
+            (consulta, *PESOS, limite),
+        )
+        return [
+            Resultado('time' if rowid & 1 else 'jogador', rowid // 2, nome, time_id, time)
+            for rowid, nome, time, time_id in cursor.fetchall()
+        ]
+
+
+def _filtro_sem_fts(texto):
+    return Q(nome__icontains=texto) | Q(time__nome__icontains=texto)
+
+
+def _buscar_sem_fts(texto, limite):
+    times = Time.objects.filter(nome__icontains=texto).order_by('nome')[:limite]
+    jogadores = Jogador.objects.filter(_filtro_sem_fts(texto)).select_related('time').order_by('nome')[:limite]
+    resultados = [Resultado('time', time.id, time.nome, time.id, '') for time in times]
+    resultados += [
+        Resultado('jogador', jogador.id, jogador.nome, jogador.time_id, jogador.time.nome)
+        for jogador in jogadores
+    ]
+    inicio = texto.casefold()
+    resultados.sort(key=lambda resultado: not resultado.nome.casefold().startswith(inicio))
+    return resultados[:limite]
@@ -0,0 +1,211 @@
+# core/cache.py
+
+import hashlib
+import math
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial, wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.dispatch import Signal
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+CHAVE_VERSAO = 'liga:versao'
+# Versão só dos elencos (jogadores por time): muda com menos frequência que
+# a dos dados, então o que depende só dela fica válido por mais tempo
+CHAVE_VERSAO_ELENCOS = 'liga:versao_elencos'
+
+# Enviado depois do commit de uma escrita, com a ``chave`` e a ``versao``
+# nova: é onde os efeitos de uma mudança nos dados são agendados
+versao_confirmada = Signal()
+
+# Dentro de ``invalidacao_unica``: as invalidações pedidas, (chave, banco)
+_adiadas = ContextVar('invalidacoes_adiadas', default=None)
+
+
+def _cache():
+    return caches[getattr(settings, 'CACHE_PAGINAS_BACKEND', 'default')]
+
+
+def _estado(anterior=None):
+    # Um valor novo a cada troca (e não um incremento): não depende de
+    # ``incr`` atômico e nunca volta a uma versão já usada, mesmo se a
+    # chave for descartada pelo backend. O horário, em segundos inteiros
+    # como no cabeçalho Last-Modified, sempre avança em relação ao anterior.
+    modificado = math.ceil(time.time())
+    if anterior is not None:
+        modificado = max(modificado, anterior[1] + 1)
+    return uuid.uuid4().hex, modificado
+
+
+def estado_dados(chave=CHAVE_VERSAO):
+    """
+    (versão, modificado_em) dos dados da liga. Toda escrita troca a versão,
+    então as páginas guardadas com a versão anterior deixam de ser
+    encontradas; ``modificado_em`` é o timestamp da última troca.
+    """
+    cache = _cache()
+    estado = cache.get(chave)
+    if estado is None:
+        novo = _estado()
+        cache.add(chave, novo, timeout=None)
+        # Com o DummyCache nada fica guardado: cada leitura é uma versão nova
+        estado = cache.get(chave) or novo
+    return estado
+
+
+def versao_dados():
+    return estado_dados()[0]
+
+
+def versao_elencos():
+    return estado_dados(CHAVE_VERSAO_ELENCOS)[0]
+
+
+def _nova_versao(chave=CHAVE_VERSAO, confirmada=False):
+    cache = _cache()
+    estado = _estado(cache.get(chave))
+    cache.set(chave, estado, timeout=None)
+    if confirmada:
+        versao_confirmada.send(sender=None, chave=chave, versao=estado[0])
+
+
+def _invalidar(chave, using):
+    adiadas = _adiadas.get()
+    if adiadas is not None:
+        adiadas.add((chave, using or DEFAULT_DB_ALIAS))
+        return
+    _nova_versao(chave)
+    transaction.on_commit(partial(_nova_versao, chave, confirmada=True), using=using)
+
+
+def invalidar_cache(using=None):
+    """
+    Troca a versão dos dados agora e de novo quando a transação confirmar.
+    A segunda troca descarta o que uma leitura concorrente tenha guardado
+    na nova versão enquanto a escrita ainda não estava visível.
+    """
+    _invalidar(CHAVE_VERSAO, using)
+
+
+def invalidar_elencos(using=None):
+    """Como ``invalidar_cache``, para a versão dos elencos (jogador criado, editado ou excluído)."""
+    _invalidar(CHAVE_VERSAO_ELENCOS, using)
+
+
+@contextmanager
+def invalidacao_unica():
+    """
+    Junta as invalidações pedidas dentro do bloco (sinais de cada escrita,
+    atualizações da tabela e dos contadores) em uma só por versão, feita na
+    saída. Use dentro da transação da escrita, para a troca no commit valer.
+    Se o bloco falhar, nada é invalidado: a transação desfaz as escritas.
+    """
+    if _adiadas.get() is not None:
+        yield
+        return
+    adiadas = set()
+    token = _adiadas.set(adiadas)
+    try:
+        yield
+    finally:
+        _adiadas.reset(token)
+    for chave, using in sorted(adiadas):
+        _invalidar(chave, using)
+
+
+def guardar_por_versao(nome, valor, versao, timeout=24 * 60 * 60):
+    """
+    Guarda um resultado caro de ``nome`` calculado sobre a ``versao`` dos
+    dados; também fica como o último de ``nome``, para ser mostrado enquanto
+    o da versão atual não fica pronto.
+    """
+    cache = _cache()
+    cache.set(f'{nome}:{versao}', valor, timeout)
+    cache.set(f'{nome}:ultimo', valor, timeout=None)
+
+
+def ler_por_versao(nome, versao=None):
+    """Resultado de ``nome`` da ``versao`` dos dados (sem versão: o último guardado)."""
+    return _cache().get(f'{nome}:{versao or "ultimo"}')
+
+
+def cache_pagina(view):
+    """
+    Guarda a resposta da view no cache, por URL e versão dos dados, e a
+    serve até a próxima escrita. Só para visitantes anônimos, porque o
+    cabeçalho das páginas muda com o usuário logado. O decorador
+    ``orcamento_consultas`` deve ficar por fora deste.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+
+        cache = _cache()
+        url = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        chave = f'pagina:{versao_dados()}:{url}'
+        response = cache.get(chave)
+        if response is None:
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming and not response.cookies:
+                cache.set(chave, response, getattr(settings, 'CACHE_PAGINAS_TIMEOUT', 300))
+        return response
+    return wrapper
+
+
+def validadores(variante=''):
+    """
+    (ETag, Last-Modified em segundos) das respostas derivadas dos dados da
+    liga. ``variante`` distingue representações diferentes do mesmo dado
+    (usuário logado, JSON). O conteúdo também muda com o relógio (próximos
+    jogos), por isso entra a janela de ``CACHE_PAGINAS_TIMEOUT``.
+    """
+    validade = getattr(settings, 'CACHE_PAGINAS_TIMEOUT', 300)
+    versao, modificado = estado_dados()
+    janela = int(time.time() // validade)
+    return quote_etag(f'{versao}-{janela}-{variante}'), max(modificado, janela * validade)
+
+
+def pagina_condicional(view):
+    """
+    GET condicional pela versão dos dados: ETag forte e Last-Modified vêm
+    do cache (nenhuma consulta), e um ``If-None-Match``/``If-Modified-Since``
+    ainda válido recebe 304 sem a view montar o contexto nem renderizar.
+
+    As respostas saem com ``Cache-Control: no-cache``, para o cliente sempre
+    revalidar em vez de reaproveitar a página por conta própria.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view(request, *args, **kwargs)
+
+        usuario = f'u{request.user.pk}' if request.user.is_authenticated else 'anonimo'
+        etag, modificado = validadores(usuario)
+
+        cabecalhos = HttpResponse()
+        cabecalhos['ETag'] = etag
+        cabecalhos['Last-Modified'] = http_date(modificado)
+        patch_cache_control(cabecalhos, no_cache=True)
+        if request.user.is_authenticated:
+            patch_cache_control(cabecalhos, private=True)
+
+        condicional = get_conditional_response(
+            request, etag=cabecalhos['ETag'], last_modified=modificado, response=cabecalhos
+        )
+        if condicional is not cabecalhos:
+            return condicional
+
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200:
+            for cabecalho in ('ETag', 'Last-Modified', 'Cache-Control'):
+                response[cabecalho] = cabecalhos[cabecalho]
+        return response
+    return wrapper
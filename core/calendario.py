@@ -0,0 +1,236 @@
+# core/calendario.py
+
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from .cache import invalidar_cache
+from .models import Jogo, Time
+
+# Máximo de jogos seguidos em casa (ou fora) para cada time
+MAX_SEGUIDOS = 2
+
+
+@dataclass(slots=True)
+class Partida:
+    rodada: int
+    casa: Time
+    visitante: Time
+    data: datetime
+    local: str
+
+
+@dataclass(slots=True)
+class Calendario:
+    partidas: list
+    rodadas: int
+    # Restrições que não puderam ser atendidas (mostradas na prévia)
+    avisos: list = field(default_factory=list)
+
+    def por_rodada(self):
+        """[(rodada, data, partidas)] na ordem das rodadas."""
+        rodadas = {}
+        for partida in self.partidas:
+            rodadas.setdefault(partida.rodada, []).append(partida)
+        return [(rodada, partidas[0].data, partidas) for rodada, partidas in rodadas.items()]
+
+    def jogos(self):
+        return [
+            Jogo(
+                time_casa=partida.casa,
+                time_visitante=partida.visitante,
+                data_jogo=partida.data,
+                local=partida.local or None,
+                rodada=partida.rodada,
+            )
+            for partida in self.partidas
+        ]
+
+
+# ========== MÉTODO DO CÍRCULO ==========
+# O calendário é montado sobre posições 0..n-1 (n par); os times só são
+# colocados nas posições no final, quando já se sabe o mando de cada uma.
+
+def _turno(n):
+    """
+    Turno único pelo método do círculo (tabela de Berger): a posição 0 fica
+    fixa e as demais giram uma casa por rodada. O mando alterna pela paridade
+    do par na rodada, o que dá no máximo dois jogos seguidos com o mesmo mando
+    (n - 2 "quebras" no turno, o mínimo possível).
+    """
+    posicoes = list(range(n))
+    rodadas = []
+    for r in range(n - 1):
+        partidas = []
+        for i in range(n // 2):
+            a, b = posicoes[i], posicoes[n - 1 - i]
+            casa = r % 2 == 0 if i == 0 else i % 2 == 1
+            partidas.append((a, b) if casa else (b, a))
+        rodadas.append(partidas)
+        posicoes = [posicoes[0], posicoes[-1]] + posicoes[1:-1]
+    return rodadas
+
+
+def _mandos(rodadas, n, folga=None):
+    """Sequência de mandos de cada posição ('C' casa, 'F' fora), sem as folgas."""
+    mandos = {posicao: [] for posicao in range(n)}
+    for partidas in rodadas:
+        for casa, visitante in partidas:
+            if folga in (casa, visitante):
+                continue
+            mandos[casa].append('C')
+            mandos[visitante].append('F')
+    return mandos
+
+
+def _maior_sequencia(mandos):
+    maior = 0
+    for sequencia in mandos.values():
+        atual = 0
+        for k, mando in enumerate(sequencia):
+            atual = atual + 1 if k and mando == sequencia[k - 1] else 1
+            maior = max(maior, atual)
+    return maior
+
+
+def _returno(turno, n, folga):
+    """
+    Returno espelhado (mandos invertidos). A ordem das rodadas é escolhida
+    para não passar de ``MAX_SEGUIDOS`` na virada do turno e não repetir o
+    confronto da última rodada logo na primeira do returno.
+    """
+    espelho = [[(b, a) for a, b in partidas] for partidas in turno]
+    ultima = {frozenset(par) for par in turno[-1] if folga not in par}
+    for k in range(len(espelho)):
+        ordem = espelho[k:] + espelho[:k]
+        if {frozenset(par) for par in ordem[0] if folga not in par} & ultima:
+            continue
+        if _maior_sequencia(_mandos(turno + ordem, n, folga)) <= MAX_SEGUIDOS:
+            return ordem
+    return espelho
+
+
+def _posicionar(times, rodadas, folga, locais, avisos):
+    """
+    Coloca cada time em uma posição. Times que dividem o mesmo local vão para
+    posições que nunca jogam em casa na mesma rodada (busca com retrocesso);
+    os demais ocupam as posições que sobrarem, na ordem recebida.
+    """
+    # Rodadas em que cada posição é mandante
+    em_casa = {posicao: set() for posicao in range(len(times) + (folga is not None)) if posicao != folga}
+    for k, partidas in enumerate(rodadas):
+        for casa, visitante in partidas:
+            if folga not in (casa, visitante):
+                em_casa[casa].add(k)
+    grupos = {}
+    for time in times:
+        if locais.get(time.id):
+            grupos.setdefault(locais[time.id].strip().casefold(), []).append(time)
+
+    posicao_do_time = {}
+
+    def buscar(grupo, escolhidas):
+        # Posições livres para os times do grupo, sem rodada em casa em comum
+        if len(escolhidas) == len(grupo):
+            return escolhidas
+        for posicao in em_casa:
+            if posicao in escolhidas or posicao in posicao_do_time.values():
+                continue
+            if any(em_casa[posicao] & em_casa[outra] for outra in escolhidas):
+                continue
+            encontradas = buscar(grupo, escolhidas + [posicao])
+            if encontradas:
+                return encontradas
+        return None
+
+    for grupo in grupos.values():
+        if len(grupo) < 2:
+            continue
+        posicoes = buscar(grupo, [])
+        if posicoes is None:
+            avisos.append(
+                f'{", ".join(time.nome for time in grupo)} dividem o local "{locais[grupo[0].id]}" '
+                'e vão jogar em casa na mesma rodada.'
+            )
+            continue
+        posicao_do_time.update((time.id, posicao) for time, posicao in zip(grupo, posicoes))
+
+    livres = iter([posicao for posicao in em_casa if posicao not in posicao_do_time.values()])
+    for time in times:
+        if time.id not in posicao_do_time:
+            posicao_do_time[time.id] = next(livres)
+    return {posicao_do_time[time.id]: time for time in times}
+
+
+def gerar_calendario(times, inicio, turnos=2, intervalo=timedelta(days=7), rodada_inicial=1,
+                     locais=None, semente=None):
+    """
+    Monta o calendário de todos contra todos (``turnos`` = 1 ou 2, turno e
+    returno com mandos invertidos) sem gravar nada. Cada rodada é marcada
+    para ``inicio`` + k * ``intervalo`` e cada jogo no local do mandante
+    (``locais``: {time_id: local}). Com número ímpar de times, um folga por
+    rodada. ``semente`` sorteia a posição dos times; sem ela a ordem recebida
+    é mantida.
+    """
+    times = list(times)
+    if len(times) < 2:
+        raise ValueError('São necessários pelo menos 2 times.')
+    if turnos not in (1, 2):
+        raise ValueError('O calendário tem 1 ou 2 turnos.')
+    if semente is not None:
+        random.Random(semente).shuffle(times)
+    locais = locais or {}
+
+    # Com número ímpar de times, a posição fixa do círculo é a folga
+    folga = 0 if len(times) % 2 else None
+    n = len(times) + (1 if folga is not None else 0)
+    rodadas = _turno(n)
+    if turnos == 2:
+        rodadas += _returno(rodadas, n, folga)
+
+    avisos = []
+    if _maior_sequencia(_mandos(rodadas, n, folga)) > MAX_SEGUIDOS:
+        avisos.append(f'Algum time joga mais de {MAX_SEGUIDOS} vezes seguidas com o mesmo mando.')
+    time_na_posicao = _posicionar(times, rodadas, folga, locais, avisos)
+
+    partidas = []
+    for k, pares in enumerate(rodadas):
+        data = inicio + intervalo * k
+        for casa, visitante in pares:
+            if folga in (casa, visitante):
+                continue
+            mandante = time_na_posicao[casa]
+            partidas.append(Partida(
+                rodada=rodada_inicial + k,
+                casa=mandante,
+                visitante=time_na_posicao[visitante],
+                data=data,
+                local=locais.get(mandante.id) or '',
+            ))
+    return Calendario(partidas, len(rodadas), avisos)
+
+
+def locais_dos_times(times):
+    """{time_id: local} do jogo em casa mais recente de cada time que tem local."""
+    ultimo_local = Jogo.objects.filter(
+        time_casa=OuterRef('pk'), local__gt=''
+    ).order_by('-data_jogo').values('local')[:1]
+    return dict(
+        Time.objects.filter(id__in=[time.id for time in times])
+        .annotate(local=Subquery(ultimo_local))
+        .filter(local__isnull=False)
+        .values_list('id', 'local')
+    )
+
+
+def gravar_calendario(calendario):
+    """Grava os jogos do calendário de uma vez (``bulk_create``)."""
+    with transaction.atomic():
+        jogos = Jogo.objects.bulk_create(calendario.jogos())
+    # bulk_create não dispara os signals; jogos agendados não mexem na
+    # tabela, só no cache das páginas
+    invalidar_cache()
+    return jogos
@@ -0,0 +1,156 @@
+# core/elo.py
+
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import FloatField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from .models import EloJogo, Jogo, Time
+
+ELO_INICIAL = 1500
+# Pontos em jogo por partida e vantagem do mandante, em pontos de rating
+FATOR_K = 20
+VANTAGEM_CASA = 60
+# Linhas gravadas por INSERT no reprocessamento completo
+LOTE = 2000
+
+CAMPOS_JOGO = ('id', 'data_jogo', 'time_casa_id', 'time_visitante_id', 'gols_casa', 'gols_visitante')
+
+
+def esperado(elo_casa, elo_visitante):
+    """Pontuação esperada do mandante (0 a 1), já com a vantagem de jogar em casa."""
+    return 1 / (1 + 10 ** ((elo_visitante - elo_casa - VANTAGEM_CASA) / 400))
+
+
+def variacao(elo_casa, elo_visitante, gols_casa, gols_visitante):
+    """
+    Pontos que o mandante ganha (o visitante perde o mesmo tanto). Vitórias
+    por mais de um gol valem mais, como no ranking Elo de seleções.
+    """
+    saldo = abs(gols_casa - gols_visitante)
+    if saldo <= 1:
+        peso = 1
+    elif saldo == 2:
+        peso = 1.5
+    else:
+        peso = (11 + saldo) / 8
+    resultado = 1 if gols_casa > gols_visitante else 0.5 if gols_casa == gols_visitante else 0
+    return FATOR_K * peso * (resultado - esperado(elo_casa, elo_visitante))
+
+
+def calcular_elos(jogos, elos):
+    """
+    Aplica os ``jogos`` (tuplas de ``CAMPOS_JOGO``, em ordem cronológica) aos
+    ratings ``elos`` ({time_id: rating}, atualizado no lugar; time ausente
+    começa com ``ELO_INICIAL``). Gera o histórico como ``EloJogo``, dois por jogo.
+    """
+    for jogo_id, data, casa, visitante, gols_casa, gols_visitante in jogos:
+        antes_casa = elos.get(casa, ELO_INICIAL)
+        antes_visitante = elos.get(visitante, ELO_INICIAL)
+        delta = variacao(antes_casa, antes_visitante, gols_casa, gols_visitante)
+        elos[casa] = antes_casa + delta
+        elos[visitante] = antes_visitante - delta
+        yield EloJogo(jogo_id=jogo_id, time_id=casa, data_jogo=data, elo_anterior=antes_casa, elo=elos[casa])
+        yield EloJogo(
+            jogo_id=jogo_id, time_id=visitante, data_jogo=data, elo_anterior=antes_visitante, elo=elos[visitante],
+        )
+
+
+def _a_partir_de(inicio, campo_id):
+    data, jogo_id = inicio
+    return Q(data_jogo__gt=data) | Q(data_jogo=data, **{f'{campo_id}__gte': jogo_id})
+
+
+def reprocessar_elo(inicio=None, times=()):
+    """
+    Refaz o histórico Elo dos jogos realizados de ``inicio`` = (data_jogo,
+    jogo_id) em diante; os anteriores não mudam. Cada time recomeça do
+    rating que tinha no último jogo antes desse ponto. ``times`` são ids
+    dos times dos jogos alterados, que também têm o rating refeito (um jogo
+    excluído já levou junto as suas linhas do histórico).
+
+    O custo depende só dos jogos a partir de ``inicio``: lançar o resultado
+    mais recente refaz um jogo. Sem ``inicio``, refaz a temporada inteira.
+    """
+    jogos = Jogo.objects.filter(realizado=True).order_by('data_jogo', 'id').values_list(*CAMPOS_JOGO)
+    with transaction.atomic():
+        if inicio is None:
+            EloJogo.objects.all().delete()
+            elos = dict.fromkeys(Time.objects.values_list('id', flat=True), ELO_INICIAL)
+            jogos = jogos.iterator(chunk_size=LOTE)
+        else:
+            historico = EloJogo.objects.filter(_a_partir_de(inicio, 'jogo_id'))
+            # Times que perdem linhas do histórico (jogo excluído, remarcado,
+            # desfeito) também têm o rating refeito
+            afetados = set(times) | set(historico.values_list('time_id', flat=True))
+            historico.delete()
+            jogos = list(jogos.filter(_a_partir_de(inicio, 'id')))
+            for jogo in jogos:
+                afetados.update(jogo[2:4])
+            # Último rating de cada time antes de ``inicio`` (o que restou no histórico)
+            ultimo = EloJogo.objects.filter(time=OuterRef('pk')).order_by('-data_jogo', '-jogo_id').values('elo')[:1]
+            elos = dict(
+                Time.objects.filter(id__in=afetados).annotate(
+                    anterior=Coalesce(Subquery(ultimo), Value(float(ELO_INICIAL)), output_field=FloatField())
+                ).values_list('id', 'anterior')
+            )
+
+        linhas = calcular_elos(jogos, elos)
+        while lote := list(islice(linhas, LOTE)):
+            EloJogo.objects.bulk_create(lote)
+        Time.objects.bulk_update(
+            [Time(id=time_id, elo=elo) for time_id, elo in elos.items()], ['elo'], batch_size=LOTE
+        )
+
+
+def inicio_reprocessamento(jogos):
+    """
+    Ponto (data_jogo, jogo_id) a partir do qual o histórico precisa ser
+    refeito, dados os pares (jogo_id, data_jogo) dos jogos realizados antes
+    e depois de uma alteração. Datas que não são ``datetime`` (texto vindo
+    de um formulário) são relidas do banco. None se não há jogo realizado.
+    """
+    marcos = [(data, jogo_id) for jogo_id, data in jogos if isinstance(data, datetime)]
+    sem_data = [jogo_id for jogo_id, data in jogos if not isinstance(data, datetime)]
+    if sem_data:
+        marcos.extend(Jogo.objects.filter(id__in=sem_data, realizado=True).values_list('data_jogo', 'id'))
+    return min(marcos, default=None)
+
+
+@dataclass(slots=True)
+class GraficoElo:
+    """Série do rating de um time já em coordenadas do SVG do detalhe do time."""
+    pontos: list
+    largura: int
+    altura: int
+    minimo: float
+    maximo: float
+
+    @property
+    def polilinha(self):
+        return ' '.join(f'{x:.1f},{y:.1f}' for x, y, _ in self.pontos)
+
+
+def grafico_elo(time, largura=600, altura=160, margem=8):
+    """
+    Evolução do rating do time, uma consulta. Retorna None sem jogos
+    realizados. Cada ponto é (x, y, EloJogo); o primeiro é o rating inicial.
+    """
+    historico = list(
+        EloJogo.objects.filter(time=time).select_related('jogo__time_casa', 'jogo__time_visitante')
+        .order_by('data_jogo', 'jogo_id')
+    )
+    if not historico:
+        return None
+    valores = [historico[0].elo_anterior] + [linha.elo for linha in historico]
+    minimo, maximo = min(valores), max(valores)
+    escala = (altura - 2 * margem) / ((maximo - minimo) or 1)
+    passo = (largura - 2 * margem) / len(historico)
+    pontos = [
+        (margem + k * passo, altura - margem - (valor - minimo) * escala, linha)
+        for k, (valor, linha) in enumerate(zip(valores, [None] + historico))
+    ]
+    return GraficoElo(pontos, largura, altura, minimo, maximo)
@@ -0,0 +1,149 @@
+# core/eventos.py
+
+import asyncio
+import itertools
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+# Eventos recentes guardados para quem reconecta com Last-Event-ID
+HISTORICO = 200
+# Eventos pendentes por assinante antes de ele ser considerado lento
+FILA_ASSINANTE = 100
+
+
+@dataclass(slots=True, frozen=True)
+class Evento:
+    id: int
+    tipo: str
+    dados: dict
+
+    def sse(self):
+        """O evento no formato text/event-stream."""
+        return f'id: {self.id}\nevent: {self.tipo}\ndata: {json.dumps(self.dados, ensure_ascii=False)}\n\n'
+
+
+class Assinatura:
+    """Fila de um cliente conectado, alimentada a partir de qualquer thread."""
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.fila = asyncio.Queue(maxsize=FILA_ASSINANTE)
+        self.atrasada = False
+
+    def _entregar(self, evento):
+        try:
+            self.fila.put_nowait(evento)
+        except asyncio.QueueFull:
+            # Cliente lento: encerra o stream, e o EventSource reconecta
+            # pedindo o que perdeu pelo Last-Event-ID
+            self.atrasada = True
+
+    def entregar(self, evento):
+        self.loop.call_soon_threadsafe(self._entregar, evento)
+
+    async def proximo(self, timeout):
+        """Próximo evento, ou ``None`` se nada chegar em ``timeout`` segundos."""
+        try:
+            return await asyncio.wait_for(self.fila.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class BarramentoLocal:
+    """
+    Pub/sub em memória, dentro do processo. Quem publica são as views
+    síncronas (em threads); quem assina são os streams SSE, no event loop.
+    Com vários processos cada um só vê os próprios eventos: troque por um
+    backend compartilhado em ``EVENTOS_BACKEND``.
+    """
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self._ids = itertools.count(1)
+        self._historico = deque(maxlen=HISTORICO)
+        self._assinaturas = set()
+
+    def publicar(self, tipo, dados):
+        with self._trava:
+            evento = Evento(next(self._ids), tipo, dados)
+            self._historico.append(evento)
+            assinaturas = list(self._assinaturas)
+        for assinatura in assinaturas:
+            try:
+                assinatura.entregar(evento)
+            except RuntimeError:
+                # Event loop do assinante já encerrado
+                self.cancelar(assinatura)
+        return evento
+
+    def recentes(self, desde_id):
+        """Eventos do histórico posteriores a ``desde_id``."""
+        with self._trava:
+            return [evento for evento in self._historico if evento.id > desde_id]
+
+    def assinar(self):
+        assinatura = Assinatura(asyncio.get_running_loop())
+        with self._trava:
+            self._assinaturas.add(assinatura)
+        return assinatura
+
+    def cancelar(self, assinatura):
+        with self._trava:
+            self._assinaturas.discard(assinatura)
+
+    @property
+    def total_assinantes(self):
+        return len(self._assinaturas)
+
+
+_barramento = None
+_trava_barramento = threading.Lock()
+
+
+def barramento():
+    """O backend configurado em ``EVENTOS_BACKEND``, criado no primeiro uso."""
+    global _barramento
+    with _trava_barramento:
+        if _barramento is None:
+            _barramento = import_string(getattr(settings, 'EVENTOS_BACKEND', 'core.eventos.BarramentoLocal'))()
+        return _barramento
+
+
+def publicar_no_commit(tipo, montar_dados, using=None):
+    """
+    Publica o evento só depois que a transação confirmar (nunca um placar
+    desfeito). ``montar_dados`` também só roda no commit.
+    """
+    transaction.on_commit(lambda: barramento().publicar(tipo, montar_dados()), using=using)
+
+
+# ========== EVENTOS DA LIGA ==========
+
+def dados_placar(jogo):
+    return {
+        'jogo': jogo.id,
+        'rodada': jogo.rodada,
+        'time_casa': jogo.time_casa.nome,
+        'time_visitante': jogo.time_visitante.nome,
+        'gols_casa': jogo.gols_casa,
+        'gols_visitante': jogo.gols_visitante,
+        'realizado': jogo.realizado,
+    }
+
+
+def dados_gol(gol):
+    return {
+        'gol': gol.id,
+        'jogo': gol.jogo_id,
+        'jogador': gol.jogador.nome,
+        'time': gol.time.nome,
+        'minuto': gol.minuto,
+        'tipo': gol.tipo,
+        'contra': gol.contra,
+    }
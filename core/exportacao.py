@@ -0,0 +1,277 @@
+# core/exportacao.py
+
+import csv
+import json
+from datetime import datetime
+
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from .models import Classificacao, ClassificacaoRodada, Gol, Jogo
+
+try:
+    import pyarrow
+except ImportError:  # opcional: só o formato Arrow depende dele
+    pyarrow = None
+
+# Linhas buscadas por vez do banco (QuerySet.iterator) e por bloco gravado
+TAMANHO_BLOCO = 2000
+
+# formato: (content type, extensão)
+FORMATOS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'jsonl': ('application/x-ndjson; charset=utf-8', 'jsonl'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrow'),
+}
+
+
+class FormatoIndisponivel(ValueError):
+    """Formato desconhecido ou que depende de um pacote não instalado."""
+
+
+# ========== FILTROS (os mesmos das listas do painel) ==========
+
+def filtrar_jogos(jogos, filtros):
+    """Aplica os filtros de ``painel:lista_jogos`` (time, rodada, status, data_inicio, data_fim)."""
+    time_id = filtros.get('time')
+    rodada = filtros.get('rodada')
+    status = filtros.get('status')
+    data_inicio = filtros.get('data_inicio')
+    data_fim = filtros.get('data_fim')
+
+    if time_id and time_id != 'todos':
+        jogos = jogos.filter(
+            Q(time_casa_id=time_id) | Q(time_visitante_id=time_id)
+        )
+
+    if rodada and rodada != 'todos':
+        try:
+            rodada_int = int(rodada)
+            jogos = jogos.filter(rodada=rodada_int)
+        except ValueError:
+            pass
+
+    if status and status != 'todos':
+        if status == 'realizado':
+            jogos = jogos.filter(realizado=True)
+        elif status == 'agendado':
+            jogos = jogos.filter(realizado=False, data_jogo__gte=timezone.now())
+        elif status == 'atrasado':
+            jogos = jogos.filter(realizado=False, data_jogo__lt=timezone.now())
+
+    if data_inicio:
+        jogos = jogos.filter(data_jogo__date__gte=data_inicio)
+
+    if data_fim:
+        jogos = jogos.filter(data_jogo__date__lte=data_fim)
+
+    return jogos
+
+
+def filtrar_gols(gols, filtros):
+    """Aplica os filtros de ``painel:lista_gols`` (time, jogador, jogo)."""
+    time_id = filtros.get('time')
+    jogador_id = filtros.get('jogador')
+    jogo_id = filtros.get('jogo')
+
+    if time_id and time_id != 'todos':
+        gols = gols.filter(time_id=time_id)
+
+    if jogador_id and jogador_id != 'todos':
+        gols = gols.filter(jogador_id=jogador_id)
+
+    if jogo_id and jogo_id != 'todos':
+        gols = gols.filter(jogo_id=jogo_id)
+
+    return gols
+
+
+# ========== CONSULTAS ==========
+# Cada exportação é uma lista de (coluna, campo ORM, tipo) e um queryset de
+# values_list: uma consulta só, sem instanciar modelos. As colunas de jogos
+# usam os nomes aceitos por core.importacao, então o CSV pode ser reimportado.
+
+COLUNAS_JOGOS = [
+    ('id', 'id', 'int'),
+    ('rodada', 'rodada', 'int'),
+    ('data_jogo', 'data_jogo', 'data'),
+    ('time_casa', 'time_casa__nome', 'texto'),
+    ('time_visitante', 'time_visitante__nome', 'texto'),
+    ('gols_casa', 'gols_casa', 'int'),
+    ('gols_visitante', 'gols_visitante', 'int'),
+    ('realizado', 'realizado', 'bool'),
+    ('local', 'local', 'texto'),
+]
+
+COLUNAS_GOLS = [
+    ('id', 'id', 'int'),
+    ('jogo_id', 'jogo_id', 'int'),
+    ('rodada', 'jogo__rodada', 'int'),
+    ('data_jogo', 'jogo__data_jogo', 'data'),
+    ('time', 'time__nome', 'texto'),
+    ('jogador', 'jogador__nome', 'texto'),
+    ('minuto', 'minuto', 'int'),
+    ('tipo', 'tipo', 'texto'),
+    ('contra', 'contra', 'bool'),
+    ('data_cadastro', 'data_cadastro', 'data'),
+]
+
+COLUNAS_CLASSIFICACAO = [
+    ('posicao', 'posicao', 'int'),
+    ('time', 'time__nome', 'texto'),
+    ('pontos', 'pontos', 'int'),
+    ('jogos', 'jogos', 'int'),
+    ('vitorias', 'vitorias', 'int'),
+    ('empates', 'empates', 'int'),
+    ('derrotas', 'derrotas', 'int'),
+    ('gols_pro', 'gols_pro', 'int'),
+    ('gols_contra', 'gols_contra', 'int'),
+    ('saldo_gols', 'saldo_gols', 'int'),
+]
+
+
+def _valores(queryset, colunas):
+    return queryset.values_list(*[campo for _, campo, _ in colunas])
+
+
+def consulta_jogos(filtros):
+    jogos = filtrar_jogos(Jogo.objects.all(), filtros).order_by('data_jogo', 'id')
+    return COLUNAS_JOGOS, _valores(jogos, COLUNAS_JOGOS)
+
+
+def consulta_gols(filtros):
+    gols = filtrar_gols(Gol.objects.all(), filtros).order_by('id')
+    return COLUNAS_GOLS, _valores(gols, COLUNAS_GOLS)
+
+
+def consulta_classificacao(filtros):
+    """
+    Tabela atual ou, com ``rodada``, o retrato da classificação ao fim
+    daquela rodada (``ClassificacaoRodada``).
+    """
+    rodada = filtros.get('rodada')
+    if rodada and rodada.isdigit():
+        linhas = ClassificacaoRodada.objects.filter(rodada=int(rodada)).order_by('posicao')
+        colunas = [('rodada', 'rodada', 'int')] + COLUNAS_CLASSIFICACAO
+    else:
+        ordem = [F(campo).desc() for campo in ('pontos', 'vitorias', 'saldo_gols', 'gols_pro')]
+        ordem.append(F('time__nome').asc())
+        linhas = Classificacao.objects.annotate(
+            posicao=Window(RowNumber(), order_by=ordem)
+        ).order_by(*ordem)
+        colunas = COLUNAS_CLASSIFICACAO
+    return colunas, _valores(linhas, colunas)
+
+
+CONSULTAS = {
+    'jogos': consulta_jogos,
+    'gols': consulta_gols,
+    'classificacao': consulta_classificacao,
+}
+
+
+# ========== FORMATOS ==========
+
+def _texto(valor):
+    if isinstance(valor, datetime):
+        return timezone.localtime(valor).isoformat()
+    return valor
+
+
+class _Buffer:
+    """Arquivo só de escrita: ``esvaziar()`` devolve o que foi escrito desde a última vez."""
+
+    closed = False
+
+    def __init__(self, vazio=''):
+        self.vazio = vazio
+        self.partes = []
+
+    def write(self, dados):
+        self.partes.append(dados if isinstance(dados, str) else bytes(dados))
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def esvaziar(self):
+        dados = self.vazio.join(self.partes)
+        self.partes.clear()
+        return dados
+
+
+def _blocos(linhas, tamanho):
+    bloco = []
+    for linha in linhas.iterator(chunk_size=tamanho):
+        bloco.append(linha)
+        if len(bloco) >= tamanho:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def gerar_csv(colunas, linhas, tamanho=TAMANHO_BLOCO):
+    buffer = _Buffer()
+    escritor = csv.writer(buffer)
+    escritor.writerow([nome for nome, _, _ in colunas])
+    yield buffer.esvaziar()
+    for bloco in _blocos(linhas, tamanho):
+        escritor.writerows([[_texto(valor) for valor in linha] for linha in bloco])
+        yield buffer.esvaziar()
+
+
+def gerar_jsonl(colunas, linhas, tamanho=TAMANHO_BLOCO):
+    nomes = [nome for nome, _, _ in colunas]
+    for bloco in _blocos(linhas, tamanho):
+        yield ''.join(
+            json.dumps(dict(zip(nomes, map(_texto, linha))), ensure_ascii=False) + '\n'
+            for linha in bloco
+        )
+
+
+def gerar_arrow(colunas, linhas, tamanho=TAMANHO_BLOCO):
+    """Stream IPC do Arrow: o schema e depois um record batch por bloco."""
+    tipos = {
+        'int': pyarrow.int64(),
+        'texto': pyarrow.string(),
+        'bool': pyarrow.bool_(),
+        'data': pyarrow.timestamp('us', tz='UTC'),
+    }
+    schema = pyarrow.schema([(nome, tipos[tipo]) for nome, _, tipo in colunas])
+    buffer = _Buffer(b'')
+    with pyarrow.ipc.new_stream(buffer, schema) as escritor:
+        yield buffer.esvaziar()
+        for bloco in _blocos(linhas, tamanho):
+            escritor.write_batch(pyarrow.record_batch(
+                [pyarrow.array(coluna, type=campo.type) for coluna, campo in zip(zip(*bloco), schema)],
+                schema=schema,
+            ))
+            yield buffer.esvaziar()
+    yield buffer.esvaziar()
+
+
+GERADORES = {
+    'csv': gerar_csv,
+    'jsonl': gerar_jsonl,
+    'arrow': gerar_arrow,
+}
+
+
+def verificar_formato(formato):
+    if formato not in FORMATOS:
+        raise FormatoIndisponivel(f'Formato "{formato}" inválido. Use: {", ".join(FORMATOS)}.')
+    if formato == 'arrow' and pyarrow is None:
+        raise FormatoIndisponivel('O formato Arrow requer o pacote pyarrow.')
+
+
+def exportar(tipo, formato, filtros=None, tamanho=TAMANHO_BLOCO):
+    """
+    Gerador com o conteúdo da exportação em pedaços (str para CSV e JSON
+    Lines, bytes para Arrow). Os registros vêm do banco em blocos de
+    ``tamanho`` linhas, então a memória não cresce com o tamanho da tabela.
+    """
+    verificar_formato(formato)
+    colunas, linhas = CONSULTAS[tipo](filtros or {})
+    return GERADORES[formato](colunas, linhas, tamanho)
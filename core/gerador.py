@@ -0,0 +1,154 @@
+# core/gerador.py
+
+import math
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .cache import invalidar_elencos
+from .models import Time, Jogador, Jogo, Gol
+from .scorers import reconstruir_contadores
+from .standings import reconstruir_classificacao
+
+CIDADES = [
+    'Aracaju', 'Belém', 'Campinas', 'Curitiba', 'Fortaleza', 'Goiânia', 'Joinville', 'Londrina',
+    'Maceió', 'Manaus', 'Natal', 'Niterói', 'Recife', 'Salvador', 'Santos', 'Vitória',
+]
+SUFIXOS = ['FC', 'EC', 'Atlético', 'Esporte Clube', 'United', 'City']
+NOMES = [
+    'Ana', 'Bruno', 'Caio', 'Davi', 'Enzo', 'Felipe', 'Gabriel', 'Heitor', 'Igor', 'João',
+    'Lucas', 'Marcos', 'Nicolas', 'Otávio', 'Pedro', 'Rafael', 'Samuel', 'Tiago', 'Vitor', 'Yuri',
+]
+SOBRENOMES = [
+    'Almeida', 'Barbosa', 'Costa', 'Dias', 'Ferreira', 'Gomes', 'Lima', 'Martins', 'Nunes', 'Oliveira',
+    'Pereira', 'Ribeiro', 'Santos', 'Silva', 'Souza', 'Teixeira',
+]
+# Elenco-base de 11; elencos maiores repetem a sequência
+ELENCO = ['GOL', 'ZAG', 'ZAG', 'LAT', 'LAT', 'VOL', 'MEI', 'MEI', 'ATA', 'ATA', 'ATA']
+# Peso de cada posição na escolha do autor do gol
+PESO_GOL = {'GOL': 0.2, 'ZAG': 2, 'LAT': 2, 'VOL': 3, 'MEI': 5, 'ATA': 10}
+LOTE = 1000
+
+
+@dataclass(slots=True)
+class ResumoLiga:
+    times: int
+    jogadores: int
+    jogos: int
+    gols: int
+
+
+def _nome_time(i):
+    combinacoes = len(CIDADES) * len(SUFIXOS)
+    nome = f'{CIDADES[i % len(CIDADES)]} {SUFIXOS[i // len(CIDADES) % len(SUFIXOS)]}'
+    return nome if i < combinacoes else f'{nome} {i // combinacoes + 1}'
+
+
+def _partidas_da_rodada(times, rng):
+    """Sorteia os confrontos da rodada; com número ímpar de times um folga."""
+    ordem = list(times)
+    rng.shuffle(ordem)
+    return list(zip(ordem[::2], ordem[1::2]))
+
+
+def _gols_da_partida(jogo, elencos, rng):
+    """Gols de um jogo realizado, coerentes com o placar gravado no jogo."""
+    gols = []
+    for time, adversario, quantidade in (
+        (jogo.time_casa, jogo.time_visitante, jogo.gols_casa),
+        (jogo.time_visitante, jogo.time_casa, jogo.gols_visitante),
+    ):
+        for _ in range(quantidade):
+            minuto = rng.randint(1, 90)
+            if rng.random() < 0.03:
+                # Gol contra: marcado por um jogador do adversário
+                jogador = rng.choice(elencos[adversario.id])
+                gols.append(Gol(jogo=jogo, jogador=jogador, time=adversario, minuto=minuto, tipo='CONTRA', contra=True))
+                continue
+            elenco = elencos[time.id]
+            jogador = rng.choices(elenco, weights=[PESO_GOL.get(j.posicao, 1) for j in elenco])[0]
+            tipo = rng.choices(['NORMAL', 'PENALTI', 'FALTA'], weights=[85, 10, 5])[0]
+            gols.append(Gol(jogo=jogo, jogador=jogador, time=time, minuto=minuto, tipo=tipo))
+    return gols
+
+
+def _poisson(media, rng):
+    """Sorteio de Poisson (algoritmo de Knuth), suficiente para placares."""
+    limite, k, p = math.exp(-media), 0, rng.random()
+    while p > limite:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def gerar_liga(times=20, jogadores_por_time=22, rodadas=38, gols_por_jogo=2.5,
+               rodadas_realizadas=None, semente=0, inicio=None):
+    """
+    Gera uma liga sintética com ``bulk_create``: times, elencos, ``rodadas``
+    rodadas (uma partida por par de times sorteado) e os gols dos jogos já
+    realizados. A mesma ``semente`` gera sempre a mesma liga.
+
+    As ``rodadas_realizadas`` primeiras rodadas (todas, por padrão) ficam no
+    passado e com resultado; as demais ficam agendadas para as semanas
+    seguintes a ``inicio`` (agora, por padrão). Tabela, rodadas e contadores
+    de gols são reconstruídos no final.
+    """
+    rng = random.Random(semente)
+    if rodadas_realizadas is None:
+        rodadas_realizadas = rodadas
+    if inicio is None:
+        inicio = timezone.now().replace(microsecond=0)
+
+    with transaction.atomic():
+        lista_times = Time.objects.bulk_create([
+            Time(nome=_nome_time(i)) for i in range(times)
+        ])
+
+        jogadores = Jogador.objects.bulk_create([
+            Jogador(
+                nome=f'{rng.choice(NOMES)} {rng.choice(SOBRENOMES)}',
+                time=time,
+                numero=k + 1,
+                posicao=ELENCO[k % len(ELENCO)],
+            )
+            for time in lista_times for k in range(jogadores_por_time)
+        ], batch_size=LOTE)
+        elencos = {}
+        for jogador in jogadores:
+            elencos.setdefault(jogador.time_id, []).append(jogador)
+
+        jogos = []
+        for rodada in range(1, rodadas + 1):
+            realizado = rodada <= rodadas_realizadas
+            data = inicio + timedelta(weeks=rodada - rodadas_realizadas - (1 if realizado else 0))
+            for k, (casa, visitante) in enumerate(_partidas_da_rodada(lista_times, rng)):
+                if realizado and jogadores_por_time:
+                    # O mandante marca um pouco mais que o visitante
+                    gols_casa, gols_visitante = _poisson(gols_por_jogo * 0.55, rng), _poisson(gols_por_jogo * 0.45, rng)
+                else:
+                    gols_casa = gols_visitante = 0
+                jogos.append(Jogo(
+                    time_casa=casa,
+                    time_visitante=visitante,
+                    data_jogo=data + timedelta(hours=k),
+                    rodada=rodada,
+                    realizado=realizado,
+                    gols_casa=gols_casa,
+                    gols_visitante=gols_visitante,
+                ))
+        jogos = Jogo.objects.bulk_create(jogos, batch_size=LOTE)
+
+        gols = []
+        for jogo in jogos:
+            if jogo.realizado:
+                gols.extend(_gols_da_partida(jogo, elencos, rng))
+        Gol.objects.bulk_create(gols, batch_size=LOTE)
+
+        reconstruir_classificacao()
+        reconstruir_contadores()
+        invalidar_elencos()
+
+    return ResumoLiga(len(lista_times), len(jogadores), len(jogos), len(gols))
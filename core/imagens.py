@@ -0,0 +1,130 @@
+# core/imagens.py
+
+import hashlib
+from io import BytesIO
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from .tarefas import enfileirar, tarefa
+
+# Lados (em px) das miniaturas geradas; cobrem de 24px a 150px em telas 2x
+TAMANHOS = (32, 48, 64, 96, 160, 320)
+FORMATOS = {
+    'webp': ('WEBP', {'quality': 85}),
+    'png': ('PNG', {'optimize': True}),
+}
+PASTA = 'miniaturas'
+
+# Campos com miniaturas e se a imagem é recortada em quadrado (fotos,
+# exibidas em círculo) ou só reduzida mantendo a proporção (escudos)
+CAMPOS = {
+    ('core', 'time', 'logo'): False,
+    ('core', 'jogador', 'foto'): True,
+}
+
+
+def caminho_miniatura(assinatura, tamanho, extensao):
+    """Nome da miniatura: muda junto com o conteúdo, então pode ficar em cache para sempre."""
+    return f'{PASTA}/{assinatura[:2]}/{assinatura}-{tamanho}.{extensao}'
+
+
+def url_miniatura(assinatura, tamanho, extensao):
+    return default_storage.url(caminho_miniatura(assinatura, tamanho, extensao))
+
+
+def _ler(arquivo):
+    # Serve tanto para o upload recém-recebido quanto para o arquivo já salvo;
+    # o upload volta ao início para o ImageField ainda poder gravá-lo
+    arquivo.open('rb')
+    arquivo.seek(0)
+    conteudo = arquivo.read()
+    arquivo.seek(0)
+    return conteudo
+
+
+def gerar_miniaturas(arquivo, recortar=False):
+    """
+    Gera as miniaturas WebP e PNG de ``arquivo`` em todos os ``TAMANHOS`` e
+    retorna a assinatura (hash do conteúdo) que as identifica. Miniaturas
+    já existentes não são refeitas. Retorna '' se o arquivo não for uma
+    imagem; os templates então usam o original.
+    """
+    conteudo = _ler(arquivo)
+    assinatura = hashlib.sha256(conteudo).hexdigest()[:16]
+    faltando = [
+        (tamanho, extensao)
+        for tamanho in TAMANHOS for extensao in FORMATOS
+        if not default_storage.exists(caminho_miniatura(assinatura, tamanho, extensao))
+    ]
+    if not faltando:
+        return assinatura
+
+    try:
+        with Image.open(BytesIO(conteudo)) as original:
+            imagem = ImageOps.exif_transpose(original).convert('RGBA')
+    except (UnidentifiedImageError, OSError):
+        return ''
+
+    for tamanho in sorted({tamanho for tamanho, _ in faltando}):
+        if recortar:
+            reduzida = ImageOps.fit(imagem, (tamanho, tamanho), Image.LANCZOS)
+        else:
+            reduzida = imagem.copy()
+            reduzida.thumbnail((tamanho, tamanho), Image.LANCZOS)
+        for extensao, (formato, opcoes) in FORMATOS.items():
+            if (tamanho, extensao) not in faltando:
+                continue
+            saida = BytesIO()
+            reduzida.save(saida, formato, **opcoes)
+            default_storage.save(caminho_miniatura(assinatura, tamanho, extensao), ContentFile(saida.getvalue()))
+    return assinatura
+
+
+def atualizar_miniaturas(obj, campo):
+    """
+    Gera as miniaturas do ``campo`` de imagem de ``obj`` e guarda a
+    assinatura em ``<campo>_assinatura`` (sem salvar ``obj``).
+    """
+    arquivo = getattr(obj, campo)
+    recortar = CAMPOS[(obj._meta.app_label, obj._meta.model_name, campo)]
+    assinatura = gerar_miniaturas(arquivo, recortar) if arquivo else ''
+    setattr(obj, f'{campo}_assinatura', assinatura)
+    return assinatura
+
+
+@tarefa
+def processar_miniaturas(modelo, pk, campo):
+    """Tarefa do worker: gera as miniaturas da imagem atual e grava a assinatura."""
+    obj = apps.get_model(modelo).objects.filter(pk=pk).first()
+    if obj is None or not getattr(obj, campo):
+        # Excluído ou imagem removida depois de enfileirar
+        return
+    try:
+        atualizar_miniaturas(obj, campo)
+    finally:
+        getattr(obj, campo).close()
+    obj.save(update_fields=[f'{campo}_assinatura'])
+
+
+def agendar_miniaturas(obj, campo):
+    """
+    Enfileira as miniaturas de ``campo`` de ``obj`` (já salvo). Até o worker
+    terminar, os templates mostram o arquivo original. A chave inclui o nome
+    do arquivo: a mesma imagem só é processada uma vez, e cada troca de
+    imagem gera uma tarefa nova.
+    """
+    arquivo = getattr(obj, campo)
+    if not arquivo:
+        return None
+    modelo = obj._meta.label_lower
+    return enfileirar(
+        processar_miniaturas, modelo, obj.pk, campo, chave=f'miniaturas:{modelo}:{obj.pk}:{arquivo.name}'
+    )
+
+
+def escolher_tamanho(largura):
+    """Menor miniatura com pelo menos ``largura`` px (ou a maior de todas)."""
+    return next((tamanho for tamanho in TAMANHOS if tamanho >= largura), TAMANHOS[-1])
@@ -0,0 +1,385 @@
+# core/importacao.py
+
+import csv
+import io
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, time
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .cache import invalidar_cache, invalidar_elencos
+from .models import Time, Jogador, Jogo
+from .standings import reconstruir_classificacao
+
+# Linhas validadas por transação de bulk_create/bulk_update
+TAMANHO_LOTE = 2000
+# Erros guardados no relatório (o total continua sendo contado)
+MAX_ERROS = 500
+# Caracteres lidos por vez dos arquivos JSON
+BLOCO_JSON = 64 * 1024
+
+FORMATOS = ('csv', 'json')
+VERDADEIRO = {'1', 'true', 'sim', 's', 'yes', 'y', 'x', 'on'}
+FALSO = {'', '0', 'false', 'nao', 'não', 'n', 'no', 'off'}
+FORMATOS_DATA = ('%d/%m/%Y %H:%M', '%d/%m/%Y')
+
+
+class ArquivoInvalido(ValueError):
+    """O arquivo inteiro não pôde ser lido (formato, codificação, JSON quebrado)."""
+
+
+class ErroLinha(ValueError):
+    """Uma linha inválida; é registrada no relatório e as demais seguem."""
+
+
+@dataclass(slots=True)
+class RelatorioImportacao:
+    tipo: str
+    gravado: bool
+    linhas: int = 0
+    criados: int = 0
+    atualizados: int = 0
+    total_erros: int = 0
+    # (linha, mensagem) dos primeiros MAX_ERROS erros
+    erros: list = field(default_factory=list)
+
+    def erro(self, linha, mensagem):
+        self.total_erros += 1
+        if len(self.erros) < MAX_ERROS:
+            self.erros.append((linha, mensagem))
+
+
+# ========== LEITURA ==========
+
+def formato_do_arquivo(nome):
+    extensao = nome.rsplit('.', 1)[-1].lower()
+    if extensao in ('json', 'jsonl'):
+        return 'json'
+    if extensao == 'csv':
+        return 'csv'
+    raise ArquivoInvalido(f'Extensão não reconhecida em "{nome}": use .csv, .json ou .jsonl.')
+
+
+def _objetos_json(texto):
+    """
+    Objetos de um array JSON (``[{...}, {...}]``) ou de JSON Lines, lidos em
+    blocos: o arquivo nunca é carregado inteiro na memória.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, inicio = '', 0, True
+    for bloco in iter(lambda: texto.read(BLOCO_JSON), ''):
+        buffer = buffer[pos:] + bloco
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos == len(buffer):
+                break
+            if inicio:
+                inicio = False
+                if buffer[pos] == '[':
+                    pos += 1
+                    continue
+            if buffer[pos] == ']':
+                pos = len(buffer)
+                break
+            try:
+                objeto, fim = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Objeto incompleto: lê mais um bloco
+                break
+            pos = fim
+            yield objeto
+    if buffer[pos:].strip(' \t\r\n,]'):
+        raise ArquivoInvalido(f'JSON inválido perto de: {buffer[pos:pos + 60]!r}')
+
+
+def ler_registros(arquivo, formato):
+    """(número da linha/registro, dict) de um arquivo binário CSV ou JSON."""
+    texto = io.TextIOWrapper(arquivo, encoding='utf-8-sig', newline='')
+    try:
+        if formato == 'csv':
+            leitor = csv.DictReader(texto)
+            for dados in leitor:
+                yield leitor.line_num, dados
+        else:
+            for numero, dados in enumerate(_objetos_json(texto), 1):
+                yield numero, dados
+    except UnicodeDecodeError:
+        raise ArquivoInvalido('O arquivo deve estar em UTF-8.')
+    except csv.Error as erro:
+        raise ArquivoInvalido(f'CSV inválido: {erro}')
+    finally:
+        # Não fecha o arquivo de quem chamou
+        texto.detach()
+
+
+# ========== CONVERSÃO DE CAMPOS ==========
+
+def _texto(dados, campo, obrigatorio=False):
+    valor = dados.get(campo)
+    valor = '' if valor is None else str(valor).strip()
+    if obrigatorio and not valor:
+        raise ErroLinha(f'"{campo}" é obrigatório.')
+    return valor
+
+
+def _inteiro(dados, campo, padrao=None, minimo=None):
+    valor = _texto(dados, campo)
+    if not valor:
+        return padrao
+    try:
+        numero = int(valor)
+    except ValueError:
+        raise ErroLinha(f'"{campo}" deve ser um número inteiro: {valor!r}.')
+    if minimo is not None and numero < minimo:
+        raise ErroLinha(f'"{campo}" deve ser pelo menos {minimo}.')
+    return numero
+
+
+def _booleano(dados, campo, padrao=False):
+    valor = dados.get(campo)
+    if isinstance(valor, bool):
+        return valor
+    valor = _texto(dados, campo).lower()
+    if campo not in dados or valor == '' and padrao:
+        return padrao
+    if valor in VERDADEIRO:
+        return True
+    if valor in FALSO:
+        return False
+    raise ErroLinha(f'"{campo}" deve ser sim/não: {valor!r}.')
+
+
+def _data_hora(dados, campo, obrigatorio=False):
+    valor = _texto(dados, campo, obrigatorio)
+    if not valor:
+        return None
+    resultado = parse_datetime(valor)
+    if resultado is None:
+        data = parse_date(valor)
+        resultado = datetime.combine(data, time()) if data else None
+    for formato in FORMATOS_DATA:
+        if resultado is not None:
+            break
+        try:
+            resultado = datetime.strptime(valor, formato)
+        except ValueError:
+            pass
+    if resultado is None:
+        raise ErroLinha(f'"{campo}" não é uma data válida: {valor!r}.')
+    if timezone.is_naive(resultado):
+        resultado = timezone.make_aware(resultado)
+    return resultado
+
+
+def _data(dados, campo):
+    valor = _data_hora(dados, campo)
+    return timezone.localtime(valor).date() if valor else None
+
+
+# ========== IMPORTADORES ==========
+
+class Importador:
+    """
+    Converte cada registro em (chave, valores) e grava os lotes. ``chave``
+    identifica o objeto: se já existe (no banco ou antes no arquivo) ele é
+    atualizado só nas colunas presentes no registro, senão é criado. Os
+    índices de nomes ficam em memória, então cada lote custa poucas
+    consultas, não uma por linha.
+    """
+    model = None
+    campos = ()
+    # Colunas sem padrão no model: exigidas só quando o objeto é novo
+    obrigatorios = ()
+
+    def __init__(self):
+        self.times = {nome.casefold(): pk for pk, nome in Time.objects.values_list('id', 'nome')}
+        self.existentes = self.carregar_existentes()
+
+    def carregar_existentes(self):
+        return {}
+
+    def time(self, dados, campo):
+        nome = _texto(dados, campo, obrigatorio=True)
+        try:
+            return self.times[nome.casefold()]
+        except KeyError:
+            raise ErroLinha(f'Time "{nome}" não encontrado.')
+
+    def converter(self, dados):
+        raise NotImplementedError
+
+    def gravar(self, lote, relatorio, gravar):
+        """``lote``: {chave: (número da linha, valores)}."""
+        novos, atualizar = [], {}
+        for chave, (numero, valores) in lote.items():
+            if chave in self.existentes:
+                atualizar[chave] = valores
+                continue
+            faltando = [campo for campo in self.obrigatorios if valores.get(campo) is None]
+            if faltando:
+                relatorio.erro(numero, f'"{faltando[0]}" é obrigatório para cadastrar.')
+            else:
+                novos.append(chave)
+        relatorio.criados += len(novos)
+        relatorio.atualizados += len(atualizar)
+        if not gravar:
+            self.existentes.update(dict.fromkeys(novos))
+            return
+
+        with transaction.atomic():
+            objetos = self.model.objects.in_bulk([self.existentes[chave] for chave in atualizar])
+            for chave, valores in atualizar.items():
+                obj = objetos[self.existentes[chave]]
+                for campo, valor in valores.items():
+                    setattr(obj, campo, valor)
+            self.model.objects.bulk_update(objetos.values(), self.campos, batch_size=500)
+            criados = self.model.objects.bulk_create(
+                [self.model(**lote[chave][1]) for chave in novos], batch_size=500
+            )
+        self.existentes.update((chave, obj.pk) for chave, obj in zip(novos, criados))
+
+    def finalizar(self):
+        """Dados derivados, que o bulk_create/bulk_update não atualiza (sem sinais)."""
+        invalidar_cache()
+
+
+class ImportadorTimes(Importador):
+    model = Time
+    campos = ('nome',)
+
+    def carregar_existentes(self):
+        return dict(self.times)
+
+    def converter(self, dados):
+        nome = _texto(dados, 'nome', obrigatorio=True)
+        return nome.casefold(), {'nome': nome}
+
+    def finalizar(self):
+        # Linhas zeradas dos times novos na tabela
+        reconstruir_classificacao()
+
+
+class ImportadorJogadores(Importador):
+    """Elencos; um jogador é identificado pelo nome dentro do time."""
+    model = Jogador
+    campos = ('numero', 'posicao', 'data_nascimento', 'nacionalidade', 'ativo')
+    obrigatorios = ('posicao',)
+    posicoes = {
+        texto.casefold(): codigo for codigo, rotulo in Jogador.POSICOES for texto in (codigo, rotulo)
+    }
+
+    def carregar_existentes(self):
+        return {
+            (time_id, nome.casefold()): pk
+            for pk, time_id, nome in Jogador.objects.values_list('id', 'time_id', 'nome')
+        }
+
+    def converter(self, dados):
+        nome = _texto(dados, 'nome', obrigatorio=True)
+        time_id = self.time(dados, 'time')
+        valores = {'nome': nome, 'time_id': time_id}
+        if 'posicao' in dados:
+            posicao = _texto(dados, 'posicao', obrigatorio=True)
+            if posicao.casefold() not in self.posicoes:
+                raise ErroLinha(f'Posição "{posicao}" inválida.')
+            valores['posicao'] = self.posicoes[posicao.casefold()]
+        if 'numero' in dados:
+            valores['numero'] = _inteiro(dados, 'numero', minimo=0)
+        if 'data_nascimento' in dados:
+            valores['data_nascimento'] = _data(dados, 'data_nascimento')
+        if 'nacionalidade' in dados:
+            valores['nacionalidade'] = _texto(dados, 'nacionalidade') or 'Brasileiro'
+        if 'ativo' in dados:
+            valores['ativo'] = _booleano(dados, 'ativo', padrao=True)
+        return (time_id, nome.casefold()), valores
+
+    def finalizar(self):
+        super().finalizar()
+        invalidar_elencos()
+
+
+class ImportadorJogos(Importador):
+    """
+    Tabela de jogos e resultados; um jogo é identificado por (rodada, casa,
+    visitante). Um arquivo só de placares atualiza jogos já cadastrados.
+    """
+    model = Jogo
+    campos = ('data_jogo', 'local', 'gols_casa', 'gols_visitante', 'realizado')
+    obrigatorios = ('data_jogo',)
+
+    def carregar_existentes(self):
+        return {
+            (rodada, casa, visitante): pk
+            for pk, rodada, casa, visitante in Jogo.objects.values_list('id', 'rodada', 'time_casa_id', 'time_visitante_id')
+        }
+
+    def converter(self, dados):
+        casa = self.time(dados, 'time_casa')
+        visitante = self.time(dados, 'time_visitante')
+        if casa == visitante:
+            raise ErroLinha('Mandante e visitante devem ser times diferentes.')
+        rodada = _inteiro(dados, 'rodada', padrao=1, minimo=1)
+        valores = {'rodada': rodada, 'time_casa_id': casa, 'time_visitante_id': visitante}
+        if 'data_jogo' in dados:
+            valores['data_jogo'] = _data_hora(dados, 'data_jogo', obrigatorio=True)
+        if 'local' in dados:
+            valores['local'] = _texto(dados, 'local') or None
+        placar = [_inteiro(dados, campo, minimo=0) for campo in ('gols_casa', 'gols_visitante')]
+        if None not in placar:
+            valores['gols_casa'], valores['gols_visitante'] = placar
+        elif placar != [None, None]:
+            raise ErroLinha('Informe o placar dos dois times.')
+        # Com placar informado, o jogo é considerado realizado
+        if 'realizado' in dados or None not in placar:
+            valores['realizado'] = _booleano(dados, 'realizado', padrao=None not in placar)
+        return (rodada, casa, visitante), valores
+
+    def finalizar(self):
+        reconstruir_classificacao()
+
+
+IMPORTADORES = {
+    'times': ImportadorTimes,
+    'jogadores': ImportadorJogadores,
+    'jogos': ImportadorJogos,
+}
+
+
+def importar(arquivo, tipo, formato, gravar=True, tamanho_lote=TAMANHO_LOTE):
+    """
+    Importa um arquivo binário (CSV com cabeçalho, array JSON ou JSON Lines)
+    de ``tipo`` em ``IMPORTADORES``. Linhas inválidas vão para o relatório e
+    as válidas são gravadas em lotes, cada um em sua transação. Com
+    ``gravar=False`` só valida e conta o que seria criado ou atualizado.
+    Levanta ``ArquivoInvalido`` se o arquivo não puder ser lido.
+    """
+    importador = IMPORTADORES[tipo]()
+    relatorio = RelatorioImportacao(tipo=tipo, gravado=gravar)
+    lote = {}
+    try:
+        for numero, dados in ler_registros(arquivo, formato):
+            relatorio.linhas += 1
+            try:
+                if not isinstance(dados, dict):
+                    raise ErroLinha('Cada registro deve ser um objeto.')
+                chave, valores = importador.converter(dados)
+            except ErroLinha as erro:
+                relatorio.erro(numero, str(erro))
+                continue
+            # A mesma chave repetida no arquivo: vale a última linha
+            lote[chave] = (numero, valores)
+            if len(lote) >= tamanho_lote:
+                importador.gravar(lote, relatorio, gravar)
+                lote = {}
+        if lote:
+            importador.gravar(lote, relatorio, gravar)
+    finally:
+        # Inclusive quando o arquivo quebra no meio: os lotes já gravados ficam
+        if gravar and (relatorio.criados or relatorio.atualizados):
+            importador.finalizar()
+    return relatorio
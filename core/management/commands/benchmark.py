@@ -0,0 +1,140 @@
+# core/management/commands/benchmark.py
+
+import json
+import platform
+from contextlib import nullcontext
+from datetime import datetime
+
+import django
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from core.benchmark import URLCONFS, argumentos_rotas, medir_rotas
+from core.gerador import gerar_liga
+from core.models import Time
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede todas as views públicas e do painel com ligas sintéticas de vários tamanhos '
+        '(latência p50/p95, consultas por requisição e pico de memória). '
+        'Roda em um banco de teste descartável; o banco configurado não é tocado.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--tamanhos', default='10,20,40',
+            help='Números de times das ligas medidas, separados por vírgula (padrão: 10,20,40).',
+        )
+        parser.add_argument('--jogadores', type=int, default=22, help='Jogadores por time (padrão: 22).')
+        parser.add_argument('--gols', type=float, default=2.5, help='Média de gols por jogo (padrão: 2.5).')
+        parser.add_argument('--repeticoes', type=int, default=20, help='Requisições por rota (padrão: 20).')
+        parser.add_argument('--semente', type=int, default=0, help='Semente do gerador (padrão: 0).')
+        parser.add_argument(
+            '--sem-cache', action='store_true',
+            help='Desliga o cache de páginas, para medir a renderização em vez do acerto no cache.',
+        )
+        parser.add_argument('--saida', help='Arquivo JSON onde gravar os resultados.')
+        parser.add_argument('--comparar', help='JSON de uma execução anterior, para mostrar a variação do p50.')
+
+    def handle(self, *args, **options):
+        try:
+            tamanhos = [int(t) for t in options['tamanhos'].split(',')]
+        except ValueError:
+            raise CommandError('--tamanhos deve ser uma lista de inteiros, ex.: 10,20,40.')
+        if min(tamanhos) < 2 or options['repeticoes'] < 1:
+            raise CommandError('Cada tamanho precisa de pelo menos 2 times e --repeticoes deve ser positivo.')
+
+        anterior = self.carregar_anterior(options['comparar'])
+
+        cache = nullcontext()
+        if options['sem_cache']:
+            cache = override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+        setup_test_environment()
+        nome_original = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with cache:
+                resultados = [self.medir_tamanho(times, options) for times in tamanhos]
+        finally:
+            connection.creation.destroy_test_db(nome_original, verbosity=0)
+            teardown_test_environment()
+
+        relatorio = {
+            'gerado_em': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'banco': connection.vendor,
+            'repeticoes': options['repeticoes'],
+            'semente': options['semente'],
+            'cache': not options['sem_cache'],
+            'resultados': resultados,
+        }
+        self.exibir(relatorio, anterior)
+
+        if options['saida']:
+            with open(options['saida'], 'w', encoding='utf-8') as arquivo:
+                json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Resultados gravados em {options["saida"]}.'))
+
+    def carregar_anterior(self, caminho):
+        """{(times, rota): p50_ms} de uma execução anterior."""
+        if not caminho:
+            return {}
+        try:
+            with open(caminho, encoding='utf-8') as arquivo:
+                relatorio = json.load(arquivo)
+        except (OSError, ValueError) as erro:
+            raise CommandError(f'Não foi possível ler {caminho}: {erro}')
+        return {
+            (resultado['liga']['times'], rota['rota']): rota['p50_ms']
+            for resultado in relatorio['resultados'] for rota in resultado['rotas']
+        }
+
+    def medir_tamanho(self, times, options):
+        Time.objects.all().delete()
+        User.objects.all().delete()
+        rodadas = 2 * (times - 1)
+        resumo = gerar_liga(
+            times=times,
+            jogadores_por_time=options['jogadores'],
+            rodadas=rodadas,
+            gols_por_jogo=options['gols'],
+            rodadas_realizadas=rodadas * 3 // 4,
+            semente=options['semente'],
+        )
+        self.stdout.write(f'Liga com {resumo.times} times, {resumo.jogos} jogos e {resumo.gols} gols...')
+
+        admin = User.objects.create_user('benchmark', password='benchmark', is_staff=True)
+        kwargs = argumentos_rotas()
+        rotas = []
+        for urlconf, namespace, staff in URLCONFS:
+            client = Client()
+            if staff:
+                client.force_login(admin)
+            rotas.extend(r.como_dict() for r in medir_rotas(client, urlconf, namespace, kwargs, options['repeticoes']))
+
+        return {
+            'liga': {'times': resumo.times, 'jogadores': resumo.jogadores, 'jogos': resumo.jogos, 'gols': resumo.gols},
+            'rotas': rotas,
+        }
+
+    def exibir(self, relatorio, anterior):
+        for resultado in relatorio['resultados']:
+            times = resultado['liga']['times']
+            self.stdout.write(self.style.MIGRATE_HEADING(f'\n{times} times / {resultado["liga"]["jogos"]} jogos'))
+            self.stdout.write(f'{"rota":34} {"status":>6} {"p50 ms":>8} {"p95 ms":>8} {"SQL":>5} {"memória KB":>11}')
+            for rota in resultado['rotas']:
+                linha = (
+                    f'{rota["rota"]:34} {rota["status"]:>6} {rota["p50_ms"]:>8.2f} {rota["p95_ms"]:>8.2f} '
+                    f'{rota["consultas"]:>5} {rota["pico_memoria_kb"]:>11.1f}'
+                )
+                antes = anterior.get((times, rota['rota']))
+                if antes:
+                    linha += f'  ({(rota["p50_ms"] - antes) / antes:+.0%} p50)'
+                if rota['orcamento'] is not None and rota['consultas'] > rota['orcamento']:
+                    linha = self.style.WARNING(linha + f'  acima do orçamento ({rota["orcamento"]})')
+                self.stdout.write(linha)
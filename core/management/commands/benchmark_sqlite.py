@@ -0,0 +1,100 @@
+# core/management/commands/benchmark_sqlite.py
+
+import os
+import sqlite3
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.gerador import gerar_liga
+from core.models import Time
+from core.sqlite import PERFIS, medir_concorrencia
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede leituras e escritas simultâneas no SQLite com cada perfil de PRAGMAs '
+        '(SQLITE_PERFIL). Roda em uma cópia do banco configurado, que não é tocado.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--perfis', default=','.join(PERFIS),
+            help=f'Perfis medidos, separados por vírgula (padrão: {",".join(PERFIS)}).',
+        )
+        parser.add_argument(
+            '--times', type=int, default=0,
+            help='Troca os dados da cópia por uma liga sintética com este número de times (padrão: usa a cópia).',
+        )
+        parser.add_argument('--leitores', type=int, default=4, help='Threads lendo ao mesmo tempo (padrão: 4).')
+        parser.add_argument('--escritores', type=int, default=2, help='Threads gravando ao mesmo tempo (padrão: 2).')
+        parser.add_argument('--duracao', type=float, default=3.0, help='Segundos de medição por perfil (padrão: 3).')
+        parser.add_argument(
+            '--escrita-ms', type=int, default=20,
+            help='Quanto cada transação de escrita fica aberta, em ms (padrão: 20).',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('O benchmark só se aplica ao SQLite.')
+        perfis = options['perfis'].split(',')
+        desconhecidos = set(perfis) - set(PERFIS)
+        if desconhecidos:
+            raise CommandError(f'Perfis desconhecidos: {", ".join(sorted(desconhecidos))}.')
+        if min(options['leitores'], options['escritores']) < 1 or options['duracao'] <= 0:
+            raise CommandError('--leitores, --escritores e --duracao devem ser positivos.')
+
+        if options['times'] == 1 or options['times'] < 0:
+            raise CommandError('--times precisa de pelo menos 2 times.')
+
+        with tempfile.TemporaryDirectory() as pasta:
+            base = os.path.join(pasta, 'base.sqlite3')
+            self.copiar(connection, base)
+            if options['times']:
+                self.gerar(base, options['times'])
+
+            self.stdout.write(f'{"perfil":10} {"leituras":>9} {"p50 ms":>8} {"p95 ms":>8} {"máx ms":>8} '
+                              f'{"escritas":>9} {"p50 ms":>8} {"p95 ms":>8} {"máx ms":>8} {"travadas":>9}')
+            for perfil in perfis:
+                # Cópia nova a cada perfil: as escritas de um não pesam no outro
+                caminho = os.path.join(pasta, f'{perfil}.sqlite3')
+                with sqlite3.connect(base) as origem:
+                    self.copiar_arquivo(origem, caminho)
+                origem.close()
+
+                try:
+                    r = medir_concorrencia(
+                        caminho, perfil, leitores=options['leitores'], escritores=options['escritores'],
+                        duracao=options['duracao'], escrita_ms=options['escrita_ms'],
+                    )
+                except ValueError as erro:
+                    raise CommandError(str(erro))
+                self.stdout.write(
+                    f'{r.perfil:10} {r.leituras:>9} {r.leitura_p50:>8.2f} {r.leitura_p95:>8.2f} {r.leitura_max:>8.1f} '
+                    f'{r.escritas:>9} {r.escrita_p50:>8.2f} {r.escrita_p95:>8.2f} {r.escrita_max:>8.1f} {r.travadas:>9}'
+                )
+
+    def copiar(self, conexao, caminho):
+        # Pela API de backup: cópia consistente mesmo com o banco em uso
+        conexao.ensure_connection()
+        self.copiar_arquivo(conexao.connection, caminho)
+
+    def copiar_arquivo(self, origem, caminho):
+        destino = sqlite3.connect(caminho)
+        origem.backup(destino)
+        destino.close()
+
+    def gerar(self, caminho, times):
+        """Liga sintética (turno e returno, 3/4 realizados) gravada na cópia pela conexão do Django."""
+        nome = connection.settings_dict['NAME']
+        connection.close()
+        connection.settings_dict['NAME'] = caminho
+        try:
+            Time.objects.all().delete()
+            rodadas = 2 * (times - 1)
+            resumo = gerar_liga(times=times, rodadas=rodadas, rodadas_realizadas=rodadas * 3 // 4)
+        finally:
+            connection.close()
+            connection.settings_dict['NAME'] = nome
+        self.stdout.write(f'Liga com {resumo.times} times, {resumo.jogos} jogos e {resumo.gols} gols.')
@@ -0,0 +1,66 @@
+# core/management/commands/export_data.py
+
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.exportacao import CONSULTAS, FORMATOS, TAMANHO_BLOCO, FormatoIndisponivel, exportar
+
+
+class Command(BaseCommand):
+    help = (
+        'Exporta jogos, gols ou a classificação em CSV, JSON Lines ou Arrow (requer pyarrow), '
+        'com os mesmos filtros das listas do painel. Lê o banco em blocos: a memória não '
+        'cresce com o tamanho da tabela.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('tipo', choices=sorted(CONSULTAS), help='O que exportar.')
+        parser.add_argument('--formato', choices=FORMATOS, default='csv', help='Formato da saída (padrão: csv).')
+        parser.add_argument('--saida', help='Arquivo de saída (padrão: a saída padrão).')
+        parser.add_argument(
+            '--bloco', type=int, default=TAMANHO_BLOCO,
+            help=f'Linhas lidas do banco por vez (padrão: {TAMANHO_BLOCO}).',
+        )
+        filtros = parser.add_argument_group('filtros')
+        filtros.add_argument('--time', help='Id do time.')
+        filtros.add_argument('--rodada', help='Rodada (jogos, e o retrato da classificação nessa rodada).')
+        filtros.add_argument('--status', choices=('realizado', 'agendado', 'atrasado'), help='Situação dos jogos.')
+        filtros.add_argument('--data-inicio', help='Jogos a partir da data (AAAA-MM-DD).')
+        filtros.add_argument('--data-fim', help='Jogos até a data (AAAA-MM-DD).')
+        filtros.add_argument('--jogador', help='Id do jogador (gols).')
+        filtros.add_argument('--jogo', help='Id do jogo (gols).')
+
+    def handle(self, *args, **options):
+        if options['bloco'] < 1:
+            raise CommandError('--bloco deve ser positivo.')
+        filtros = {
+            nome: options[nome]
+            for nome in ('time', 'rodada', 'status', 'data_inicio', 'data_fim', 'jogador', 'jogo')
+            if options[nome]
+        }
+        try:
+            conteudo = exportar(options['tipo'], options['formato'], filtros, options['bloco'])
+        except FormatoIndisponivel as erro:
+            raise CommandError(str(erro))
+
+        binario = options['formato'] == 'arrow'
+        inicio = time.perf_counter()
+        if options['saida']:
+            modo = {'mode': 'wb'} if binario else {'mode': 'w', 'encoding': 'utf-8', 'newline': ''}
+            try:
+                with open(options['saida'], **modo) as saida:
+                    for pedaco in conteudo:
+                        saida.write(pedaco)
+            except OSError as erro:
+                raise CommandError(str(erro))
+            duracao = time.perf_counter() - inicio
+            self.stderr.write(self.style.SUCCESS(f'Exportado para {options["saida"]} em {duracao:.1f}s.'))
+        elif binario:
+            for pedaco in conteudo:
+                sys.stdout.buffer.write(pedaco)
+            sys.stdout.buffer.flush()
+        else:
+            for pedaco in conteudo:
+                self.stdout.write(pedaco, ending='')
@@ -0,0 +1,53 @@
+# core/management/commands/generate_league.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.gerador import gerar_liga
+from core.models import Time
+
+
+class Command(BaseCommand):
+    help = 'Gera uma liga sintética e determinística (times, elencos, jogos e gols) para testes de carga.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--times', type=int, default=20, help='Número de times (padrão: 20).')
+        parser.add_argument('--jogadores', type=int, default=22, help='Jogadores por time (padrão: 22).')
+        parser.add_argument('--rodadas', type=int, default=38, help='Número de rodadas (padrão: 38).')
+        parser.add_argument(
+            '--realizadas', type=int, default=None,
+            help='Rodadas já realizadas; as demais ficam agendadas (padrão: todas).',
+        )
+        parser.add_argument('--gols', type=float, default=2.5, help='Média de gols por jogo (padrão: 2.5).')
+        parser.add_argument('--semente', type=int, default=0, help='Semente do gerador (padrão: 0).')
+        parser.add_argument(
+            '--limpar',
+            action='store_true',
+            help='Apaga todos os times (e, em cascata, jogadores, jogos e gols) antes de gerar.',
+        )
+
+    def handle(self, *args, **options):
+        if options['times'] < 2:
+            raise CommandError('A liga precisa de pelo menos 2 times.')
+        if options['realizadas'] is not None and not 0 <= options['realizadas'] <= options['rodadas']:
+            raise CommandError('--realizadas deve estar entre 0 e --rodadas.')
+
+        if options['limpar']:
+            Time.objects.all().delete()
+        elif Time.objects.exists():
+            raise CommandError('O banco já tem times cadastrados. Use --limpar para substituí-los.')
+
+        inicio = time.perf_counter()
+        resumo = gerar_liga(
+            times=options['times'],
+            jogadores_por_time=options['jogadores'],
+            rodadas=options['rodadas'],
+            gols_por_jogo=options['gols'],
+            rodadas_realizadas=options['realizadas'],
+            semente=options['semente'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'{resumo.times} times, {resumo.jogadores} jogadores, {resumo.jogos} jogos e '
+            f'{resumo.gols} gols gerados em {time.perf_counter() - inicio:.1f}s.'
+        ))
@@ -0,0 +1,60 @@
+# core/management/commands/generate_thumbnails.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cache import invalidar_cache
+from core.imagens import atualizar_miniaturas
+from core.models import Time, Jogador
+
+
+class Command(BaseCommand):
+    help = (
+        'Gera as miniaturas WebP/PNG dos logos dos times e das fotos dos jogadores '
+        'já cadastrados e grava a assinatura de cada imagem.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Apenas lista as imagens sem miniaturas, sem gerar. Sai com erro se houver alguma.',
+        )
+
+    def handle(self, *args, **options):
+        pendentes = 0
+        for model, campo in ((Time, 'logo'), (Jogador, 'foto')):
+            pendentes += self.processar(model, campo, options['check'])
+
+        if not pendentes:
+            self.stdout.write(self.style.SUCCESS('Todas as imagens têm miniaturas.'))
+        elif options['check']:
+            raise CommandError(f'{pendentes} imagem(ns) sem miniaturas.')
+        else:
+            invalidar_cache()
+            self.stdout.write(self.style.SUCCESS(f'Miniaturas geradas para {pendentes} imagem(ns).'))
+
+    def processar(self, model, campo, apenas_conferir):
+        assinatura = f'{campo}_assinatura'
+        objetos = model.objects.exclude(**{campo: ''}).exclude(**{f'{campo}__isnull': True}).only(campo, assinatura)
+        alterados = []
+        for obj in objetos.iterator():
+            if apenas_conferir:
+                if not getattr(obj, assinatura):
+                    self.stdout.write(f'{model._meta.verbose_name} {obj.pk}: {getattr(obj, campo).name}')
+                    alterados.append(obj)
+                continue
+
+            anterior = getattr(obj, assinatura)
+            try:
+                atualizar_miniaturas(obj, campo)
+            except OSError as erro:
+                self.stderr.write(f'{model._meta.verbose_name} {obj.pk}: {erro}')
+                continue
+            finally:
+                getattr(obj, campo).close()
+            if getattr(obj, assinatura) != anterior:
+                alterados.append(obj)
+
+        if alterados and not apenas_conferir:
+            model.objects.bulk_update(alterados, [assinatura], batch_size=500)
+        return len(alterados)
@@ -0,0 +1,56 @@
+# core/management/commands/import_data.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importacao import FORMATOS, IMPORTADORES, TAMANHO_LOTE, ArquivoInvalido, formato_do_arquivo, importar
+
+
+class Command(BaseCommand):
+    help = (
+        'Importa times, elencos ou jogos/resultados de um arquivo CSV (com cabeçalho), '
+        'array JSON ou JSON Lines. Linhas inválidas são listadas e as demais gravadas em lotes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo', help='Caminho do arquivo.')
+        parser.add_argument('--tipo', required=True, choices=sorted(IMPORTADORES), help='O que o arquivo contém.')
+        parser.add_argument('--formato', choices=FORMATOS, help='Formato do arquivo (padrão: pela extensão).')
+        parser.add_argument(
+            '--lote', type=int, default=TAMANHO_LOTE,
+            help=f'Linhas gravadas por transação (padrão: {TAMANHO_LOTE}).',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Apenas valida o arquivo, sem gravar. Sai com erro se alguma linha for inválida.',
+        )
+
+    def handle(self, *args, **options):
+        if options['lote'] < 1:
+            raise CommandError('--lote deve ser positivo.')
+        inicio = time.perf_counter()
+        try:
+            formato = options['formato'] or formato_do_arquivo(options['arquivo'])
+            with open(options['arquivo'], 'rb') as arquivo:
+                relatorio = importar(
+                    arquivo, options['tipo'], formato, gravar=not options['check'], tamanho_lote=options['lote']
+                )
+        except (OSError, ArquivoInvalido) as erro:
+            raise CommandError(str(erro))
+        duracao = time.perf_counter() - inicio
+
+        for linha, mensagem in relatorio.erros:
+            self.stdout.write(f'Linha {linha}: {mensagem}')
+        if relatorio.total_erros > len(relatorio.erros):
+            self.stdout.write(f'... e mais {relatorio.total_erros - len(relatorio.erros)} erro(s).')
+
+        acao = 'gravados' if relatorio.gravado else 'a gravar'
+        resumo = (
+            f'{relatorio.linhas} linha(s) em {duracao:.1f}s: {relatorio.criados} novo(s) e '
+            f'{relatorio.atualizados} atualizado(s) {acao}, {relatorio.total_erros} com erro.'
+        )
+        if relatorio.total_erros and options['check']:
+            raise CommandError(resumo)
+        self.stdout.write(self.style.SUCCESS(resumo))
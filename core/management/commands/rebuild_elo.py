@@ -0,0 +1,23 @@
+# core/management/commands/rebuild_elo.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.elo import reprocessar_elo
+from core.models import EloJogo, Time
+
+
+class Command(BaseCommand):
+    help = 'Recalcula o rating Elo de todos os times refazendo o histórico dos jogos realizados.'
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        reprocessar_elo()
+        duracao = time.perf_counter() - inicio
+
+        for nome, elo in Time.objects.order_by('-elo').values_list('nome', 'elo')[:10]:
+            self.stdout.write(f'{nome:<25} {elo:7.1f}')
+        self.stdout.write(self.style.SUCCESS(
+            f'{EloJogo.objects.count() // 2} jogo(s) reprocessado(s) em {duracao:.2f}s.'
+        ))
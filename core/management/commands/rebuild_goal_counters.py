@@ -0,0 +1,30 @@
+# core/management/commands/rebuild_goal_counters.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.scorers import reconstruir_contadores
+
+
+class Command(BaseCommand):
+    help = 'Recalcula os contadores de gols de jogadores e times a partir dos gols cadastrados.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Apenas confere os contadores, sem corrigir. Sai com erro se houver divergências.',
+        )
+
+    def handle(self, *args, **options):
+        gravar = not options['check']
+        divergencias = reconstruir_contadores(gravar=gravar)
+
+        for obj, campo, gravado, esperado in divergencias:
+            self.stdout.write(f'{obj}: {campo} gravado={gravado} esperado={esperado}')
+
+        if not divergencias:
+            self.stdout.write(self.style.SUCCESS('Contadores de gols consistentes.'))
+        elif gravar:
+            self.stdout.write(self.style.SUCCESS(f'{len(divergencias)} divergência(s) corrigida(s).'))
+        else:
+            raise CommandError(f'{len(divergencias)} divergência(s) encontrada(s).')
@@ -0,0 +1,30 @@
+# core/management/commands/rebuild_standings.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.standings import reconstruir_classificacao
+
+
+class Command(BaseCommand):
+    help = 'Recalcula a tabela de classificação a partir dos jogos realizados.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Apenas confere a tabela gravada, sem corrigir. Sai com erro se houver divergências.',
+        )
+
+    def handle(self, *args, **options):
+        gravar = not options['check']
+        divergencias = reconstruir_classificacao(gravar=gravar)
+
+        for time, campo, gravado, esperado in divergencias:
+            self.stdout.write(f'{time}: {campo} gravado={gravado} esperado={esperado}')
+
+        if not divergencias:
+            self.stdout.write(self.style.SUCCESS('Classificação consistente.'))
+        elif gravar:
+            self.stdout.write(self.style.SUCCESS(f'{len(divergencias)} divergência(s) corrigida(s).'))
+        else:
+            raise CommandError(f'{len(divergencias)} divergência(s) encontrada(s).')
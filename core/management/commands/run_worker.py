@@ -0,0 +1,125 @@
+# core/management/commands/run_worker.py
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import get_context
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+# Este módulo é importado de novo em cada processo do pool (spawn) antes do
+# django.setup(), então nada que carregue os models pode vir no topo
+
+
+def _iniciar_processo():
+    django.setup()
+
+
+def _executar(tarefa_id):
+    from core.tarefas import executar
+    return executar(tarefa_id)
+
+
+class Command(BaseCommand):
+    help = (
+        'Executa as tarefas enfileiradas (miniaturas e outros efeitos demorados) '
+        'em um pool de processos, com novas tentativas em caso de erro.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processos', type=int, default=min(os.cpu_count() or 1, 4),
+            help='Processos do pool (padrão: núcleos, até 4). Com 0 as tarefas rodam no próprio processo.',
+        )
+        parser.add_argument(
+            '--intervalo', type=float, default=1.0,
+            help='Segundos entre consultas à fila quando não há trabalho (padrão: 1).',
+        )
+        parser.add_argument(
+            '--uma-vez', action='store_true',
+            help='Sai quando não houver mais tarefas prontas, em vez de aguardar novas.',
+        )
+        parser.add_argument('--status', action='store_true', help='Apenas mostra o tamanho da fila.')
+
+    def handle(self, *args, **options):
+        if options['status']:
+            self.exibir_status()
+            return
+        if options['processos'] < 0 or options['intervalo'] <= 0:
+            raise CommandError('--processos não pode ser negativo e --intervalo deve ser positivo.')
+
+        if options['processos'] == 0:
+            concluidas, falhas = self.executar_local(options)
+        else:
+            concluidas, falhas = self.executar_pool(options)
+        self.stdout.write(self.style.SUCCESS(f'{concluidas} tarefa(s) concluída(s), {falhas} com erro.'))
+
+    def exibir_status(self):
+        from core.tarefas import resumo_fila
+        resumo = resumo_fila()
+        self.stdout.write(
+            f'Pendentes: {resumo.pendentes}  Executando: {resumo.executando}  Falhas: {resumo.falhas}'
+        )
+        if resumo.mais_antiga:
+            espera = (timezone.now() - resumo.mais_antiga).total_seconds()
+            self.stdout.write(f'Tarefa pronta mais antiga aguarda há {espera:.0f}s.')
+
+    def executar_local(self, options):
+        from core.tarefas import executar, reservar
+        concluidas = falhas = 0
+        while True:
+            reservadas = reservar(1)
+            if not reservadas:
+                if options['uma_vez']:
+                    return concluidas, falhas
+                time.sleep(options['intervalo'])
+                continue
+            if executar(reservadas[0]):
+                concluidas += 1
+            else:
+                falhas += 1
+
+    def executar_pool(self, options):
+        from core.tarefas import reservar
+        processos = options['processos']
+        concluidas = falhas = 0
+        # As conexões do processo principal não podem ser compartilhadas com o pool
+        connections.close_all()
+        pool = ProcessPoolExecutor(processos, mp_context=get_context('spawn'), initializer=_iniciar_processo)
+        em_execucao = set()
+        try:
+            while True:
+                prontas = {futuro for futuro in em_execucao if futuro.done()}
+                for futuro in prontas:
+                    try:
+                        concluida = futuro.result()
+                    except Exception as erro:
+                        # Nem o erro pôde ser gravado (ex.: banco indisponível);
+                        # a tarefa volta à fila quando vencer a reserva
+                        self.stderr.write(f'Erro no worker: {erro!r}')
+                        concluida = False
+                    if concluida:
+                        concluidas += 1
+                    else:
+                        falhas += 1
+                em_execucao -= prontas
+
+                reservadas = reservar(processos - len(em_execucao)) if len(em_execucao) < processos else []
+                em_execucao.update(pool.submit(_executar, tarefa_id) for tarefa_id in reservadas)
+                if reservadas:
+                    continue
+                if not em_execucao and options['uma_vez']:
+                    return concluidas, falhas
+                if em_execucao:
+                    wait(em_execucao, timeout=options['intervalo'], return_when=FIRST_COMPLETED)
+                else:
+                    time.sleep(options['intervalo'])
+        except KeyboardInterrupt:
+            # Tarefas já reservadas e não iniciadas voltam à fila quando vencer a reserva
+            self.stdout.write('Encerrando: aguardando as tarefas em execução...')
+            return concluidas, falhas
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,39 @@
+# core/management/commands/simulate_season.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.cache import guardar_por_versao, versao_dados
+from core.simulacao import CHAVE, SIMULACOES, simular_temporada
+
+
+class Command(BaseCommand):
+    help = (
+        'Simula os jogos restantes da temporada (Monte Carlo) e guarda as '
+        'probabilidades mostradas em /probabilidades/.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--simulacoes', type=int, default=SIMULACOES, help=f'Padrão: {SIMULACOES}.')
+        parser.add_argument('--processos', type=int, default=1, help='Processos usados na simulação.')
+        parser.add_argument('--semente', type=int, help='Semente dos sorteios, para repetir um resultado.')
+
+    def handle(self, *args, **options):
+        if options['simulacoes'] < 1:
+            raise CommandError('--simulacoes deve ser positivo.')
+        if options['processos'] < 1:
+            raise CommandError('--processos deve ser positivo.')
+
+        versao = versao_dados()
+        simulacao = simular_temporada(options['simulacoes'], options['processos'], options['semente'])
+        guardar_por_versao(CHAVE, simulacao, versao)
+
+        for linha in simulacao.linhas:
+            self.stdout.write(
+                f'{linha.nome:<25} {linha.pontos_esperados:6.1f} pts  '
+                f'título {linha.titulo:5.1f}%  Libertadores {linha.libertadores:5.1f}%  '
+                f'rebaixamento {linha.rebaixamento:5.1f}%'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'{simulacao.simulacoes} simulações de {simulacao.jogos_restantes} jogo(s) '
+            f'em {simulacao.duracao:.1f}s.'
+        ))
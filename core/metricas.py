@@ -0,0 +1,73 @@
+# core/metricas.py
+
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+
+class ColetorConsultas:
+    """
+    Wrapper de execução (``connection.execute_wrapper``) que registra as
+    consultas SQL: quantidade, tempo total e repetições pelo SQL sem
+    parâmetros (a "impressão digital" da consulta).
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.tempo = 0.0
+        self.impressoes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.tempo += time.perf_counter() - inicio
+            self.total += 1
+            self.impressoes[sql] += 1
+
+    @property
+    def duplicadas(self):
+        """{sql: vezes} das consultas executadas mais de uma vez."""
+        return {sql: vezes for sql, vezes in self.impressoes.items() if vezes > 1}
+
+    @property
+    def total_duplicadas(self):
+        return sum(vezes - 1 for vezes in self.duplicadas.values())
+
+    def server_timing(self):
+        """Valor do cabeçalho ``Server-Timing`` com as métricas do banco."""
+        return (
+            f'db;dur={self.tempo * 1000:.2f};desc="{self.total} consultas", '
+            f'db-dup;desc="{self.total_duplicadas} repetidas"'
+        )
+
+
+@contextmanager
+def medir_consultas():
+    """
+    Mede as consultas feitas dentro do bloco, em todos os bancos:
+
+        with medir_consultas() as coletor:
+            client.get(url)
+        coletor.total, coletor.tempo, coletor.duplicadas
+    """
+    coletor = ColetorConsultas()
+    with ExitStack() as pilha:
+        for conexao in connections.all():
+            pilha.enter_context(conexao.execute_wrapper(coletor))
+        yield coletor
+
+
+def orcamento_consultas(limite):
+    """
+    Declara o número máximo de consultas SQL que a view pode fazer.
+    Verificado pela suíte de testes e pelo ``MetricasConsultasMiddleware``.
+    Deve ser o decorador mais externo.
+    """
+    def decorador(view):
+        view.orcamento_consultas = limite
+        return view
+    return decorador
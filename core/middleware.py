@@ -0,0 +1,119 @@
+# core/middleware.py
+
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+
+from . import roteamento
+from .metricas import medir_consultas
+
+logger = logging.getLogger('core.consultas')
+
+
+class MetricasConsultasMiddleware:
+    """
+    Mede as consultas SQL de cada requisição e devolve o resultado no
+    cabeçalho ``Server-Timing``. Com ``LOG_CONSULTAS = True`` também
+    registra no logger ``core.consultas``, avisando quando a view passa
+    do orçamento declarado com ``@orcamento_consultas``.
+
+    Funciona nos dois modos: sob ASGI não força a requisição para uma
+    thread, então os streams assíncronos (SSE) continuam sem thread própria.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with medir_consultas() as coletor:
+            response = self.get_response(request)
+        return self.finalizar(request, response, coletor)
+
+    async def __acall__(self, request):
+        # As views síncronas rodam na thread do sync_to_async, com as conexões
+        # de lá: o wrapper precisa ser instalado (e removido) nessa thread
+        medicao = medir_consultas()
+        coletor = await sync_to_async(medicao.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(medicao.__exit__)(None, None, None)
+        return self.finalizar(request, response, coletor)
+
+    def finalizar(self, request, response, coletor):
+        response['Server-Timing'] = coletor.server_timing()
+
+        if getattr(settings, 'LOG_CONSULTAS', False):
+            self.registrar(request, coletor)
+        return response
+
+    def registrar(self, request, coletor):
+        match = request.resolver_match
+        limite = getattr(match.func, 'orcamento_consultas', None) if match else None
+
+        nivel = logging.INFO
+        if limite is not None and coletor.total > limite:
+            nivel = logging.WARNING
+
+        logger.log(
+            nivel,
+            '%s %s: %d consultas (orçamento %s), %.1f ms, %d repetidas',
+            request.method, request.path, coletor.total, limite if limite is not None else '-',
+            coletor.tempo * 1000, coletor.total_duplicadas,
+        )
+        for sql, vezes in coletor.duplicadas.items():
+            logger.debug('%dx %s', vezes, sql)
+
+
+class ReplicaLeituraMiddleware:
+    """
+    Liga o ``RoteadorReplica`` às requisições: GETs das views públicas leem
+    da réplica (quando configurada). Quem escreve recebe um cookie curto e
+    lê do primário nas requisições seguintes, até a réplica alcançar.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        estado, token = roteamento.iniciar_requisicao()
+        try:
+            response = self.get_response(request)
+        finally:
+            roteamento.encerrar_requisicao(token)
+        return self.finalizar(estado, response)
+
+    async def __acall__(self, request):
+        # O estado é um objeto só: as views síncronas, em outra thread e
+        # com uma cópia do contexto, marcam as escritas nele mesmo
+        estado, token = roteamento.iniciar_requisicao()
+        try:
+            response = await self.get_response(request)
+        finally:
+            roteamento.encerrar_requisicao(token)
+        return self.finalizar(estado, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        roteamento.liberar_replica(view_func, request)
+
+    def finalizar(self, estado, response):
+        if estado.escreveu and roteamento.replica_configurada():
+            response.set_cookie(
+                roteamento.COOKIE_PRIMARIO, '1', max_age=roteamento.atraso_maximo(), httponly=True, samesite='Lax'
+            )
+        return response
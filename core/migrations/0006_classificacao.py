@@ -0,0 +1,64 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def popular_classificacao(apps, schema_editor):
+    Time = apps.get_model('core', 'Time')
+    Jogo = apps.get_model('core', 'Jogo')
+    Classificacao = apps.get_model('core', 'Classificacao')
+
+    linhas = {time_id: Classificacao(time_id=time_id) for time_id in Time.objects.values_list('id', flat=True)}
+    for jogo in Jogo.objects.filter(realizado=True):
+        lados = (
+            (jogo.time_casa_id, jogo.gols_casa, jogo.gols_visitante),
+            (jogo.time_visitante_id, jogo.gols_visitante, jogo.gols_casa),
+        )
+        for time_id, pro, contra in lados:
+            linha = linhas[time_id]
+            linha.jogos += 1
+            linha.gols_pro += pro
+            linha.gols_contra += contra
+            linha.saldo_gols += pro - contra
+            if pro > contra:
+                linha.vitorias += 1
+                linha.pontos += 3
+            elif pro == contra:
+                linha.empates += 1
+                linha.pontos += 1
+            else:
+                linha.derrotas += 1
+    Classificacao.objects.bulk_create(linhas.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_alter_jogo_options_gol'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Classificacao',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pontos', models.IntegerField(default=0, verbose_name='Pontos')),
+                ('jogos', models.IntegerField(default=0, verbose_name='Jogos')),
+                ('vitorias', models.IntegerField(default=0, verbose_name='Vitórias')),
+                ('empates', models.IntegerField(default=0, verbose_name='Empates')),
+                ('derrotas', models.IntegerField(default=0, verbose_name='Derrotas')),
+                ('gols_pro', models.IntegerField(default=0, verbose_name='Gols Pró')),
+                ('gols_contra', models.IntegerField(default=0, verbose_name='Gols Contra')),
+                ('saldo_gols', models.IntegerField(default=0, verbose_name='Saldo de Gols')),
+                ('time', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='classificacao', to='core.time', verbose_name='Time')),
+            ],
+            options={
+                'verbose_name': 'Classificação',
+                'verbose_name_plural': 'Classificação',
+                'ordering': ['-pontos', '-vitorias', '-saldo_gols', '-gols_pro'],
+                'indexes': [models.Index(fields=['-pontos', '-vitorias', '-saldo_gols', '-gols_pro'], name='classificacao_ordem_idx')],
+            },
+        ),
+        migrations.RunPython(popular_classificacao, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+CAMPOS = ('jogos', 'vitorias', 'empates', 'derrotas', 'gols_pro', 'gols_contra', 'saldo_gols', 'pontos')
+
+
+def popular_rodadas(apps, schema_editor):
+    Time = apps.get_model('core', 'Time')
+    Jogo = apps.get_model('core', 'Jogo')
+    ClassificacaoRodada = apps.get_model('core', 'ClassificacaoRodada')
+
+    times = list(Time.objects.order_by('nome').values_list('id', flat=True))
+    acumulado = {time_id: dict.fromkeys(CAMPOS, 0) for time_id in times}
+    jogos = Jogo.objects.filter(realizado=True).order_by('rodada')
+    rodadas = sorted(set(jogos.values_list('rodada', flat=True)))
+
+    retratos = []
+    for rodada in rodadas:
+        for jogo in jogos.filter(rodada=rodada):
+            lados = (
+                (jogo.time_casa_id, jogo.gols_casa, jogo.gols_visitante),
+                (jogo.time_visitante_id, jogo.gols_visitante, jogo.gols_casa),
+            )
+            for time_id, pro, contra in lados:
+                linha = acumulado[time_id]
+                linha['jogos'] += 1
+                linha['gols_pro'] += pro
+                linha['gols_contra'] += contra
+                linha['saldo_gols'] += pro - contra
+                linha['vitorias'] += pro > contra
+                linha['empates'] += pro == contra
+                linha['derrotas'] += pro < contra
+                linha['pontos'] += 3 if pro > contra else int(pro == contra)
+
+        ordem = sorted(
+            times,
+            key=lambda t: (acumulado[t]['pontos'], acumulado[t]['vitorias'], acumulado[t]['saldo_gols'], acumulado[t]['gols_pro']),
+            reverse=True,
+        )
+        for posicao, time_id in enumerate(ordem, start=1):
+            retratos.append(ClassificacaoRodada(time_id=time_id, rodada=rodada, posicao=posicao, **acumulado[time_id]))
+    ClassificacaoRodada.objects.bulk_create(retratos)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_classificacao'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClassificacaoRodada',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pontos', models.IntegerField(default=0, verbose_name='Pontos')),
+                ('jogos', models.IntegerField(default=0, verbose_name='Jogos')),
+                ('vitorias', models.IntegerField(default=0, verbose_name='Vitórias')),
+                ('empates', models.IntegerField(default=0, verbose_name='Empates')),
+                ('derrotas', models.IntegerField(default=0, verbose_name='Derrotas')),
+                ('gols_pro', models.IntegerField(default=0, verbose_name='Gols Pró')),
+                ('gols_contra', models.IntegerField(default=0, verbose_name='Gols Contra')),
+                ('saldo_gols', models.IntegerField(default=0, verbose_name='Saldo de Gols')),
+                ('rodada', models.IntegerField(verbose_name='Rodada')),
+                ('posicao', models.IntegerField(verbose_name='Posição')),
+                ('time', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='classificacao_rodadas', to='core.time', verbose_name='Time')),
+            ],
+            options={
+                'verbose_name': 'Classificação por Rodada',
+                'verbose_name_plural': 'Classificação por Rodada',
+                'ordering': ['rodada', 'posicao'],
+                'indexes': [models.Index(fields=['rodada', 'posicao'], name='classif_rodada_posicao_idx')],
+                'constraints': [models.UniqueConstraint(fields=('time', 'rodada'), name='classificacao_rodada_unica')],
+            },
+        ),
+        migrations.RunPython(popular_rodadas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:54
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def popular_contadores(apps, schema_editor):
+    contagens = {
+        'gols_marcados': Count('gols', filter=Q(gols__contra=False)),
+        'gols_contra': Count('gols', filter=Q(gols__contra=True)),
+        'gols_penalti': Count('gols', filter=Q(gols__contra=False, gols__tipo='PENALTI')),
+    }
+    for nome in ('Jogador', 'Time'):
+        Model = apps.get_model('core', nome)
+        objetos = list(Model.objects.annotate(**{f'_{campo}': expr for campo, expr in contagens.items()}))
+        for obj in objetos:
+            for campo in contagens:
+                setattr(obj, campo, getattr(obj, f'_{campo}'))
+        Model.objects.bulk_update(objetos, list(contagens))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_classificacaorodada'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jogador',
+            name='gols_contra',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Gols Contra'),
+        ),
+        migrations.AddField(
+            model_name='jogador',
+            name='gols_marcados',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Gols Marcados'),
+        ),
+        migrations.AddField(
+            model_name='jogador',
+            name='gols_penalti',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Gols de Pênalti'),
+        ),
+        migrations.AddField(
+            model_name='time',
+            name='gols_contra',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Gols Contra'),
+        ),
+        migrations.AddField(
+            model_name='time',
+            name='gols_marcados',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Gols Marcados'),
+        ),
+        migrations.AddField(
+            model_name='time',
+            name='gols_penalti',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Gols de Pênalti'),
+        ),
+        migrations.AddIndex(
+            model_name='jogador',
+            index=models.Index(fields=['-gols_marcados', 'nome'], name='jogador_gols_marcados_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='time',
+            index=models.Index(fields=['-gols_marcados', 'nome'], name='time_gols_marcados_idx'),
+        ),
+        migrations.RunPython(popular_contadores, migrations.RunPython.noop),
+    ]
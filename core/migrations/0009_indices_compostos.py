@@ -0,0 +1,45 @@
+# Generated by Django 6.0.2 on 2026-10-18 12:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_contadores_gols'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gol',
+            index=models.Index(condition=models.Q(('contra', False)), fields=['time', 'jogador'], name='gol_marcados_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gol',
+            index=models.Index(condition=models.Q(('contra', False)), fields=['jogador'], name='gol_marcados_jogador_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gol',
+            index=models.Index(fields=['jogo', 'minuto'], name='gol_jogo_minuto_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jogo',
+            index=models.Index(fields=['data_jogo'], name='jogo_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jogo',
+            index=models.Index(condition=models.Q(('realizado', True)), fields=['data_jogo'], name='jogo_realizados_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jogo',
+            index=models.Index(condition=models.Q(('realizado', False)), fields=['data_jogo'], name='jogo_pendentes_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jogo',
+            index=models.Index(condition=models.Q(('realizado', True)), fields=['rodada', 'data_jogo'], name='jogo_realizados_rodada_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jogo',
+            index=models.Index(condition=models.Q(('realizado', False)), fields=['rodada', 'data_jogo'], name='jogo_pendentes_rodada_idx'),
+        ),
+    ]
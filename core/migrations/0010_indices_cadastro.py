@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_indices_compostos'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='gol',
+            index=models.Index(fields=['data_cadastro'], name='gol_cadastro_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jogador',
+            index=models.Index(fields=['data_cadastro'], name='jogador_cadastro_idx'),
+        ),
+    ]
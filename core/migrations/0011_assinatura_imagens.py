@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_indices_cadastro'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jogador',
+            name='foto_assinatura',
+            field=models.CharField(blank=True, editable=False, max_length=16, verbose_name='Assinatura da Foto'),
+        ),
+        migrations.AddField(
+            model_name='time',
+            name='logo_assinatura',
+            field=models.CharField(blank=True, editable=False, max_length=16, verbose_name='Assinatura do Logo'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:17
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_assinatura_imagens'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tarefa',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome', models.CharField(max_length=200, verbose_name='Tarefa')),
+                ('argumentos', models.JSONField(blank=True, default=dict, verbose_name='Argumentos')),
+                ('chave', models.CharField(blank=True, max_length=200, null=True, unique=True, verbose_name='Chave de Idempotência')),
+                ('estado', models.CharField(choices=[('pendente', 'Pendente'), ('executando', 'Executando'), ('concluida', 'Concluída'), ('falhou', 'Falhou')], default='pendente', max_length=10, verbose_name='Estado')),
+                ('tentativas', models.IntegerField(default=0, verbose_name='Tentativas')),
+                ('max_tentativas', models.IntegerField(default=3, verbose_name='Máximo de Tentativas')),
+                ('executar_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Executar a partir de')),
+                ('erro', models.TextField(blank=True, verbose_name='Último Erro')),
+                ('criada_em', models.DateTimeField(auto_now_add=True, verbose_name='Criada em')),
+                ('iniciada_em', models.DateTimeField(blank=True, null=True, verbose_name='Iniciada em')),
+                ('concluida_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluída em')),
+            ],
+            options={
+                'verbose_name': 'Tarefa',
+                'verbose_name_plural': 'Tarefas',
+                'ordering': ['-criada_em'],
+                'indexes': [models.Index(fields=['estado', 'executar_em'], name='tarefa_fila_idx')],
+            },
+        ),
+    ]
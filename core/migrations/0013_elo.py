@@ -0,0 +1,61 @@
+# Generated by Django 6.0.2 on 2026-10-18 13:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def popular_elo(apps, schema_editor):
+    from core.elo import ELO_INICIAL, variacao
+
+    Time = apps.get_model('core', 'Time')
+    Jogo = apps.get_model('core', 'Jogo')
+    EloJogo = apps.get_model('core', 'EloJogo')
+    elos = dict.fromkeys(Time.objects.values_list('id', flat=True), ELO_INICIAL)
+    historico = []
+    jogos = Jogo.objects.filter(realizado=True).order_by('data_jogo', 'id').values_list(
+        'id', 'data_jogo', 'time_casa_id', 'time_visitante_id', 'gols_casa', 'gols_visitante'
+    )
+    for jogo_id, data, casa, visitante, gols_casa, gols_visitante in jogos:
+        delta = variacao(elos[casa], elos[visitante], gols_casa, gols_visitante)
+        for time_id, sinal in ((casa, 1), (visitante, -1)):
+            historico.append(EloJogo(
+                jogo_id=jogo_id, time_id=time_id, data_jogo=data,
+                elo_anterior=elos[time_id], elo=elos[time_id] + sinal * delta,
+            ))
+            elos[time_id] += sinal * delta
+    EloJogo.objects.bulk_create(historico, batch_size=2000)
+    Time.objects.bulk_update([Time(id=time_id, elo=elo) for time_id, elo in elos.items()], ['elo'], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_tarefa'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='time',
+            name='elo',
+            field=models.FloatField(default=1500, editable=False, verbose_name='Rating Elo'),
+        ),
+        migrations.CreateModel(
+            name='EloJogo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data_jogo', models.DateTimeField(verbose_name='Data do Jogo')),
+                ('elo_anterior', models.FloatField(verbose_name='Rating Antes')),
+                ('elo', models.FloatField(verbose_name='Rating Depois')),
+                ('jogo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='elos', to='core.jogo', verbose_name='Jogo')),
+                ('time', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='elos', to='core.time', verbose_name='Time')),
+            ],
+            options={
+                'verbose_name': 'Rating Elo por Jogo',
+                'verbose_name_plural': 'Rating Elo por Jogo',
+                'ordering': ['data_jogo', 'jogo_id'],
+                'indexes': [models.Index(fields=['data_jogo', 'jogo'], name='elo_data_idx'), models.Index(fields=['time', 'data_jogo', 'jogo'], name='elo_time_data_idx')],
+                'constraints': [models.UniqueConstraint(fields=('jogo', 'time'), name='elo_jogo_unico')],
+            },
+        ),
+        migrations.RunPython(popular_elo, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 6.0.2 on 2026-10-18 14:02
+
+from django.db import OperationalError, migrations
+
+# Índice de busca textual (FTS5) de jogadores e times, só no SQLite. O
+# rowid codifica a linha de origem: 2 * id para jogadores e 2 * id + 1 para
+# times. ``time_id`` (não indexado) é o time do jogador, ou o próprio time.
+# Os triggers mantêm o índice em dia com qualquer escrita, inclusive
+# bulk_create, update() e exclusões em cascata.
+CRIAR = [
+    """
+    CREATE VIRTUAL TABLE core_busca USING fts5(
+        nome, time, time_id UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER core_busca_jogador_insert AFTER INSERT ON core_jogador BEGIN
+        INSERT INTO core_busca (rowid, nome, time, time_id)
+        VALUES (2 * new.id, new.nome, (SELECT nome FROM core_time WHERE id = new.time_id), new.time_id);
+    END
+    """,
+    """
+    CREATE TRIGGER core_busca_jogador_update AFTER UPDATE OF nome, time_id ON core_jogador BEGIN
+        UPDATE core_busca
+        SET nome = new.nome, time = (SELECT nome FROM core_time WHERE id = new.time_id), time_id = new.time_id
+        WHERE rowid = 2 * new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER core_busca_jogador_delete AFTER DELETE ON core_jogador BEGIN
+        DELETE FROM core_busca WHERE rowid = 2 * old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER core_busca_time_insert AFTER INSERT ON core_time BEGIN
+        INSERT INTO core_busca (rowid, nome, time, time_id) VALUES (2 * new.id + 1, new.nome, '', new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER core_busca_time_update AFTER UPDATE OF nome ON core_time BEGIN
+        UPDATE core_busca SET nome = new.nome WHERE rowid = 2 * new.id + 1;
+        UPDATE core_busca SET time = new.nome
+        WHERE rowid IN (SELECT 2 * id FROM core_jogador WHERE time_id = new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER core_busca_time_delete AFTER DELETE ON core_time BEGIN
+        DELETE FROM core_busca WHERE rowid = 2 * old.id + 1;
+    END
+    """,
+    """
+    INSERT INTO core_busca (rowid, nome, time, time_id)
+    SELECT 2 * core_jogador.id, core_jogador.nome, core_time.nome, core_time.id
+    FROM core_jogador INNER JOIN core_time ON core_time.id = core_jogador.time_id
+    UNION ALL
+    SELECT 2 * id + 1, nome, '', id FROM core_time
+    """,
+]
+
+REMOVER = [
+    f'DROP TRIGGER IF EXISTS core_busca_{tabela}_{evento}'
+    for tabela in ('jogador', 'time') for evento in ('insert', 'update', 'delete')
+] + ['DROP TABLE IF EXISTS core_busca']
+
+
+def criar_indice(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    try:
+        schema_editor.execute(CRIAR[0])
+    except OperationalError:
+        # SQLite compilado sem FTS5: a busca usa o fallback (core.busca)
+        return
+    for comando in CRIAR[1:]:
+        schema_editor.execute(comando)
+
+
+def remover_indice(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for comando in REMOVER:
+            schema_editor.execute(comando)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_elo'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indice, remover_indice),
+    ]
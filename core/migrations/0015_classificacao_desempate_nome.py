@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-18 14:18
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_busca'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='classificacao',
+            options={'ordering': ['-pontos', '-vitorias', '-saldo_gols', '-gols_pro', 'time__nome'], 'verbose_name': 'Classificação', 'verbose_name_plural': 'Classificação'},
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.2 on 2026-10-18 14:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_classificacao_desempate_nome'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tarefa',
+            name='reservada_ate',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Reservada até'),
+        ),
+    ]
@@ -1,16 +1,29 @@
 # core/models.py
 
 from django.db import models
+from django.utils import timezone
 
 class Time(models.Model):
     nome = models.CharField('Nome do Time', max_length=100)
     logo = models.ImageField('Logo', upload_to='logos/', null=True, blank=True)
+    # Hash do conteúdo do logo, que nomeia as miniaturas (core.imagens)
+    logo_assinatura = models.CharField('Assinatura do Logo', max_length=16, blank=True, editable=False)
     data_criacao = models.DateTimeField('Data de Cadastro', auto_now_add=True)
     
+    # Contadores mantidos a cada gol cadastrado, editado ou excluído
+    gols_marcados = models.IntegerField('Gols Marcados', default=0, editable=False)
+    gols_contra = models.IntegerField('Gols Contra', default=0, editable=False)
+    gols_penalti = models.IntegerField('Gols de Pênalti', default=0, editable=False)
+    # Rating Elo após o último jogo realizado (core.elo)
+    elo = models.FloatField('Rating Elo', default=1500, editable=False)
+    
     class Meta:
         verbose_name = 'Time'
         verbose_name_plural = 'Times'
         ordering = ['nome']
+        indexes = [
+            models.Index(fields=['-gols_marcados', 'nome'], name='time_gols_marcados_idx'),
+        ]
     
     def __str__(self):
         return self.nome
@@ -32,15 +45,27 @@ class Jogador(models.Model):
     numero = models.IntegerField('Número da Camisa', null=True, blank=True)
     posicao = models.CharField('Posição', max_length=3, choices=POSICOES)
     foto = models.ImageField('Foto', upload_to='jogadores/', null=True, blank=True)
+    # Hash do conteúdo da foto, que nomeia as miniaturas (core.imagens)
+    foto_assinatura = models.CharField('Assinatura da Foto', max_length=16, blank=True, editable=False)
     data_nascimento = models.DateField('Data de Nascimento', null=True, blank=True)
     nacionalidade = models.CharField('Nacionalidade', max_length=50, default='Brasileiro')
     ativo = models.BooleanField('Ativo?', default=True)
     data_cadastro = models.DateTimeField('Data de Cadastro', auto_now_add=True)
     
+    # Contadores mantidos a cada gol cadastrado, editado ou excluído
+    gols_marcados = models.IntegerField('Gols Marcados', default=0, editable=False)
+    gols_contra = models.IntegerField('Gols Contra', default=0, editable=False)
+    gols_penalti = models.IntegerField('Gols de Pênalti', default=0, editable=False)
+    
     class Meta:
         verbose_name = 'Jogador'
         verbose_name_plural = 'Jogadores'
         ordering = ['time', 'posicao', 'numero']
+        indexes = [
+            models.Index(fields=['-gols_marcados', 'nome'], name='jogador_gols_marcados_idx'),
+            # Listagem do painel, paginada por (-data_cadastro, -id)
+            models.Index(fields=['data_cadastro'], name='jogador_cadastro_idx'),
+        ]
     
     def __str__(self):
         return f'{self.nome} ({self.get_posicao_display()})'
@@ -70,6 +95,18 @@ class Jogo(models.Model):
         verbose_name = 'Jogo'
         verbose_name_plural = 'Jogos'
         ordering = ['-data_jogo']
+        # O SQLite compara booleanos como coluna pura (WHERE "realizado"),
+        # então a situação do jogo entra como condição de índice parcial.
+        indexes = [
+            # Ordenação padrão (painel, listas sem filtro)
+            models.Index(fields=['data_jogo'], name='jogo_data_idx'),
+            # Últimos resultados e próximos jogos, ordenados por data
+            models.Index(fields=['data_jogo'], condition=models.Q(realizado=True), name='jogo_realizados_data_idx'),
+            models.Index(fields=['data_jogo'], condition=models.Q(realizado=False), name='jogo_pendentes_data_idx'),
+            # Filtro e lista de rodadas, ordenados por data
+            models.Index(fields=['rodada', 'data_jogo'], condition=models.Q(realizado=True), name='jogo_realizados_rodada_idx'),
+            models.Index(fields=['rodada', 'data_jogo'], condition=models.Q(realizado=False), name='jogo_pendentes_rodada_idx'),
+        ]
     
     def __str__(self):
         if self.realizado:
@@ -98,6 +135,143 @@ class Gol(models.Model):
         verbose_name = 'Gol'
         verbose_name_plural = 'Gols'
         ordering = ['jogo', 'minuto']
+        indexes = [
+            # Artilheiros de um time: contra=False, time=? agrupado por jogador
+            models.Index(fields=['time', 'jogador'], condition=models.Q(contra=False), name='gol_marcados_time_idx'),
+            # Gols de um jogador sem contar gols contra
+            models.Index(fields=['jogador'], condition=models.Q(contra=False), name='gol_marcados_jogador_idx'),
+            # Súmula do jogo, na ordem padrão (jogo, minuto)
+            models.Index(fields=['jogo', 'minuto'], name='gol_jogo_minuto_idx'),
+            # Listagem do painel, paginada por (-data_cadastro, -id)
+            models.Index(fields=['data_cadastro'], name='gol_cadastro_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.jogador.nome} ({self.minuto}\') - {self.jogo}'
+
+class EstatisticasClassificacao(models.Model):
+    pontos = models.IntegerField('Pontos', default=0)
+    jogos = models.IntegerField('Jogos', default=0)
+    vitorias = models.IntegerField('Vitórias', default=0)
+    empates = models.IntegerField('Empates', default=0)
+    derrotas = models.IntegerField('Derrotas', default=0)
+    gols_pro = models.IntegerField('Gols Pró', default=0)
+    gols_contra = models.IntegerField('Gols Contra', default=0)
+    saldo_gols = models.IntegerField('Saldo de Gols', default=0)
+    
+    class Meta:
+        abstract = True
+    
+    @property
+    def aproveitamento(self):
+        if not self.jogos:
+            return 0
+        return round((self.pontos / (self.jogos * 3)) * 100, 1)
+
+
+class Classificacao(EstatisticasClassificacao):
+    time = models.OneToOneField(Time, on_delete=models.CASCADE, related_name='classificacao', verbose_name='Time')
+    
+    class Meta:
+        verbose_name = 'Classificação'
+        verbose_name_plural = 'Classificação'
+        # Empate em tudo: ordem alfabética, como nas posições por rodada e na exportação
+        ordering = ['-pontos', '-vitorias', '-saldo_gols', '-gols_pro', 'time__nome']
+        # O nome do time fica em outra tabela e não entra no índice: ele cobre
+        # os critérios de pontuação e o desempate final ordena só os empatados
+        indexes = [
+            models.Index(
+                fields=['-pontos', '-vitorias', '-saldo_gols', '-gols_pro'],
+                name='classificacao_ordem_idx',
+            ),
+        ]
+    
+    def __str__(self):
+        return f'{self.time} - {self.pontos} pts'
+
+
+class ClassificacaoRodada(EstatisticasClassificacao):
+    time = models.ForeignKey(Time, on_delete=models.CASCADE, related_name='classificacao_rodadas', verbose_name='Time')
+    rodada = models.IntegerField('Rodada')
+    posicao = models.IntegerField('Posição')
+    
+    class Meta:
+        verbose_name = 'Classificação por Rodada'
+        verbose_name_plural = 'Classificação por Rodada'
+        ordering = ['rodada', 'posicao']
+        constraints = [
+            models.UniqueConstraint(fields=['time', 'rodada'], name='classificacao_rodada_unica'),
+        ]
+        indexes = [
+            models.Index(fields=['rodada', 'posicao'], name='classif_rodada_posicao_idx'),
+        ]
+    
+    def __str__(self):
+        return f'Rodada {self.rodada}: {self.posicao}º {self.time}'
+
+
+class EloJogo(models.Model):
+    """Rating Elo de um time antes e depois de cada jogo realizado (core.elo)."""
+    jogo = models.ForeignKey(Jogo, on_delete=models.CASCADE, related_name='elos', verbose_name='Jogo')
+    time = models.ForeignKey(Time, on_delete=models.CASCADE, related_name='elos', verbose_name='Time')
+    # Cópia da data do jogo quando o rating foi calculado: ordena o histórico
+    # mesmo depois de o jogo ser editado
+    data_jogo = models.DateTimeField('Data do Jogo')
+    elo_anterior = models.FloatField('Rating Antes')
+    elo = models.FloatField('Rating Depois')
+    
+    class Meta:
+        verbose_name = 'Rating Elo por Jogo'
+        verbose_name_plural = 'Rating Elo por Jogo'
+        ordering = ['data_jogo', 'jogo_id']
+        constraints = [
+            models.UniqueConstraint(fields=['jogo', 'time'], name='elo_jogo_unico'),
+        ]
+        indexes = [
+            models.Index(fields=['data_jogo', 'jogo'], name='elo_data_idx'),
+            models.Index(fields=['time', 'data_jogo', 'jogo'], name='elo_time_data_idx'),
+        ]
+    
+    def __str__(self):
+        return f'{self.time}: {self.elo_anterior:.0f} → {self.elo:.0f} ({self.jogo})'
+
+
+class Tarefa(models.Model):
+    """Trabalho enfileirado para o ``run_worker`` (ver core/tarefas.py)."""
+    PENDENTE = 'pendente'
+    EXECUTANDO = 'executando'
+    CONCLUIDA = 'concluida'
+    FALHOU = 'falhou'
+    ESTADOS = [
+        (PENDENTE, 'Pendente'),
+        (EXECUTANDO, 'Executando'),
+        (CONCLUIDA, 'Concluída'),
+        (FALHOU, 'Falhou'),
+    ]
+    
+    nome = models.CharField('Tarefa', max_length=200)
+    argumentos = models.JSONField('Argumentos', default=dict, blank=True)
+    # Mesma chave, mesma tarefa: enfileirar de novo não duplica o trabalho
+    chave = models.CharField('Chave de Idempotência', max_length=200, null=True, blank=True, unique=True)
+    estado = models.CharField('Estado', max_length=10, choices=ESTADOS, default=PENDENTE)
+    tentativas = models.IntegerField('Tentativas', default=0)
+    max_tentativas = models.IntegerField('Máximo de Tentativas', default=3)
+    executar_em = models.DateTimeField('Executar a partir de', default=timezone.now)
+    erro = models.TextField('Último Erro', blank=True)
+    criada_em = models.DateTimeField('Criada em', auto_now_add=True)
+    iniciada_em = models.DateTimeField('Iniciada em', null=True, blank=True)
+    # Fim da reserva do worker (``visibilidade`` da tarefa): vencida, volta para a fila
+    reservada_ate = models.DateTimeField('Reservada até', null=True, blank=True)
+    concluida_em = models.DateTimeField('Concluída em', null=True, blank=True)
+    
+    class Meta:
+        verbose_name = 'Tarefa'
+        verbose_name_plural = 'Tarefas'
+        ordering = ['-criada_em']
+        indexes = [
+            # Próximas tarefas prontas para o worker
+            models.Index(fields=['estado', 'executar_em'], name='tarefa_fila_idx'),
+        ]
     
     def __str__(self):
-        return f'{self.jogador.nome} ({self.minuto}\') - {self.jogo}'
\ No newline at end of file
+        return f'{self.nome} ({self.get_estado_display()})'
@@ -0,0 +1,161 @@
+# core/montecarlo.py
+
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+# Motor da simulação de temporada (core.simulacao). Não importa o Django:
+# os processos do pool (spawn) carregam só este módulo.
+
+try:
+    import numpy
+except ImportError:  # está no requirements.txt; sem ele a simulação roda em Python puro, bem mais devagar
+    numpy = None
+
+# Simulações sorteadas de uma vez em cada bloco vetorizado (limita a memória)
+BLOCO = 10_000
+# Gols sorteados por time em um jogo no máximo (P(mais que isso) é desprezível)
+MAX_GOLS = 12
+# Os critérios de desempate viram uma chave inteira só: cada um ocupa uma
+# "casa" nesta base (saldo deslocado para não ser negativo)
+BASE = 4096
+
+
+def _poisson(limite, rng):
+    """Sorteio de Poisson (Knuth) com ``limite`` = exp(-média) já calculado."""
+    k, p = 0, rng.random()
+    while p > limite:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def _simular_python(base, jogos, simulacoes, semente):
+    rng = random.Random(semente)
+    n = len(base)
+    contagem = [[0] * n for _ in range(n)]
+    pontos = [0] * n
+    limites = [(casa, fora, math.exp(-media_casa), math.exp(-media_fora)) for casa, fora, media_casa, media_fora in jogos]
+
+    for _ in range(simulacoes):
+        tabela = [list(linha) for linha in base]
+        for casa, fora, limite_casa, limite_fora in limites:
+            gols_casa, gols_fora = _poisson(limite_casa, rng), _poisson(limite_fora, rng)
+            for time, pro, contra in ((casa, gols_casa, gols_fora), (fora, gols_fora, gols_casa)):
+                linha = tabela[time]
+                linha[0] += 3 if pro > contra else 1 if pro == contra else 0
+                linha[1] += pro > contra
+                linha[2] += pro - contra
+                linha[3] += pro
+        # Critérios da tabela e, se tudo empatar, o menor índice (ordem alfabética)
+        ordem = sorted(range(n), key=lambda time: (tabela[time], -time), reverse=True)
+        for posicao, time in enumerate(ordem):
+            contagem[time][posicao] += 1
+            pontos[time] += tabela[time][0]
+    return contagem, pontos
+
+
+def _limiares(medias):
+    """
+    P(gols <= k) de cada jogo para k = 0..MAX_GOLS-1. Um sorteio uniforme
+    vira número de gols contando quantos limiares ele supera (inversa da
+    distribuição de Poisson), bem mais rápido que ``Generator.poisson``.
+    """
+    medias = numpy.asarray(medias, dtype=numpy.float64)[:, None]
+    k = numpy.arange(MAX_GOLS)
+    fatorial = numpy.cumprod(numpy.maximum(k, 1))
+    return numpy.cumsum(numpy.exp(-medias) * medias ** k / fatorial, axis=1).astype(numpy.float32)
+
+
+def _sortear_gols(rng, limiares, tamanho):
+    sorteio = rng.random((tamanho, len(limiares)), dtype=numpy.float32)
+    gols = numpy.zeros(sorteio.shape, dtype=numpy.float32)
+    for k in range(MAX_GOLS):
+        gols += sorteio > limiares[:, k]
+    return gols
+
+
+def _simular_numpy(base, jogos, simulacoes, semente):
+    rng = numpy.random.default_rng(semente)
+    n, total_jogos = len(base), len(jogos)
+    base = numpy.array(base, dtype=numpy.int64).reshape(n, 4)
+    contagem = numpy.zeros(n * n, dtype=numpy.int64)
+    pontos = numpy.zeros(n, dtype=numpy.int64)
+
+    if jogos:
+        casa, fora, media_casa, media_fora = (numpy.array(coluna) for coluna in zip(*jogos))
+        limiares_casa, limiares_fora = _limiares(media_casa), _limiares(media_fora)
+        # Incidência jogo x time: um produto de matrizes soma o resultado de
+        # todos os jogos de cada time em todas as simulações do bloco
+        em_casa = numpy.zeros((total_jogos, n), dtype=numpy.float32)
+        em_casa[numpy.arange(total_jogos), casa] = 1
+        fora_de_casa = numpy.zeros((total_jogos, n), dtype=numpy.float32)
+        fora_de_casa[numpy.arange(total_jogos), fora] = 1
+
+    for inicio in range(0, simulacoes, BLOCO):
+        tamanho = min(BLOCO, simulacoes - inicio)
+        pontos_bloco, vitorias, saldo, gols_pro = (numpy.repeat(base[None, :, k], tamanho, axis=0) for k in range(4))
+        if jogos:
+            gols_casa = _sortear_gols(rng, limiares_casa, tamanho)
+            gols_fora = _sortear_gols(rng, limiares_fora, tamanho)
+            vitoria_casa = (gols_casa > gols_fora).astype(numpy.float32)
+            vitoria_fora = (gols_casa < gols_fora).astype(numpy.float32)
+            empate = (gols_casa == gols_fora).astype(numpy.float32)
+
+            # Contas em float32 (BLAS) com valores inteiros pequenos: exatas
+            feitos = gols_casa @ em_casa + gols_fora @ fora_de_casa
+            sofridos = gols_fora @ em_casa + gols_casa @ fora_de_casa
+            ganhos = vitoria_casa @ em_casa + vitoria_fora @ fora_de_casa
+            empates = empate @ (em_casa + fora_de_casa)
+            pontos_bloco += (3 * ganhos + empates).astype(numpy.int64)
+            vitorias += ganhos.astype(numpy.int64)
+            saldo += (feitos - sofridos).astype(numpy.int64)
+            gols_pro += feitos.astype(numpy.int64)
+
+        chave = ((pontos_bloco * BASE + vitorias) * BASE + saldo + BASE // 2) * BASE + gols_pro
+        # Empate em tudo: o menor índice na frente, como em ``_simular_python``
+        chave = chave * n + (n - 1 - numpy.arange(n))
+        # ordem[s, posição] = time; a contagem é indexada por time * n + posição
+        ordem = numpy.argsort(-chave, axis=1)
+        contagem += numpy.bincount((ordem * n + numpy.arange(n)).ravel(), minlength=n * n)
+        pontos += pontos_bloco.sum(axis=0)
+
+    return contagem.reshape(n, n).tolist(), pontos.tolist()
+
+
+def simular(base, jogos, simulacoes, semente=None):
+    """
+    Simula os ``jogos`` restantes ``simulacoes`` vezes a partir da tabela
+    ``base`` e conta em que posição cada time termina.
+
+    ``base``: (pontos, vitórias, saldo, gols pró) atuais de cada time (0..n-1),
+    na ordem alfabética dos nomes: empatados em todos os critérios, fica à
+    frente o de menor índice, como na tabela do site.
+    ``jogos``: (casa, visitante, gols esperados da casa, do visitante), com
+    os gols sorteados por Poisson. Retorna (contagem[time][posição],
+    soma dos pontos finais de cada time).
+    """
+    if numpy is not None:
+        return _simular_numpy(base, jogos, simulacoes, semente)
+    return _simular_python(base, jogos, simulacoes, semente)
+
+
+def simular_em_processos(base, jogos, simulacoes, processos, semente=None):
+    """``simular`` dividido entre ``processos``, cada parte com sua semente."""
+    if processos <= 1:
+        return simular(base, jogos, simulacoes, semente)
+
+    rng = random.Random(semente)
+    partes = [simulacoes // processos + (k < simulacoes % processos) for k in range(processos)]
+    n = len(base)
+    contagem, pontos = [[0] * n for _ in range(n)], [0] * n
+    with ProcessPoolExecutor(max_workers=processos, mp_context=get_context('spawn')) as pool:
+        futuros = [pool.submit(simular, base, jogos, parte, rng.getrandbits(64)) for parte in partes if parte]
+        for futuro in futuros:
+            contagem_parte, pontos_parte = futuro.result()
+            for time in range(n):
+                pontos[time] += pontos_parte[time]
+                for posicao in range(n):
+                    contagem[time][posicao] += contagem_parte[time][posicao]
+    return contagem, pontos
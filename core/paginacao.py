@@ -0,0 +1,154 @@
+# core/paginacao.py
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+POR_PAGINA = 50
+LIMITE_CONTAGEM = 1000
+PARAMETROS_CURSOR = ('depois', 'antes')
+
+
+@dataclass(slots=True)
+class PaginaKeyset:
+    itens: list
+    cursor_anterior: str | None
+    cursor_proximo: str | None
+    # Querystring dos filtros atuais, sem os parâmetros de cursor
+    filtros: str
+
+    def __iter__(self):
+        return iter(self.itens)
+
+    def __len__(self):
+        return len(self.itens)
+
+    @property
+    def tem_anterior(self):
+        return self.cursor_anterior is not None
+
+    @property
+    def tem_proxima(self):
+        return self.cursor_proximo is not None
+
+
+def _cursor(obj, campo):
+    return f'{getattr(obj, campo).isoformat()}|{obj.pk}'
+
+
+def _ler_cursor(model, campo, texto):
+    """(valor, pk) de um cursor ``valor|pk``; ``None`` se ausente ou inválido."""
+    if not texto:
+        return None
+    valor, _, pk = texto.rpartition('|')
+    try:
+        return model._meta.get_field(campo).to_python(valor), int(pk)
+    except (ValidationError, ValueError):
+        return None
+
+
+def filtro_keyset(ordem, valores):
+    """
+    ``Q`` das linhas que vêm depois de ``valores`` na ``ordem`` (como em
+    ``order_by``, com ``-`` para decrescente): a comparação lexicográfica
+    (a < x) OR (a = x AND b < y) OR ...
+    """
+    filtro = None
+    iguais = {}
+    for campo, valor in zip(ordem, valores):
+        nome = campo.lstrip('-')
+        condicao = Q(**iguais, **{f'{nome}__{"lt" if campo.startswith("-") else "gt"}': valor})
+        filtro = condicao if filtro is None else filtro | condicao
+        iguais[nome] = valor
+    return filtro
+
+
+def codificar_cursor(valores):
+    """Cursor opaco (base64 de JSON) com os valores da última linha vista."""
+    # isoformat() completo: o DjangoJSONEncoder corta os microssegundos,
+    # e o cursor precisa do valor exato para não repetir nem pular linhas
+    valores = [valor.isoformat() if hasattr(valor, 'isoformat') else valor for valor in valores]
+    return base64.urlsafe_b64encode(json.dumps(valores).encode()).decode().rstrip('=')
+
+
+def decodificar_cursor(texto, tamanho):
+    """Valores de um cursor de ``codificar_cursor``; ``None`` se ausente ou inválido."""
+    if not texto:
+        return None
+    try:
+        valores = json.loads(base64.urlsafe_b64decode(texto + '=' * (-len(texto) % 4)))
+    except (binascii.Error, ValueError):
+        return None
+    if not isinstance(valores, list) or len(valores) != tamanho:
+        return None
+    return valores
+
+
+def converter_cursor(queryset, valores):
+    """
+    Valores do cursor convertidos pelos campos da ordem do ``queryset``
+    (colunas ou anotações). Um cursor decodificado mas adulterado levanta
+    ``ValidationError``, em vez de estourar dentro do filtro.
+    """
+    convertidos = []
+    for campo, valor in zip(queryset.query.order_by, valores):
+        nome = campo.lstrip('-')
+        if nome in queryset.query.annotations:
+            campo_modelo = queryset.query.annotations[nome].output_field
+        else:
+            campo_modelo = queryset.model._meta.pk if nome == 'pk' else queryset.model._meta.get_field(nome)
+        convertido = campo_modelo.to_python(valor)
+        if convertido is None:
+            raise ValidationError('Valor vazio no cursor.')
+        convertidos.append(convertido)
+    return convertidos
+
+
+def paginar_keyset(queryset, campo, params, por_pagina=POR_PAGINA):
+    """
+    Paginação por chave (seek) na ordem ``(-campo, -id)``. Em vez de
+    ``OFFSET``, cada página começa depois (``?depois=``) ou antes
+    (``?antes=``) da última linha vista, então o custo não cresce com o
+    número da página e o índice em ``campo`` resolve a ordenação.
+    """
+    model = queryset.model
+    depois = _ler_cursor(model, campo, params.get('depois'))
+    antes = None if depois else _ler_cursor(model, campo, params.get('antes'))
+
+    if depois:
+        queryset = queryset.filter(filtro_keyset([f'-{campo}', '-pk'], depois))
+    elif antes:
+        queryset = queryset.filter(filtro_keyset([campo, 'pk'], antes))
+
+    if antes:
+        itens = list(queryset.order_by(campo, 'pk')[:por_pagina + 1])
+        tem_anterior, tem_proxima = len(itens) > por_pagina, True
+        itens = itens[:por_pagina][::-1]
+    else:
+        itens = list(queryset.order_by(f'-{campo}', '-pk')[:por_pagina + 1])
+        tem_anterior, tem_proxima = depois is not None, len(itens) > por_pagina
+        itens = itens[:por_pagina]
+
+    filtros = params.copy()
+    for parametro in PARAMETROS_CURSOR:
+        filtros.pop(parametro, None)
+
+    return PaginaKeyset(
+        itens=itens,
+        cursor_anterior=_cursor(itens[0], campo) if itens and tem_anterior else None,
+        cursor_proximo=_cursor(itens[-1], campo) if itens and tem_proxima else None,
+        filtros=filtros.urlencode(),
+    )
+
+
+def contagem_aproximada(queryset, limite=LIMITE_CONTAGEM):
+    """
+    Conta no máximo ``limite`` linhas (``COUNT`` sobre um ``LIMIT``).
+    Retorna (total, exato); com ``exato=False`` há mais de ``total`` linhas.
+    """
+    total = queryset.order_by()[:limite + 1].count()
+    return min(total, limite), total <= limite
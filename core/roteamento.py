@@ -0,0 +1,99 @@
+# core/roteamento.py
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .cache import estado_dados
+
+REPLICA = 'replica'
+# Views que só leem: com a réplica configurada, os GETs delas vão para lá
+MODULOS_PUBLICOS = ('core.views', 'core.api')
+# Cookie de quem acabou de escrever: suas próximas requisições leem do primário
+COOKIE_PRIMARIO = 'liga_primario'
+
+
+@dataclass(slots=True)
+class EstadoRequisicao:
+    # A view é pública e pode ler da réplica
+    replica: bool = False
+    # Alguma escrita já aconteceu: o resto da requisição lê do primário
+    escreveu: bool = False
+
+
+# Estado da requisição atual (None fora de requisições: worker, comandos)
+_estado = ContextVar('roteamento', default=None)
+
+
+def replica_configurada():
+    return REPLICA in connections.settings
+
+
+def atraso_maximo():
+    """Segundos em que a réplica pode estar atrás do primário."""
+    return getattr(settings, 'REPLICA_ATRASO_MAXIMO', 10)
+
+
+def iniciar_requisicao():
+    """Estado novo para a requisição; devolve o token para ``encerrar_requisicao``."""
+    estado = EstadoRequisicao()
+    return estado, _estado.set(estado)
+
+
+def encerrar_requisicao(token):
+    _estado.reset(token)
+
+
+def liberar_replica(view, request):
+    """
+    Marca a requisição para ler da réplica se a view é pública e ninguém
+    precisa ver uma escrita que a réplica talvez ainda não tenha: nem quem
+    acabou de escrever (cookie), nem ninguém logo depois de uma escrita nos
+    dados da liga, para o cache de páginas não guardar uma página velha.
+    O horário dessa escrita vem do cache compartilhado, então vale também
+    para escritas de outros processos (painel em outro worker, comandos).
+    """
+    estado = _estado.get()
+    if (
+        estado is None
+        or not replica_configurada()
+        or request.method not in ('GET', 'HEAD')
+        or view.__module__ not in MODULOS_PUBLICOS
+        or COOKIE_PRIMARIO in request.COOKIES
+    ):
+        return
+    estado.replica = time.time() - estado_dados()[1] >= atraso_maximo()
+
+
+class RoteadorReplica:
+    """
+    Leituras das views públicas vão para a réplica; todo o resto (escritas,
+    painel, admin, worker e comandos) usa o primário. Depois da primeira
+    escrita, e dentro de transações, a requisição só lê do primário.
+    """
+
+    def db_for_read(self, model, **hints):
+        estado = _estado.get()
+        if (
+            estado is not None and estado.replica and not estado.escreveu
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return REPLICA
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        estado = _estado.get()
+        if estado is not None:
+            estado.escreveu = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplica e primário têm os mesmos dados
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # A réplica recebe o esquema pela replicação
+        return db != REPLICA
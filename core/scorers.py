@@ -0,0 +1,203 @@
+# core/scorers.py
+
+from collections import Counter
+from dataclasses import dataclass
+
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from .cache import invalidacao_unica, invalidar_cache
+from .models import Time, Jogador, Gol
+
+CAMPOS_CONTADORES = ('gols_marcados', 'gols_contra', 'gols_penalti')
+
+
+@dataclass(slots=True)
+class LinhaArtilharia:
+    jogador: Jogador
+    gols: int
+    posicao: int
+
+
+@dataclass(slots=True)
+class LinhaGolsTime:
+    time: Time
+    gols: int
+
+
+def artilheiros(time=None):
+    """
+    QuerySet de ``Jogador`` (com ``time`` já carregado) com ``total_gols``,
+    ordenado do maior para o menor. Gols contra não contam.
+
+    O ranking geral usa o contador ``gols_marcados``; com ``time`` os gols
+    daquele time são agregados, para não contar gols por outros clubes.
+    """
+    if time is None:
+        return Jogador.objects.filter(gols_marcados__gt=0).select_related('time').annotate(
+            total_gols=F('gols_marcados')
+        ).order_by('-gols_marcados', 'nome', 'id')
+
+    return Jogador.objects.filter(
+        gols__contra=False, gols__time=time
+    ).select_related('time').annotate(
+        total_gols=Count('gols')
+    ).order_by('-total_gols', 'nome', 'id')
+
+
+def _linhas(jogadores, inicio=1):
+    return [
+        LinhaArtilharia(jogador, jogador.total_gols, posicao)
+        for posicao, jogador in enumerate(jogadores, start=inicio)
+    ]
+
+
+def ranking_artilheiros(time=None, top_n=None):
+    """Ranking completo (ou os ``top_n`` primeiros) em uma única consulta."""
+    jogadores = artilheiros(time)
+    if top_n is not None:
+        jogadores = jogadores[:top_n]
+    return _linhas(jogadores)
+
+
+def pagina_artilheiros(numero, por_pagina=20, time=None):
+    """
+    Página ``numero`` do ranking. Retorna um ``Page`` cujo ``object_list``
+    já contém as linhas com a posição absoluta no ranking.
+    """
+    pagina = Paginator(artilheiros(time), por_pagina).get_page(numero)
+    pagina.object_list = _linhas(pagina.object_list, inicio=pagina.start_index())
+    return pagina
+
+
+def ranking_times_gols():
+    """Gols marcados por time (exceto gols contra), pelo contador do time."""
+    times = Time.objects.filter(gols_marcados__gt=0).order_by('-gols_marcados', 'nome')
+    return [LinhaGolsTime(time, time.gols_marcados) for time in times]
+
+
+def total_gols():
+    """Total de gols do campeonato (exceto gols contra)."""
+    return Time.objects.aggregate(total=Sum('gols_marcados'))['total'] or 0
+
+
+# ========== CONTADORES DE GOLS ==========
+
+def contagem_gol(jogador_id, time_id, contra, tipo):
+    """
+    Retorna o quanto um gol soma nos contadores:
+    {(Model, id): Counter(campo=valor)}.
+    """
+    if contra:
+        valores = Counter(gols_contra=1)
+    else:
+        valores = Counter(gols_marcados=1, gols_penalti=int(tipo == 'PENALTI'))
+    return {(Jogador, jogador_id): valores, (Time, time_id): valores}
+
+
+def atualizar_contadores(antes=None, depois=None):
+    """
+    Aplica a diferença entre duas contagens (ver ``contagem_gol``) com
+    expressões ``F()``, uma atualização por jogador ou time afetado.
+    """
+    antes = antes or {}
+    depois = depois or {}
+
+    with transaction.atomic():
+        for chave in set(antes) | set(depois):
+            Model, pk = chave
+            delta = Counter(depois.get(chave, {}))
+            delta.subtract(antes.get(chave, {}))
+            campos = {campo: F(campo) + valor for campo, valor in delta.items() if valor}
+            if campos:
+                Model.objects.filter(pk=pk).update(**campos)
+
+
+def placar_dos_gols(jogo, gols):
+    """
+    (gols_casa, gols_visitante) que os ``gols`` dão ao ``jogo``. O gol
+    contra leva o time de quem o marcou e conta para o adversário.
+    """
+    placar = {jogo.time_casa_id: 0, jogo.time_visitante_id: 0}
+    for gol in gols:
+        if gol.contra:
+            beneficiado = jogo.time_visitante_id if gol.time_id == jogo.time_casa_id else jogo.time_casa_id
+        else:
+            beneficiado = gol.time_id
+        placar[beneficiado] += 1
+    return placar[jogo.time_casa_id], placar[jogo.time_visitante_id]
+
+
+def substituir_gols(jogo, gols):
+    """
+    Faz dos ``gols`` (``Gol`` ainda não salvos) a súmula do ``jogo``. Os
+    já gravados iguais a um da lista ficam como estão; os que sobram são
+    excluídos (os sinais descontam os contadores) e os novos entram com um
+    ``bulk_create`` só, com a contagem somada em uma atualização dos
+    contadores. O cache é invalidado uma vez. Retorna (criados, excluídos).
+    """
+    def identidade(jogador_id, time_id, minuto, tipo, contra):
+        return jogador_id, time_id, int(minuto), tipo, contra
+
+    gravados = {}
+    for gol_id, *campos in jogo.gols.values_list('id', 'jogador_id', 'time_id', 'minuto', 'tipo', 'contra'):
+        gravados.setdefault(identidade(*campos), []).append(gol_id)
+
+    novos = []
+    for gol in gols:
+        iguais = gravados.get(identidade(gol.jogador_id, gol.time_id, gol.minuto, gol.tipo, gol.contra))
+        if iguais:
+            iguais.pop()
+        else:
+            gol.jogo = jogo
+            novos.append(gol)
+    sobras = [gol_id for ids in gravados.values() for gol_id in ids]
+
+    with transaction.atomic(), invalidacao_unica():
+        if sobras:
+            Gol.objects.filter(id__in=sobras).delete()
+        if novos:
+            Gol.objects.bulk_create(novos)
+            contagem = {}
+            for gol in novos:
+                for chave, valores in contagem_gol(gol.jogador_id, gol.time_id, gol.contra, gol.tipo).items():
+                    contagem.setdefault(chave, Counter()).update(valores)
+            atualizar_contadores(depois=contagem)
+            # O bulk_create não dispara sinais
+            invalidar_cache()
+    return len(novos), len(sobras)
+
+
+def reconstruir_contadores(gravar=True):
+    """
+    Recalcula os contadores de gols de jogadores e times a partir de ``Gol``.
+
+    Retorna a lista de (objeto, campo, valor_gravado, valor_esperado) das
+    divergências encontradas. Com ``gravar=False`` apenas confere.
+    """
+    contagens = {
+        'gols_marcados': Count('gols', filter=Q(gols__contra=False)),
+        'gols_contra': Count('gols', filter=Q(gols__contra=True)),
+        'gols_penalti': Count('gols', filter=Q(gols__contra=False, gols__tipo='PENALTI')),
+    }
+    divergencias = []
+    with transaction.atomic():
+        for Model in (Jogador, Time):
+            alterados = []
+            objetos = Model.objects.annotate(**{f'esperado_{campo}': expr for campo, expr in contagens.items()})
+            for obj in objetos:
+                diferente = False
+                for campo in CAMPOS_CONTADORES:
+                    esperado = getattr(obj, f'esperado_{campo}')
+                    if getattr(obj, campo) != esperado:
+                        divergencias.append((obj, campo, getattr(obj, campo), esperado))
+                        setattr(obj, campo, esperado)
+                        diferente = True
+                if diferente:
+                    alterados.append(obj)
+            if gravar:
+                Model.objects.bulk_update(alterados, CAMPOS_CONTADORES)
+        if gravar and divergencias:
+            invalidar_cache()
+    return divergencias
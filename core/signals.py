@@ -0,0 +1,112 @@
+# core/signals.py
+
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, pre_save, post_delete
+from django.dispatch import receiver
+
+from .cache import CHAVE_VERSAO, invalidar_cache, invalidar_elencos, versao_confirmada
+from .eventos import publicar_no_commit, dados_placar, dados_gol
+from .models import Time, Jogador, Jogo, Gol, Classificacao
+from .scorers import contagem_gol, atualizar_contadores
+from .simulacao import agendar_simulacao
+from .sqlite import configurar_conexao
+
+# PRAGMAs do perfil do SQLite (settings.SQLITE_PERFIL) em cada conexão nova
+connection_created.connect(configurar_conexao, dispatch_uid='core.sqlite')
+
+
+@receiver(post_save, sender=Time)
+def criar_linha_classificacao(sender, instance, created, raw=False, **kwargs):
+    # Todo time entra na tabela, mesmo antes de disputar jogos
+    if created and not raw:
+        Classificacao.objects.get_or_create(time=instance)
+
+
+def _contagem(gol):
+    return contagem_gol(gol.jogador_id, gol.time_id, gol.contra, gol.tipo)
+
+
+@receiver(pre_save, sender=Gol)
+def guardar_gol_anterior(sender, instance, raw=False, **kwargs):
+    # Guarda o estado gravado para descontar na edição (troca de jogador/time)
+    instance._contagem_anterior = None
+    if instance.pk and not raw:
+        anterior = Gol.objects.filter(pk=instance.pk).values_list(
+            'jogador_id', 'time_id', 'contra', 'tipo'
+        ).first()
+        if anterior:
+            instance._contagem_anterior = contagem_gol(*anterior)
+
+
+@receiver(post_save, sender=Gol)
+def contar_gol(sender, instance, raw=False, **kwargs):
+    if not raw:
+        atualizar_contadores(getattr(instance, '_contagem_anterior', None), _contagem(instance))
+        instance._contagem_anterior = None
+
+
+@receiver(post_delete, sender=Gol)
+def descontar_gol(sender, instance, **kwargs):
+    atualizar_contadores(_contagem(instance))
+
+
+def _placar(jogo):
+    return jogo.realizado, jogo.gols_casa, jogo.gols_visitante
+
+
+@receiver(pre_save, sender=Jogo)
+def guardar_placar_anterior(sender, instance, raw=False, **kwargs):
+    # Guarda o placar gravado para só transmitir quando ele mudar
+    instance._placar_anterior = None
+    if instance.pk and not raw:
+        instance._placar_anterior = Jogo.objects.filter(pk=instance.pk).values_list(
+            'realizado', 'gols_casa', 'gols_visitante'
+        ).first()
+
+
+@receiver(post_save, sender=Jogo)
+def transmitir_placar(sender, instance, created, using=None, raw=False, **kwargs):
+    # Resultado lançado, corrigido ou desfeito; salvar o jogo sem mexer no
+    # placar (data, local) e placar de jogo ainda não realizado não interessam
+    anterior = getattr(instance, '_placar_anterior', None)
+    instance._placar_anterior = None
+    if raw or _placar(instance) == anterior:
+        return
+    if instance.realizado or (anterior and anterior[0]):
+        publicar_no_commit('placar', lambda: dados_placar(instance), using)
+
+
+@receiver(post_save, sender=Gol)
+def transmitir_gol(sender, instance, created, using=None, raw=False, **kwargs):
+    if created and not raw:
+        publicar_no_commit('gol', lambda: dados_gol(instance), using)
+
+
+@receiver(post_save, sender=Time)
+@receiver(post_save, sender=Jogador)
+@receiver(post_save, sender=Jogo)
+@receiver(post_save, sender=Gol)
+@receiver(post_delete, sender=Time)
+@receiver(post_delete, sender=Jogador)
+@receiver(post_delete, sender=Jogo)
+@receiver(post_delete, sender=Gol)
+def invalidar_paginas(sender, using=None, raw=False, **kwargs):
+    # Qualquer escrita nos dados da liga troca a versão do cache de páginas
+    if not raw:
+        invalidar_cache(using)
+
+
+@receiver(post_save, sender=Jogador)
+@receiver(post_delete, sender=Jogador)
+def invalidar_elencos_jogador(sender, using=None, raw=False, **kwargs):
+    # Inclui a exclusão em cascata dos jogadores de um time excluído
+    if not raw:
+        invalidar_elencos(using)
+
+
+@receiver(versao_confirmada)
+def agendar_probabilidades(sender, chave, versao, **kwargs):
+    # Dados da liga mudaram: o worker recalcula as probabilidades já, em vez
+    # de a página pública enfileirar (e escrever no banco) a cada visita
+    if chave == CHAVE_VERSAO:
+        agendar_simulacao(versao)
@@ -0,0 +1,168 @@
+# core/simulacao.py
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Avg, Count
+from django.utils import timezone
+
+from .cache import guardar_por_versao, ler_por_versao, versao_dados
+from .models import Jogo, Tarefa
+from .montecarlo import simular_em_processos
+from .standings import calcular_classificacao
+from .tarefas import enfileirar, tarefa
+
+SIMULACOES = 100_000
+VAGAS_LIBERTADORES = 6
+VAGAS_REBAIXAMENTO = 4
+# Peso, em jogos, da média da liga na força de cada time: com poucos jogos
+# a estimativa fica perto da média em vez de oscilar com um placar isolado
+PESO_MEDIA = 5
+# Gols por jogo usados enquanto a liga não tem jogos realizados
+MEDIAS_PADRAO = (1.4, 1.1)
+CHAVE = 'simulacao'
+# Reserva do worker para a simulação, acima do pior caso: sem numpy, 100 mil
+# simulações levam uns 30 s num processo; o prazo cobre alguns milhões
+VISIBILIDADE_SIMULACAO = timedelta(minutes=30)
+
+
+@dataclass(slots=True)
+class ProbabilidadesTime:
+    time_id: int
+    nome: str
+    pontos: int
+    pontos_esperados: float
+    titulo: float
+    libertadores: float
+    rebaixamento: float
+    # Probabilidade (%) de terminar em cada posição, da 1ª à última
+    posicoes: list
+
+
+@dataclass(slots=True)
+class Simulacao:
+    linhas: list
+    simulacoes: int
+    jogos_restantes: int
+    calculada_em: datetime
+    duracao: float
+
+
+def estimar_forcas(linhas):
+    """
+    Ataque e defesa de cada time (1 = média da liga) pelos gols pró e
+    contra nos jogos realizados, e a média de gols do mandante e do
+    visitante. Retorna ({time_id: (ataque, defesa)}, media_casa, media_fora).
+    """
+    medias = Jogo.objects.filter(realizado=True).aggregate(
+        jogos=Count('id'), casa=Avg('gols_casa'), fora=Avg('gols_visitante'),
+    )
+    if medias['jogos']:
+        media_casa, media_fora = medias['casa'], medias['fora']
+    else:
+        media_casa, media_fora = MEDIAS_PADRAO
+    # Gols por time por jogo; o mínimo evita força zero numa liga sem gols
+    media = max((media_casa + media_fora) / 2, 0.1)
+
+    forcas = {}
+    for linha in linhas:
+        jogos = linha.jogos + PESO_MEDIA
+        ataque = (linha.gols_pro + PESO_MEDIA * media) / jogos / media
+        defesa = (linha.gols_contra + PESO_MEDIA * media) / jogos / media
+        forcas[linha.time.id] = (ataque, defesa)
+    return forcas, media_casa, media_fora
+
+
+def simular_temporada(simulacoes=SIMULACOES, processos=1, semente=None):
+    """
+    Simula os jogos ainda não realizados ``simulacoes`` vezes, a partir da
+    classificação atual calculada dos jogos, e devolve a probabilidade de
+    cada time terminar em cada posição. Os gols de cada jogo são sorteados
+    por Poisson com média pela força dos dois times, e a ordem final usa os
+    critérios da tabela (pontos, vitórias, saldo, gols pró e nome).
+    """
+    inicio = time.perf_counter()
+    # Em ordem alfabética: o motor desempata pelo índice, como a tabela pelo nome
+    linhas = sorted(calcular_classificacao(ordenar=False), key=lambda linha: linha.time.nome)
+    indice = {linha.time.id: k for k, linha in enumerate(linhas)}
+    forcas, media_casa, media_fora = estimar_forcas(linhas)
+
+    jogos = []
+    for casa, fora in Jogo.objects.filter(realizado=False).values_list('time_casa_id', 'time_visitante_id'):
+        ataque_casa, defesa_casa = forcas[casa]
+        ataque_fora, defesa_fora = forcas[fora]
+        jogos.append((
+            indice[casa], indice[fora],
+            media_casa * ataque_casa * defesa_fora,
+            media_fora * ataque_fora * defesa_casa,
+        ))
+
+    base = [(linha.pontos, linha.vitorias, linha.saldo_gols, linha.gols_pro) for linha in linhas]
+    contagem, pontos = simular_em_processos(base, jogos, simulacoes, processos, semente)
+
+    total = len(linhas)
+    resultado = []
+    for k, linha in enumerate(linhas):
+        posicoes = [100 * vezes / simulacoes for vezes in contagem[k]]
+        resultado.append(ProbabilidadesTime(
+            time_id=linha.time.id,
+            nome=linha.time.nome,
+            pontos=linha.pontos,
+            pontos_esperados=pontos[k] / simulacoes,
+            titulo=posicoes[0],
+            libertadores=sum(posicoes[:VAGAS_LIBERTADORES]),
+            rebaixamento=sum(posicoes[total - VAGAS_REBAIXAMENTO:]) if total > VAGAS_REBAIXAMENTO else 0.0,
+            posicoes=posicoes,
+        ))
+    resultado.sort(key=lambda linha: (linha.pontos_esperados, linha.titulo), reverse=True)
+    return Simulacao(resultado, simulacoes, len(jogos), timezone.now(), time.perf_counter() - inicio)
+
+
+@tarefa(visibilidade=VISIBILIDADE_SIMULACAO)
+def calcular_probabilidades(versao):
+    """Tarefa do worker: simula a temporada e guarda o resultado na versão dos dados."""
+    if versao != versao_dados():
+        # Os dados mudaram depois de enfileirar: a versão nova tem a sua tarefa
+        return
+    resultado = simular_temporada(
+        getattr(settings, 'SIMULACAO_QUANTIDADE', SIMULACOES),
+        processos=getattr(settings, 'SIMULACAO_PROCESSOS', 1),
+    )
+    guardar_por_versao(CHAVE, resultado, versao)
+
+
+def agendar_simulacao(versao):
+    """
+    Enfileira a simulação da ``versao`` dos dados. As tarefas de simulação
+    de versões anteriores que não estão em execução saem da fila: as
+    concluídas já deixaram o resultado no cache, e as pendentes sairiam
+    sem fazer nada.
+    """
+    Tarefa.objects.filter(chave__startswith=f'{CHAVE}:').exclude(chave=f'{CHAVE}:{versao}').exclude(
+        estado=Tarefa.EXECUTANDO
+    ).delete()
+    return _enfileirar(versao)
+
+
+def _enfileirar(versao):
+    return enfileirar(calcular_probabilidades, versao, chave=f'{CHAVE}:{versao}', max_tentativas=1)
+
+
+def probabilidades_atuais():
+    """
+    (simulação, atualizada). A simulação dos dados atuais vem do cache; se
+    ainda não existe, volta a última calculada (``atualizada`` False). Cada
+    escrita confirmada agenda a sua (core.signals), então a leitura só
+    enfileira quando nunca houve uma (banco novo, cache apagado) e devolve
+    None.
+    """
+    versao = versao_dados()
+    resultado = ler_por_versao(CHAVE, versao)
+    if resultado is not None:
+        return resultado, True
+    anterior = ler_por_versao(CHAVE)
+    if anterior is None:
+        _enfileirar(versao)
+    return anterior, False
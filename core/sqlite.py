@@ -0,0 +1,181 @@
+# core/sqlite.py
+
+import random
+import sqlite3
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+# PRAGMAs aplicados a cada conexão nova, por perfil (``SQLITE_PERFIL``).
+# ``padrao`` é o comportamento de fábrica do Django: journal em arquivo
+# separado, em que um commit tranca o banco inteiro para os leitores.
+PERFIS = {
+    'padrao': {},
+    'producao': {
+        # Leitores leem o último commit enquanto a escrita acontece no WAL
+        'journal_mode': 'WAL',
+        # Com WAL, NORMAL só arrisca a última transação numa queda de energia
+        'synchronous': 'NORMAL',
+        # Espera (ms) por uma trava em vez de falhar com "database is locked"
+        'busy_timeout': 5000,
+        'mmap_size': 256 * 1024 * 1024,
+        # Negativo: tamanho em KiB (64 MiB de páginas em memória por conexão)
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
+# Como cada perfil abre as transações de escrita (``transaction_mode`` nas
+# OPTIONS do banco). DEFERRED só pede a trava de escrita no primeiro
+# INSERT/UPDATE: se outra escrita já a tem, o SQLite desiste na hora com
+# "database is locked", sem esperar o ``busy_timeout``. IMMEDIATE pede a
+# trava no BEGIN, onde a espera funciona.
+TRANSACOES = {'padrao': 'DEFERRED', 'producao': 'IMMEDIATE'}
+
+
+def pragmas(perfil=None):
+    """PRAGMAs do ``perfil`` (sem perfil: o de ``settings.SQLITE_PERFIL``)."""
+    if perfil is None:
+        perfil = getattr(settings, 'SQLITE_PERFIL', '') or 'padrao'
+    if perfil not in PERFIS:
+        raise ImproperlyConfigured(f'SQLITE_PERFIL desconhecido: {perfil!r} (use {" ou ".join(PERFIS)}).')
+    return PERFIS[perfil]
+
+
+def aplicar_pragmas(conexao, valores):
+    """Aplica os PRAGMAs a uma conexão ``sqlite3`` (a DB-API, não a do Django)."""
+    for nome, valor in valores.items():
+        conexao.execute(f'PRAGMA {nome} = {valor}')
+
+
+def configurar_conexao(sender, connection, **kwargs):
+    """
+    Receptor de ``connection_created``: aplica os PRAGMAs do perfil quando
+    o Django abre uma conexão SQLite. Vai direto na conexão da DB-API, fora
+    do ``execute_wrapper`` que conta as consultas das views.
+    """
+    if connection.vendor == 'sqlite':
+        aplicar_pragmas(connection.connection, pragmas())
+
+
+# ========== BENCHMARK DE CONCORRÊNCIA ==========
+
+@dataclass(slots=True)
+class ResultadoConcorrencia:
+    perfil: str
+    leituras: int
+    escritas: int
+    # Latências das leituras e escritas, em ms
+    leitura_p50: float
+    leitura_p95: float
+    leitura_max: float
+    escrita_p50: float
+    escrita_p95: float
+    escrita_max: float
+    # Operações que falharam com "database is locked"
+    travadas: int
+
+
+def _percentil(valores, p):
+    if len(valores) < 2:
+        return valores[0] if valores else 0.0
+    return statistics.quantiles(valores, n=100, method='inclusive')[p - 1]
+
+
+def medir_concorrencia(caminho, perfil, leitores=4, escritores=2, duracao=3.0, escrita_ms=20, timeout=5.0):
+    """
+    Leitores repetem as consultas da tabela de classificação enquanto
+    ``escritores`` lançam resultados sem parar, como o painel em dia de
+    jogo: cada transação lê os jogos de uma rodada, regrava os placares e a
+    tabela e fica aberta por ``escrita_ms`` (o resto do lançamento). Mede
+    quanto cada lado espera o outro e quantas operações desistem.
+
+    ``caminho`` é um banco descartável: os escritores alteram os jogos e o
+    modo de journal do perfil fica gravado no arquivo.
+    """
+    valores = pragmas(perfil)
+    # O modo de journal é persistente: volta ao de fábrica antes do perfil padrão
+    with sqlite3.connect(caminho) as conexao:
+        conexao.execute(f'PRAGMA journal_mode = {valores.get("journal_mode", "DELETE")}')
+    conexao.close()
+    rodadas = [rodada for rodada, in sqlite3.connect(caminho).execute(
+        'SELECT DISTINCT rodada FROM core_jogo WHERE realizado'
+    )]
+    if not rodadas:
+        raise ValueError('O banco não tem jogos realizados para o benchmark.')
+
+    fim = time.perf_counter() + duracao
+    leituras, escritas, travadas = [], [], []
+    trava = threading.Lock()
+
+    def conectar():
+        conexao = sqlite3.connect(caminho, timeout=timeout, isolation_level=None, check_same_thread=False)
+        aplicar_pragmas(conexao, valores)
+        return conexao
+
+    def medir(operacao, tempos, pausa=0.0):
+        # ``pausa`` separa as operações como requisições diferentes; uma que
+        # falha com "database is locked" não é repetida em laço apertado
+        conexao = conectar()
+        medidos, erros = [], 0
+        while time.perf_counter() < fim:
+            inicio = time.perf_counter()
+            try:
+                operacao(conexao)
+            except sqlite3.OperationalError:
+                erros += 1
+                if conexao.in_transaction:
+                    conexao.execute('ROLLBACK')
+            else:
+                medidos.append((time.perf_counter() - inicio) * 1000)
+            time.sleep(pausa)
+        conexao.close()
+        with trava:
+            tempos.extend(medidos)
+            travadas.append(erros)
+
+    def ler(conexao):
+        conexao.execute(
+            'SELECT c.pontos, c.vitorias, t.nome FROM core_classificacao c '
+            'JOIN core_time t ON t.id = c.time_id ORDER BY c.pontos DESC, c.vitorias DESC'
+        ).fetchall()
+        conexao.execute('SELECT COUNT(*), SUM(gols_casa + gols_visitante) FROM core_jogo WHERE realizado').fetchone()
+
+    def escrever(conexao, sorteio=random.Random()):
+        rodada = sorteio.choice(rodadas)
+        conexao.execute(f'BEGIN {TRANSACOES[perfil]}')
+        placares = conexao.execute(
+            'SELECT id, gols_casa, gols_visitante FROM core_jogo WHERE rodada = ? AND realizado', (rodada,)
+        ).fetchall()
+        # Reescreve os placares da rodada e a tabela inteira, como um lançamento
+        conexao.executemany(
+            'UPDATE core_jogo SET gols_casa = ?, gols_visitante = ? WHERE id = ?',
+            [(gols_casa, gols_visitante, jogo_id) for jogo_id, gols_casa, gols_visitante in placares],
+        )
+        conexao.execute('UPDATE core_classificacao SET pontos = pontos')
+        time.sleep(escrita_ms / 1000)
+        conexao.execute('COMMIT')
+
+    threads = [threading.Thread(target=medir, args=(ler, leituras)) for _ in range(leitores)]
+    threads += [threading.Thread(target=medir, args=(escrever, escritas, escrita_ms / 1000)) for _ in range(escritores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return ResultadoConcorrencia(
+        perfil=perfil,
+        leituras=len(leituras),
+        escritas=len(escritas),
+        leitura_p50=_percentil(leituras, 50),
+        leitura_p95=_percentil(leituras, 95),
+        leitura_max=max(leituras, default=0.0),
+        escrita_p50=_percentil(escritas, 50),
+        escrita_p95=_percentil(escritas, 95),
+        escrita_max=max(escritas, default=0.0),
+        travadas=sum(travadas),
+    )
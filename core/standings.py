@@ -0,0 +1,315 @@
+# core/standings.py
+
+from collections import Counter
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+
+from .cache import invalidar_cache
+from .elo import inicio_reprocessamento, reprocessar_elo
+from .models import Time, Jogo, Classificacao, ClassificacaoRodada
+
+CAMPOS_CLASSIFICACAO = (
+    'pontos', 'jogos', 'vitorias', 'empates', 'derrotas',
+    'gols_pro', 'gols_contra', 'saldo_gols',
+)
+
+
+@dataclass(slots=True)
+class LinhaClassificacao:
+    time: Time
+    jogos: int = 0
+    vitorias: int = 0
+    empates: int = 0
+    derrotas: int = 0
+    gols_pro: int = 0
+    gols_contra: int = 0
+
+    @property
+    def pontos(self):
+        return self.vitorias * 3 + self.empates
+
+    @property
+    def saldo_gols(self):
+        return self.gols_pro - self.gols_contra
+
+    @property
+    def aproveitamento(self):
+        if not self.jogos:
+            return 0
+        return round((self.pontos / (self.jogos * 3)) * 100, 1)
+
+
+def criterio_desempate(linha):
+    """Chave de ordenação da tabela: pontos, vitórias, saldo e gols pró."""
+    return (linha.pontos, linha.vitorias, linha.saldo_gols, linha.gols_pro)
+
+
+def _agregado(jogos, lado, agrupar=()):
+    # Agrega os jogos do ponto de vista do mandante ou do visitante
+    if lado == 'casa':
+        pro, contra = 'gols_casa', 'gols_visitante'
+    else:
+        pro, contra = 'gols_visitante', 'gols_casa'
+
+    return jogos.order_by().annotate(
+        time_ref=F(f'time_{lado}')
+    ).values(*agrupar, 'time_ref').annotate(
+        jogos=Count('id'),
+        vitorias=Count('id', filter=Q(**{f'{pro}__gt': F(contra)})),
+        empates=Count('id', filter=Q(**{pro: F(contra)})),
+        derrotas=Count('id', filter=Q(**{f'{pro}__lt': F(contra)})),
+        gols_pro=Sum(pro),
+        gols_contra=Sum(contra),
+    ).values_list(
+        *agrupar, 'time_ref', 'jogos', 'vitorias', 'empates', 'derrotas', 'gols_pro', 'gols_contra'
+    )
+
+
+def agregar_jogos(jogos=None, por_rodada=False):
+    """
+    Soma a campanha de cada time em uma única consulta (UNION dos
+    agregados como mandante e como visitante).
+
+    Retorna um dicionário {time_id: (jogos, vitorias, empates, derrotas,
+    gols_pro, gols_contra)}. Com ``por_rodada=True`` a chave passa a ser
+    (rodada, time_id) e os valores são os da rodada isolada.
+    """
+    if jogos is None:
+        jogos = Jogo.objects.filter(realizado=True)
+
+    agrupar = ('rodada',) if por_rodada else ()
+    totais = {}
+    consulta = _agregado(jogos, 'casa', agrupar).union(_agregado(jogos, 'visitante', agrupar), all=True)
+    for linha in consulta:
+        chave = tuple(linha[:len(agrupar) + 1]) if por_rodada else linha[0]
+        valores = linha[len(agrupar) + 1:]
+        atual = totais.get(chave)
+        if atual is None:
+            totais[chave] = list(valores)
+        else:
+            totais[chave] = [a + b for a, b in zip(atual, valores)]
+    return totais
+
+
+def calcular_classificacao(jogos=None, times=None, ordenar=True):
+    """
+    Monta a classificação com número fixo de consultas: uma para os
+    agregados de ``Jogo`` e outra para os times.
+
+    ``jogos`` restringe os jogos considerados (padrão: todos os realizados)
+    e ``times`` restringe os times listados. Com ``ordenar=False`` a lista
+    mantém a ordem dos times (alfabética).
+    """
+    if times is None:
+        times = Time.objects.all()
+
+    totais = agregar_jogos(jogos)
+    linhas = []
+    for time in times:
+        valores = totais.get(time.id)
+        if valores:
+            linhas.append(LinhaClassificacao(time, *valores))
+        else:
+            linhas.append(LinhaClassificacao(time))
+
+    if ordenar:
+        linhas.sort(key=criterio_desempate, reverse=True)
+    return linhas
+
+
+# ========== CLASSIFICAÇÃO MATERIALIZADA ==========
+
+def ler_classificacao():
+    """Lê a tabela persistida em ``Classificacao`` (já ordenada pelo índice)."""
+    return Classificacao.objects.select_related('time')
+
+
+def _placar(pro, contra):
+    return Counter(
+        jogos=1,
+        vitorias=int(pro > contra),
+        empates=int(pro == contra),
+        derrotas=int(pro < contra),
+        pontos=3 if pro > contra else int(pro == contra),
+        gols_pro=pro,
+        gols_contra=contra,
+        saldo_gols=pro - contra,
+    )
+
+
+class Contribuicao(dict):
+    """
+    {time_id: Counter(campo=valor)} mais as rodadas e as datas
+    ({jogo_id: data_jogo}) dos jogos somados.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.rodadas = set()
+        self.jogos = {}
+
+
+def contribuicao(*jogos):
+    """
+    Retorna o quanto os jogos somam na tabela, por time:
+    {time_id: Counter(campo=valor)}. Jogos não realizados não contam.
+
+    Deve ser chamada antes de alterar o jogo para guardar a contribuição
+    antiga, e de novo depois para obter a nova.
+    """
+    total = Contribuicao()
+    for jogo in jogos:
+        if not jogo.realizado:
+            continue
+        total.rodadas.add(int(jogo.rodada))
+        total.jogos[jogo.id] = jogo.data_jogo
+        gols_casa, gols_visitante = int(jogo.gols_casa), int(jogo.gols_visitante)
+        lados = (
+            (jogo.time_casa_id, _placar(gols_casa, gols_visitante)),
+            (jogo.time_visitante_id, _placar(gols_visitante, gols_casa)),
+        )
+        for time_id, valores in lados:
+            total.setdefault(int(time_id), Counter()).update(valores)
+    return total
+
+
+def atualizar_classificacao(antes=None, depois=None):
+    """
+    Aplica na ``Classificacao`` a diferença entre duas contribuições
+    (ver ``contribuicao``): subtrai ``antes`` e soma ``depois`` com
+    expressões ``F()``, uma atualização por time afetado.
+
+    Os retratos por rodada são refeitos a partir da menor rodada envolvida
+    e o rating Elo, a partir do jogo mais antigo envolvido.
+    """
+    antes = antes or {}
+    depois = depois or {}
+    rodadas = getattr(antes, 'rodadas', set()) | getattr(depois, 'rodadas', set())
+    jogos = [*getattr(antes, 'jogos', {}).items(), *getattr(depois, 'jogos', {}).items()]
+
+    with transaction.atomic():
+        for time_id in set(antes) | set(depois):
+            delta = Counter(depois.get(time_id, {}))
+            delta.subtract(antes.get(time_id, {}))
+            campos = {campo: F(campo) + valor for campo, valor in delta.items() if valor}
+            if not campos:
+                continue
+            if not Classificacao.objects.filter(time_id=time_id).update(**campos):
+                Classificacao.objects.get_or_create(time_id=time_id)
+                Classificacao.objects.filter(time_id=time_id).update(**campos)
+
+        if rodadas:
+            atualizar_rodadas(min(rodadas))
+        inicio = inicio_reprocessamento(jogos)
+        if inicio is not None:
+            reprocessar_elo(inicio, set(antes) | set(depois))
+        # Cobre também as escritas sem sinal, como ``queryset.update()`` no admin
+        invalidar_cache()
+
+
+def reconstruir_classificacao(gravar=True):
+    """
+    Recalcula a ``Classificacao`` inteira a partir dos jogos realizados
+    (com os retratos por rodada e o histórico Elo).
+
+    Retorna a lista de (time, campo, valor_gravado, valor_esperado) das
+    divergências encontradas. Com ``gravar=False`` apenas confere.
+    """
+    divergencias = []
+    with transaction.atomic():
+        gravadas = {c.time_id: c for c in Classificacao.objects.select_for_update()}
+        novas = []
+        alteradas = []
+        for linha in calcular_classificacao(ordenar=False):
+            esperado = {campo: getattr(linha, campo) for campo in CAMPOS_CLASSIFICACAO}
+            atual = gravadas.pop(linha.time.id, None)
+            if atual is None:
+                divergencias.append((linha.time, 'linha', None, esperado))
+                novas.append(Classificacao(time=linha.time, **esperado))
+                continue
+            diferentes = False
+            for campo, valor in esperado.items():
+                if getattr(atual, campo) != valor:
+                    divergencias.append((linha.time, campo, getattr(atual, campo), valor))
+                    setattr(atual, campo, valor)
+                    diferentes = True
+            if diferentes:
+                alteradas.append(atual)
+
+        if gravar:
+            Classificacao.objects.bulk_create(novas)
+            Classificacao.objects.bulk_update(alteradas, CAMPOS_CLASSIFICACAO)
+            atualizar_rodadas()
+            reprocessar_elo()
+            invalidar_cache()
+    return divergencias
+
+
+# ========== CLASSIFICAÇÃO POR RODADA ==========
+
+def atualizar_rodadas(a_partir_de=1):
+    """
+    Refaz os retratos acumulados de ``ClassificacaoRodada`` da rodada
+    ``a_partir_de`` em diante, partindo do último retrato anterior a ela.
+
+    Só existem retratos das rodadas com pelo menos um jogo realizado.
+    """
+    with transaction.atomic():
+        anterior = ClassificacaoRodada.objects.filter(
+            rodada__lt=a_partir_de
+        ).aggregate(Max('rodada'))['rodada__max']
+
+        acumulado = {}
+        if anterior is not None:
+            for linha in ClassificacaoRodada.objects.filter(rodada=anterior):
+                acumulado[linha.time_id] = [
+                    linha.jogos, linha.vitorias, linha.empates,
+                    linha.derrotas, linha.gols_pro, linha.gols_contra,
+                ]
+
+        por_rodada = {}
+        jogos = Jogo.objects.filter(realizado=True, rodada__gte=a_partir_de)
+        for (rodada, time_id), valores in agregar_jogos(jogos, por_rodada=True).items():
+            por_rodada.setdefault(rodada, {})[time_id] = valores
+
+        ClassificacaoRodada.objects.filter(rodada__gte=a_partir_de).delete()
+
+        times = list(Time.objects.all())
+        retratos = []
+        for rodada in sorted(por_rodada):
+            for time_id, valores in por_rodada[rodada].items():
+                atual = acumulado.get(time_id)
+                acumulado[time_id] = valores if atual is None else [a + b for a, b in zip(atual, valores)]
+
+            linhas = [LinhaClassificacao(time, *acumulado.get(time.id, ())) for time in times]
+            linhas.sort(key=criterio_desempate, reverse=True)
+            for posicao, linha in enumerate(linhas, start=1):
+                retratos.append(ClassificacaoRodada(
+                    time=linha.time,
+                    rodada=rodada,
+                    posicao=posicao,
+                    **{campo: getattr(linha, campo) for campo in CAMPOS_CLASSIFICACAO},
+                ))
+        ClassificacaoRodada.objects.bulk_create(retratos)
+
+
+def classificacao_na_rodada(rodada):
+    """
+    Tabela como estava ao fim da rodada informada (ou do último retrato
+    anterior, se a rodada não teve jogos). Retorna (rodada, linhas).
+    """
+    rodada = ClassificacaoRodada.objects.filter(
+        rodada__lte=rodada
+    ).aggregate(Max('rodada'))['rodada__max']
+    if rodada is None:
+        return None, None
+    return rodada, ClassificacaoRodada.objects.filter(rodada=rodada).select_related('time').order_by('posicao')
+
+
+def evolucao_posicoes(time):
+    """Série (rodada, posição, pontos) do time ao longo do campeonato."""
+    return list(
+        ClassificacaoRodada.objects.filter(time=time).order_by('rodada').values_list('rodada', 'posicao', 'pontos')
+    )
@@ -0,0 +1,155 @@
+# core/tarefas.py
+
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.db import close_old_connections
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Tarefa
+
+# Espera antes da 1ª nova tentativa, dobrando a cada falha
+ATRASO_TENTATIVA = timedelta(seconds=10)
+# Tarefa em execução há mais tempo que isso é de um worker que caiu: volta
+# para a fila. Padrão de ``@tarefa``; cada tarefa pode pedir mais
+VISIBILIDADE = timedelta(minutes=5)
+
+
+def tarefa(funcao=None, *, visibilidade=VISIBILIDADE):
+    """
+    Marca uma função de módulo como executável pelo worker. Os argumentos
+    precisam ser serializáveis em JSON (ids, não objetos).
+
+    ``visibilidade`` é quanto a tarefa pode ficar em execução antes de ser
+    dada como de um worker que caiu e voltar para a fila: precisa ficar
+    acima do pior caso da tarefa, ou ela roda duas vezes. Uso:
+    ``@tarefa`` ou ``@tarefa(visibilidade=timedelta(minutes=30))``.
+    """
+    def marcar(funcao):
+        funcao.nome_tarefa = f'{funcao.__module__}.{funcao.__qualname__}'
+        funcao.visibilidade = visibilidade
+        return funcao
+    return marcar if funcao is None else marcar(funcao)
+
+
+def _funcao(nome):
+    funcao = import_string(nome)
+    if getattr(funcao, 'nome_tarefa', None) != nome:
+        raise ValueError(f'{nome} não é uma tarefa (@tarefa).')
+    return funcao
+
+
+def _visibilidade(nome):
+    try:
+        return _funcao(nome).visibilidade
+    except (ImportError, ValueError):
+        # O erro fica registrado quando o worker tentar executar
+        return VISIBILIDADE
+
+
+def enfileirar(funcao, *args, chave=None, atraso=None, max_tentativas=3, **kwargs):
+    """
+    Enfileira ``funcao(*args, **kwargs)`` para o worker e retorna a ``Tarefa``.
+    Dentro de uma transação, a tarefa só fica visível para o worker depois
+    do commit. Com ``chave``, uma tarefa já existente com a mesma chave é
+    reaproveitada em vez de duplicada (e reenfileirada se tiver falhado).
+    """
+    dados = {
+        'nome': funcao.nome_tarefa,
+        'argumentos': {'args': list(args), 'kwargs': kwargs},
+        'max_tentativas': max_tentativas,
+        'executar_em': timezone.now() + (atraso or timedelta()),
+    }
+    if chave is None:
+        return Tarefa.objects.create(**dados)
+
+    obj, criada = Tarefa.objects.get_or_create(chave=chave, defaults=dados)
+    if not criada and obj.estado == Tarefa.FALHOU:
+        Tarefa.objects.filter(pk=obj.pk, estado=Tarefa.FALHOU).update(
+            estado=Tarefa.PENDENTE, tentativas=0, erro='', executar_em=dados['executar_em'],
+        )
+        obj.refresh_from_db()
+    return obj
+
+
+def reservar(limite):
+    """
+    Passa até ``limite`` tarefas prontas de pendente para executando e
+    retorna seus ids. Cada uma é reservada com um UPDATE condicional ao
+    estado, então dois workers nunca pegam a mesma tarefa (sem depender de
+    SELECT ... FOR UPDATE, que o SQLite não tem). A reserva vale pela
+    ``visibilidade`` da tarefa; vencida, a tarefa volta para a fila.
+    """
+    agora = timezone.now()
+    presas = Tarefa.objects.filter(
+        # Sem prazo: reservada antes de existir a visibilidade por tarefa
+        Q(reservada_ate__lt=agora) | Q(reservada_ate__isnull=True, iniciada_em__lt=agora - VISIBILIDADE),
+        estado=Tarefa.EXECUTANDO,
+    )
+    presas.filter(tentativas__lt=F('max_tentativas')).update(estado=Tarefa.PENDENTE)
+    presas.update(estado=Tarefa.FALHOU, erro='Worker interrompido durante a execução.')
+
+    candidatas = Tarefa.objects.filter(
+        estado=Tarefa.PENDENTE, executar_em__lte=agora
+    ).order_by('executar_em', 'id').values_list('id', 'nome')[:limite]
+
+    reservadas = []
+    for tarefa_id, nome in candidatas:
+        reservada = Tarefa.objects.filter(id=tarefa_id, estado=Tarefa.PENDENTE).update(
+            estado=Tarefa.EXECUTANDO, iniciada_em=agora, reservada_ate=agora + _visibilidade(nome),
+            tentativas=F('tentativas') + 1,
+        )
+        if reservada:
+            reservadas.append(tarefa_id)
+    return reservadas
+
+
+def executar(tarefa_id):
+    """
+    Executa uma tarefa reservada. Em caso de erro ela volta para a fila com
+    espera crescente, até ``max_tentativas``. Retorna True se concluiu.
+    Roda nos processos do pool do ``run_worker``.
+    """
+    close_old_connections()
+    obj = Tarefa.objects.filter(id=tarefa_id).first()
+    if obj is None:
+        return False
+    try:
+        # Sem transação em volta: a tarefa abre as suas só onde escreve, para
+        # não segurar o lock de escrita do SQLite durante o trabalho pesado
+        _funcao(obj.nome)(*obj.argumentos.get('args', []), **obj.argumentos.get('kwargs', {}))
+    except Exception:
+        if obj.tentativas >= obj.max_tentativas:
+            estado = {'estado': Tarefa.FALHOU}
+        else:
+            atraso = ATRASO_TENTATIVA * 2 ** (obj.tentativas - 1)
+            estado = {'estado': Tarefa.PENDENTE, 'executar_em': timezone.now() + atraso}
+        Tarefa.objects.filter(id=tarefa_id).update(erro=traceback.format_exc(), **estado)
+        return False
+
+    Tarefa.objects.filter(id=tarefa_id).update(estado=Tarefa.CONCLUIDA, concluida_em=timezone.now(), erro='')
+    return True
+
+
+@dataclass(slots=True)
+class ResumoFila:
+    pendentes: int
+    executando: int
+    falhas: int
+    # Tarefa pronta há mais tempo sem ser pega (atraso do worker)
+    mais_antiga: datetime | None
+
+
+def resumo_fila():
+    """Tamanho da fila por estado, em uma consulta."""
+    agora = timezone.now()
+    dados = Tarefa.objects.aggregate(
+        pendentes=Count('id', filter=Q(estado=Tarefa.PENDENTE)),
+        executando=Count('id', filter=Q(estado=Tarefa.EXECUTANDO)),
+        falhas=Count('id', filter=Q(estado=Tarefa.FALHOU)),
+        mais_antiga=Min('executar_em', filter=Q(estado=Tarefa.PENDENTE, executar_em__lte=agora)),
+    )
+    return ResumoFila(**dados)
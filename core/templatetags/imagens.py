@@ -0,0 +1,42 @@
+# core/templatetags/imagens.py
+
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from core.imagens import escolher_tamanho, url_miniatura
+
+register = template.Library()
+
+
+def _atributos(atributos):
+    return format_html_join('', ' {}="{}"', atributos.items())
+
+
+@register.simple_tag
+def miniatura(arquivo, largura, **atributos):
+    """
+    ``<picture>`` com as miniaturas WebP (e PNG de reserva) de um campo de
+    imagem exibido com ``largura`` px, em 1x e 2x::
+
+        {% miniatura time.logo 30 class="team-logo-mini" alt=time.nome %}
+
+    Os demais argumentos viram atributos do ``<img>``. Enquanto a imagem não
+    tem miniaturas (ver ``generate_thumbnails``), usa o arquivo original.
+    """
+    if not arquivo:
+        return ''
+    assinatura = getattr(arquivo.instance, f'{arquivo.field.name}_assinatura', '')
+    if not assinatura:
+        return format_html('<img src="{}"{}>', arquivo.url, _atributos(atributos))
+
+    tamanhos = escolher_tamanho(largura), escolher_tamanho(largura * 2)
+    srcset = {
+        extensao: ', '.join(f'{url_miniatura(assinatura, tamanho, extensao)} {x}x' for x, tamanho in enumerate(tamanhos, 1))
+        for extensao in ('webp', 'png')
+    }
+    # display: contents mantém o <img> como filho direto de flex/grid no layout
+    return format_html(
+        '<picture style="display: contents"><source type="image/webp" srcset="{}">'
+        '<img src="{}" srcset="{}"{}></picture>',
+        srcset['webp'], url_miniatura(assinatura, tamanhos[0], 'png'), srcset['png'], _atributos(atributos),
+    )
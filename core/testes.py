@@ -0,0 +1,33 @@
+# core/testes.py
+
+import shutil
+import tempfile
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class ExecutorTestes(DiscoverRunner):
+    """
+    Runner dos testes (settings.TEST_RUNNER): o cache compartilhado do
+    servidor (CACHES) é trocado por um FileBasedCache numa pasta temporária,
+    para os ``cache.clear()`` dos testes não apagarem o cache de quem roda o
+    site na mesma máquina. Os processos abertos pelos testes recebem a pasta
+    em LIGAPRO_CACHE.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.pasta_cache = tempfile.mkdtemp(prefix='ligapro-cache-')
+        self.cache_temporario = override_settings(CACHES={
+            'default': {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': self.pasta_cache,
+            },
+        })
+        self.cache_temporario.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.cache_temporario.disable()
+        shutil.rmtree(self.pasta_cache, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
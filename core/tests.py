@@ -1,3 +1,1438 @@
-from django.test import TestCase
+import asyncio
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import tracemalloc
+import unittest
+from datetime import timedelta
+from io import BytesIO, StringIO
 
-# Create your tests here.
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.models import F, Max, Q
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import CommandError
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from django.test import Client, TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from . import busca, eventos, exportacao, importacao, montecarlo, roteamento
+from .cache import CHAVE_VERSAO, estado_dados, versao_dados
+from .calendario import gerar_calendario, gravar_calendario
+from .elo import ELO_INICIAL, esperado, reprocessar_elo, variacao
+from .benchmark import argumentos_rotas, medir_rotas, rotas
+from .gerador import gerar_liga
+from .imagens import TAMANHOS, atualizar_miniaturas, caminho_miniatura, gerar_miniaturas
+from .metricas import medir_consultas
+from .paginacao import codificar_cursor
+from .models import Time, Jogador, Jogo, Gol, Classificacao, ClassificacaoRodada, EloJogo, Tarefa
+from .simulacao import calcular_probabilidades, probabilidades_atuais, simular_temporada
+from .scorers import artilheiros, ranking_artilheiros, pagina_artilheiros, ranking_times_gols, reconstruir_contadores
+from .tarefas import ATRASO_TENTATIVA, VISIBILIDADE, enfileirar, executar, reservar, resumo_fila, tarefa
+from .standings import (
+    calcular_classificacao, contribuicao, atualizar_classificacao, reconstruir_classificacao,
+    classificacao_na_rodada, evolucao_posicoes,
+)
+
+
+def criar_jogo(casa, visitante, gols_casa, gols_visitante, rodada=1, realizado=True):
+    return Jogo.objects.create(
+        time_casa=casa,
+        time_visitante=visitante,
+        gols_casa=gols_casa,
+        gols_visitante=gols_visitante,
+        data_jogo=timezone.now() - timedelta(days=30 - rodada),
+        rodada=rodada,
+        realizado=realizado,
+    )
+
+
+def manage_em_outro_processo(*argumentos):
+    """
+    Roda ``manage.py`` em outro processo, sobre uma cópia do banco de teste
+    e com o mesmo cache deste. A cópia (API de backup) precisa de um
+    ``TransactionTestCase``: a transação aberta do TestCase a travaria.
+    """
+    pasta = tempfile.mkdtemp()
+    try:
+        banco = os.path.join(pasta, 'banco.sqlite3')
+        connection.ensure_connection()
+        with sqlite3.connect(banco) as destino:
+            connection.connection.backup(destino)
+        destino.close()
+        ambiente = dict(os.environ, LIGAPRO_BANCO=banco, LIGAPRO_CACHE=str(settings.CACHES['default']['LOCATION']))
+        ambiente.pop('LIGAPRO_REPLICA', None)
+        resultado = subprocess.run(
+            [sys.executable, 'manage.py', *argumentos],
+            cwd=settings.BASE_DIR, env=ambiente, capture_output=True, text=True,
+        )
+    finally:
+        shutil.rmtree(pasta)
+    if resultado.returncode:
+        raise AssertionError(resultado.stderr)
+    return resultado.stdout
+
+
+def verificar_orcamentos(test, urlconf, namespace=''):
+    """GET em cada rota do urlconf, comparando as consultas com o orçamento declarado."""
+    for nome, url, view in rotas(urlconf, namespace, argumentos_rotas()):
+        limite = getattr(view, 'orcamento_consultas', None)
+        with test.subTest(url=url):
+            test.assertIsNotNone(limite, f'{nome} sem @orcamento_consultas')
+            with medir_consultas() as coletor:
+                response = test.client.get(url)
+            test.assertEqual(response.status_code, 200)
+            test.assertLessEqual(coletor.total, limite, coletor.duplicadas)
+
+
+class ClassificacaoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a = Time.objects.create(nome='Alfa')
+        cls.b = Time.objects.create(nome='Beta')
+        cls.c = Time.objects.create(nome='Gama')
+        criar_jogo(cls.a, cls.b, 2, 0, rodada=1)
+        criar_jogo(cls.b, cls.c, 1, 1, rodada=2)
+        criar_jogo(cls.c, cls.a, 3, 1, rodada=3)
+        criar_jogo(cls.a, cls.c, 5, 0, rodada=4, realizado=False)
+        reconstruir_classificacao()
+
+    def test_campanha_e_ordem(self):
+        linhas = calcular_classificacao()
+        self.assertEqual([l.time for l in linhas], [self.c, self.a, self.b])
+
+        gama, alfa, beta = linhas
+        self.assertEqual((gama.pontos, gama.jogos, gama.vitorias, gama.empates, gama.derrotas), (4, 2, 1, 1, 0))
+        self.assertEqual((gama.gols_pro, gama.gols_contra, gama.saldo_gols), (4, 2, 2))
+        self.assertEqual((alfa.pontos, alfa.gols_pro, alfa.gols_contra), (3, 3, 3))
+        self.assertEqual((beta.pontos, beta.derrotas, beta.saldo_gols), (1, 1, -2))
+
+    def test_time_sem_jogos_aparece_zerado(self):
+        novo = Time.objects.create(nome='Delta')
+        linha = next(l for l in calcular_classificacao() if l.time == novo)
+        self.assertEqual((linha.jogos, linha.pontos, linha.aproveitamento), (0, 0, 0))
+
+    def test_numero_de_consultas_nao_depende_dos_times(self):
+        with self.assertNumQueries(2):
+            calcular_classificacao()
+
+        for i in range(10):
+            Time.objects.create(nome=f'Extra {i}')
+        with self.assertNumQueries(2):
+            calcular_classificacao()
+
+    def test_views_de_classificacao(self):
+        for nome in ('tabela', 'lista_times', 'dashboard_usuario'):
+            response = self.client.get(reverse(nome))
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['classificacao'][0].time, self.c)
+
+
+class ClassificacaoMaterializadaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a = Time.objects.create(nome='Alfa')
+        cls.b = Time.objects.create(nome='Beta')
+
+    def assertTabelaConsistente(self):
+        self.assertEqual(reconstruir_classificacao(gravar=False), [])
+
+    def test_time_novo_ganha_linha(self):
+        self.assertEqual(Classificacao.objects.count(), 2)
+
+    def test_edicao_subtrai_contribuicao_antiga(self):
+        jogo = criar_jogo(self.a, self.b, 1, 0)
+        atualizar_classificacao(depois=contribuicao(jogo))
+        self.assertTabelaConsistente()
+
+        antes = contribuicao(jogo)
+        jogo.gols_casa, jogo.gols_visitante = 2, 2
+        jogo.save()
+        atualizar_classificacao(antes, contribuicao(jogo))
+        self.assertTabelaConsistente()
+        self.assertEqual(Classificacao.objects.get(time=self.a).pontos, 1)
+
+        antes = contribuicao(jogo)
+        jogo.delete()
+        atualizar_classificacao(antes)
+        self.assertTabelaConsistente()
+        self.assertEqual(Classificacao.objects.get(time=self.b).jogos, 0)
+
+    def test_rebuild_standings(self):
+        criar_jogo(self.a, self.b, 3, 1)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_standings', '--check', stdout=StringIO())
+        call_command('rebuild_standings', stdout=StringIO())
+        call_command('rebuild_standings', '--check', stdout=StringIO())
+        self.assertEqual(Classificacao.objects.get(time=self.a).pontos, 3)
+
+
+class ClassificacaoRodadaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a = Time.objects.create(nome='Alfa')
+        cls.b = Time.objects.create(nome='Beta')
+        cls.c = Time.objects.create(nome='Gama')
+        cls.jogos = [
+            criar_jogo(cls.a, cls.b, 2, 0, rodada=1),
+            criar_jogo(cls.b, cls.c, 1, 0, rodada=2),
+            criar_jogo(cls.c, cls.a, 3, 0, rodada=3),
+        ]
+        reconstruir_classificacao()
+
+    def test_tabela_apos_cada_rodada(self):
+        rodada, linhas = classificacao_na_rodada(1)
+        self.assertEqual(rodada, 1)
+        self.assertEqual([l.time for l in linhas], [self.a, self.c, self.b])
+
+        rodada, linhas = classificacao_na_rodada(2)
+        self.assertEqual([(l.time, l.pontos) for l in linhas][:2], [(self.a, 3), (self.b, 3)])
+
+        # Rodada sem jogos realizados mostra o último retrato anterior
+        self.assertEqual(classificacao_na_rodada(10)[0], 3)
+        self.assertEqual(classificacao_na_rodada(0), (None, None))
+
+        response = self.client.get(reverse('tabela'), {'rodada': 1})
+        self.assertEqual(response.context['rodada_selecionada'], 1)
+        self.assertEqual(response.context['dados_times'][0].time, self.a)
+
+    def test_edicao_refaz_apenas_rodadas_seguintes(self):
+        rodada_1 = list(ClassificacaoRodada.objects.filter(rodada=1).values_list('id', flat=True))
+
+        jogo = self.jogos[1]
+        antes = contribuicao(jogo)
+        jogo.gols_casa = 0
+        jogo.save()
+        atualizar_classificacao(antes, contribuicao(jogo))
+
+        self.assertEqual(list(ClassificacaoRodada.objects.filter(rodada=1).values_list('id', flat=True)), rodada_1)
+        self.assertEqual(evolucao_posicoes(self.b), [(1, 3, 0), (2, 3, 1), (3, 3, 1)])
+
+        esperado = list(ClassificacaoRodada.objects.values_list('rodada', 'time', 'posicao', 'pontos'))
+        reconstruir_classificacao()
+        self.assertEqual(list(ClassificacaoRodada.objects.values_list('rodada', 'time', 'posicao', 'pontos')), esperado)
+
+    def test_empate_total_em_ordem_alfabetica(self):
+        # Criados fora da ordem alfabética: o id não pode decidir o empate
+        zeta = Time.objects.create(nome='Zeta')
+        delta = Time.objects.create(nome='Delta')
+        criar_jogo(zeta, delta, 1, 1, rodada=4)
+        reconstruir_classificacao()
+
+        esperado = ['Gama', 'Alfa', 'Beta', 'Delta', 'Zeta']
+        self.assertEqual([linha.time.nome for linha in Classificacao.objects.select_related('time')], esperado)
+        rodada = ClassificacaoRodada.objects.filter(rodada=4).order_by('posicao')
+        self.assertEqual([linha.time.nome for linha in rodada.select_related('time')], esperado)
+        _, linhas = exportacao.consulta_classificacao({})
+        self.assertEqual([(posicao, nome) for posicao, nome, *_ in linhas], list(enumerate(esperado, 1)))
+
+
+class ArtilhariaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a = Time.objects.create(nome='Alfa')
+        cls.b = Time.objects.create(nome='Beta')
+        jogo = criar_jogo(cls.a, cls.b, 4, 1)
+        cls.atacante = Jogador.objects.create(nome='Atacante', time=cls.a, posicao='ATA')
+        cls.meia = Jogador.objects.create(nome='Meia', time=cls.a, posicao='MEI')
+        cls.zagueiro = Jogador.objects.create(nome='Zagueiro', time=cls.b, posicao='ZAG')
+        for minuto in (10, 20, 30):
+            Gol.objects.create(jogo=jogo, jogador=cls.atacante, time=cls.a, minuto=minuto)
+        Gol.objects.create(jogo=jogo, jogador=cls.zagueiro, time=cls.b, minuto=40, tipo='CONTRA', contra=True)
+        Gol.objects.create(jogo=jogo, jogador=cls.meia, time=cls.a, minuto=50)
+        Gol.objects.create(jogo=jogo, jogador=cls.zagueiro, time=cls.b, minuto=60)
+
+    def test_ranking_em_uma_consulta(self):
+        with self.assertNumQueries(1):
+            ranking = ranking_artilheiros()
+            nomes_times = [linha.jogador.time.nome for linha in ranking]
+
+        self.assertEqual(
+            [(l.posicao, l.jogador, l.gols) for l in ranking],
+            [(1, self.atacante, 3), (2, self.meia, 1), (3, self.zagueiro, 1)],
+        )
+        self.assertEqual(nomes_times, ['Alfa', 'Alfa', 'Beta'])
+
+    def test_top_n_por_time_e_paginacao(self):
+        self.assertEqual([l.jogador for l in ranking_artilheiros(time=self.b)], [self.zagueiro])
+        self.assertEqual(len(ranking_artilheiros(top_n=2)), 2)
+
+        pagina = pagina_artilheiros(2, por_pagina=2)
+        self.assertEqual([(l.posicao, l.jogador) for l in pagina], [(3, self.zagueiro)])
+        self.assertEqual(pagina.paginator.count, 3)
+
+    def test_gols_por_time(self):
+        with self.assertNumQueries(1):
+            ranking = ranking_times_gols()
+        self.assertEqual([(l.time, l.gols) for l in ranking], [(self.a, 4), (self.b, 1)])
+
+    def test_views_de_artilharia(self):
+        response = self.client.get(reverse('artilharia'))
+        self.assertEqual(response.context['ranking'][0].jogador, self.atacante)
+        response = self.client.get(reverse('detalhe_time', args=[self.b.id]))
+        self.assertEqual([l.jogador for l in response.context['artilheiros']], [self.zagueiro])
+
+
+class ContadoresGolsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a = Time.objects.create(nome='Alfa')
+        cls.b = Time.objects.create(nome='Beta')
+        cls.jogo = criar_jogo(cls.a, cls.b, 2, 1)
+        cls.atacante = Jogador.objects.create(nome='Atacante', time=cls.a, posicao='ATA')
+        cls.zagueiro = Jogador.objects.create(nome='Zagueiro', time=cls.b, posicao='ZAG')
+
+    def contadores(self, obj):
+        obj.refresh_from_db()
+        return (obj.gols_marcados, obj.gols_contra, obj.gols_penalti)
+
+    def test_criar_editar_e_excluir_gol(self):
+        gol = Gol.objects.create(jogo=self.jogo, jogador=self.atacante, time=self.a, minuto=10, tipo='PENALTI')
+        self.assertEqual(self.contadores(self.atacante), (1, 0, 1))
+        self.assertEqual(self.contadores(self.a), (1, 0, 1))
+
+        # Vira gol contra do zagueiro do outro time
+        gol.jogador, gol.time, gol.tipo, gol.contra = self.zagueiro, self.b, 'CONTRA', True
+        gol.save()
+        self.assertEqual(self.contadores(self.atacante), (0, 0, 0))
+        self.assertEqual(self.contadores(self.a), (0, 0, 0))
+        self.assertEqual(self.contadores(self.zagueiro), (0, 1, 0))
+        self.assertEqual(self.contadores(self.b), (0, 1, 0))
+
+        gol.delete()
+        self.assertEqual(self.contadores(self.b), (0, 0, 0))
+        self.assertEqual(reconstruir_contadores(gravar=False), [])
+
+    def test_exclusao_em_cascata(self):
+        Gol.objects.create(jogo=self.jogo, jogador=self.atacante, time=self.a, minuto=10)
+        self.jogo.delete()
+        self.assertEqual(self.contadores(self.a), (0, 0, 0))
+
+    def test_rebuild_goal_counters(self):
+        Gol.objects.create(jogo=self.jogo, jogador=self.atacante, time=self.a, minuto=10)
+        Jogador.objects.update(gols_marcados=7)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_goal_counters', '--check', stdout=StringIO())
+        call_command('rebuild_goal_counters', stdout=StringIO())
+        self.assertEqual(self.contadores(self.atacante), (1, 0, 0))
+        self.assertEqual(self.contadores(self.zagueiro), (0, 0, 0))
+
+
+@skipUnlessDBFeature('supports_partial_indexes')
+class PlanoConsultaTests(TestCase):
+    """
+    Confere com EXPLAIN QUERY PLAN (SQLite) que as consultas mais usadas
+    percorrem um índice, sem varredura completa nem B-tree temporária.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.agora = timezone.now()
+        times = Time.objects.bulk_create([Time(nome=f'Time {i:02d}') for i in range(20)])
+        jogadores = Jogador.objects.bulk_create([
+            Jogador(nome=f'Jogador {i}', time=times[i % 20], posicao='ATA', gols_marcados=i % 17)
+            for i in range(500)
+        ])
+        # Temporada sintética de 10 mil jogos, metade já realizada
+        jogos = Jogo.objects.bulk_create([
+            Jogo(
+                time_casa=times[i % 20],
+                time_visitante=times[(i * 7 + 1) % 20],
+                data_jogo=cls.agora + timedelta(hours=i - 5000),
+                rodada=i // 10 + 1,
+                realizado=i < 5000,
+                gols_casa=i % 3,
+                gols_visitante=i % 2,
+            )
+            for i in range(10000)
+        ])
+        Gol.objects.bulk_create([
+            Gol(jogo=jogos[i], jogador=jogadores[i % 500], time=times[i % 20], minuto=i % 90, contra=i % 25 == 0)
+            for i in range(5000)
+        ])
+        cls.time = times[3]
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def assertUsaIndice(self, queryset, indice):
+        plano = queryset.explain()
+        self.assertIn(f'USING INDEX {indice}', plano)
+        self.assertNotIn('TEMP B-TREE', plano)
+
+    def test_jogos_por_situacao_e_data(self):
+        self.assertUsaIndice(Jogo.objects.filter(realizado=True).order_by('-data_jogo')[:5], 'jogo_realizados_data_idx')
+        self.assertUsaIndice(
+            Jogo.objects.filter(realizado=False, data_jogo__gte=self.agora).order_by('data_jogo')[:5],
+            'jogo_pendentes_data_idx',
+        )
+        self.assertUsaIndice(
+            Jogo.objects.select_related('time_casa', 'time_visitante').order_by('-data_jogo'),
+            'jogo_data_idx',
+        )
+
+    def test_jogos_por_rodada(self):
+        self.assertUsaIndice(
+            Jogo.objects.filter(realizado=True).values_list('rodada', flat=True).distinct().order_by('rodada'),
+            'jogo_realizados_rodada_idx',
+        )
+        self.assertUsaIndice(
+            Jogo.objects.filter(realizado=True, rodada=3).order_by('-data_jogo'),
+            'jogo_realizados_rodada_idx',
+        )
+        self.assertUsaIndice(
+            Jogo.objects.filter(realizado=False, rodada=900).order_by('data_jogo'),
+            'jogo_pendentes_rodada_idx',
+        )
+
+    def test_jogos_de_um_time(self):
+        plano = Jogo.objects.filter(
+            Q(time_casa=self.time) | Q(time_visitante=self.time), realizado=True
+        ).order_by('-data_jogo')[:5].explain()
+        self.assertIn('USING INDEX', plano)
+        self.assertNotRegex(plano, r'(?m)SCAN core_jogo$')
+
+    def test_artilharia(self):
+        self.assertUsaIndice(
+            Gol.objects.filter(contra=False, time=self.time).order_by('jogador').values('jogador'),
+            'gol_marcados_time_idx',
+        )
+        self.assertUsaIndice(artilheiros()[:20], 'jogador_gols_marcados_idx')
+        self.assertUsaIndice(Time.objects.filter(gols_marcados__gt=0).order_by('-gols_marcados', 'nome'), 'time_gols_marcados_idx')
+
+
+class OrcamentoConsultasTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        gerar_liga(times=6, jogadores_por_time=5, rodadas=10, rodadas_realizadas=6)
+
+    def test_rotas_publicas_dentro_do_orcamento(self):
+        verificar_orcamentos(self, 'core.urls')
+
+    def test_orcamento_nao_depende_do_tamanho_da_liga(self):
+        gerar_liga(times=12, jogadores_por_time=11, rodadas=22, rodadas_realizadas=11, semente=1)
+        verificar_orcamentos(self, 'core.urls')
+
+    def test_cabecalho_server_timing(self):
+        response = self.client.get(reverse('tabela'))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="2 consultas", db-dup;desc="0 repetidas"$')
+
+
+class GeradorLigaTests(TestCase):
+    def test_liga_gerada_e_consistente(self):
+        resumo = gerar_liga(times=7, jogadores_por_time=11, rodadas=6, rodadas_realizadas=4)
+
+        # Com 7 times um folga a cada rodada
+        self.assertEqual((resumo.times, resumo.jogadores, resumo.jogos), (7, 77, 18))
+        self.assertEqual(Jogo.objects.filter(realizado=True).count(), 12)
+        self.assertFalse(Jogo.objects.filter(realizado=False, data_jogo__lt=timezone.now()).exists())
+        for jogo in Jogo.objects.filter(realizado=True).prefetch_related('gols'):
+            gols_casa = sum(
+                (gol.time_id == jogo.time_casa_id) != gol.contra for gol in jogo.gols.all()
+            )
+            self.assertEqual((gols_casa, jogo.gols.count() - gols_casa), (jogo.gols_casa, jogo.gols_visitante))
+        self.assertEqual(reconstruir_classificacao(gravar=False), [])
+        self.assertEqual(reconstruir_contadores(gravar=False), [])
+        self.assertEqual(ClassificacaoRodada.objects.values('rodada').distinct().count(), 4)
+
+    def test_mesma_semente_gera_mesma_liga(self):
+        def placares():
+            return list(Jogo.objects.order_by('rodada', 'data_jogo').values_list(
+                'time_casa__nome', 'time_visitante__nome', 'gols_casa', 'gols_visitante'
+            ))
+
+        inicio = timezone.now()
+        gerar_liga(times=6, rodadas=5, semente=42, inicio=inicio)
+        primeira = placares()
+        Time.objects.all().delete()
+        gerar_liga(times=6, rodadas=5, semente=42, inicio=inicio)
+        self.assertEqual(placares(), primeira)
+        Time.objects.all().delete()
+        gerar_liga(times=6, rodadas=5, semente=7, inicio=inicio)
+        self.assertNotEqual(placares(), primeira)
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}})
+    def test_medicao_das_rotas(self):
+        gerar_liga(times=4, jogadores_por_time=3, rodadas=4, rodadas_realizadas=2)
+        resultados = medir_rotas(self.client, 'core.urls', kwargs=argumentos_rotas(), repeticoes=3)
+
+        tabela = next(r for r in resultados if r.rota == 'tabela')
+        self.assertEqual((tabela.status, tabela.consultas, tabela.orcamento), (200, 2, 2))
+        self.assertLessEqual(tabela.p50_ms, tabela.p95_ms)
+        self.assertGreater(tabela.pico_memoria_kb, 0)
+
+
+class CachePaginasTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a = Time.objects.create(nome='Alfa')
+        cls.b = Time.objects.create(nome='Beta')
+        cls.jogo = criar_jogo(cls.a, cls.b, 0, 0, realizado=False)
+
+    def setUp(self):
+        cache.clear()
+
+    def get_tabela(self):
+        with medir_consultas() as coletor:
+            response = self.client.get(reverse('tabela'))
+        return response, coletor.total
+
+    def test_leituras_entre_escritas_vem_do_cache(self):
+        response, consultas = self.get_tabela()
+        self.assertEqual(consultas, 2)
+        novamente, consultas = self.get_tabela()
+        self.assertEqual(consultas, 0)
+        self.assertEqual(novamente.content, response.content)
+
+    def test_resultado_lancado_invalida_a_pagina(self):
+        self.get_tabela()
+        antes = contribuicao(self.jogo)
+        self.jogo.realizado, self.jogo.gols_casa = True, 2
+        self.jogo.save()
+        atualizar_classificacao(antes, contribuicao(self.jogo))
+
+        response, consultas = self.get_tabela()
+        self.assertEqual(consultas, 2)
+        self.assertEqual(response.context['dados_times'][0].pontos, 3)
+
+    def test_escrita_sem_sinal_tambem_invalida(self):
+        # Como na ação do admin, que usa queryset.update()
+        self.get_tabela()
+        antes = contribuicao(self.jogo)
+        Jogo.objects.filter(pk=self.jogo.pk).update(realizado=True)
+        self.jogo.realizado = True
+        atualizar_classificacao(antes, contribuicao(self.jogo))
+
+        self.assertEqual(self.get_tabela()[1], 2)
+
+    def test_usuario_logado_nao_usa_cache(self):
+        self.client.force_login(User.objects.create_user('torcedor'))
+        self.client.get(reverse('tabela'))
+        with medir_consultas() as coletor:
+            self.client.get(reverse('tabela'))
+        self.assertGreater(coletor.total, 0)
+
+    def test_mudanca_de_versao_no_commit(self):
+        self.get_tabela()
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Time.objects.create(nome='Gama')
+        # Uma leitura concorrente antes do commit guarda a página na versão nova...
+        self.get_tabela()
+        self.assertEqual(self.get_tabela()[1], 0)
+        # ... e a troca no commit a descarta
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.get_tabela()[1], 2)
+
+
+class GetCondicionalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a = Time.objects.create(nome='Alfa')
+        cls.b = Time.objects.create(nome='Beta')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_etag_e_last_modified(self):
+        response = self.client.get(reverse('tabela'))
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', response)
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+    def test_304_sem_consultas_nem_renderizacao(self):
+        etag = self.client.get(reverse('lista_jogos'))['ETag']
+        with medir_consultas() as coletor:
+            response = self.client.get(reverse('lista_jogos'), headers={'if-none-match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(coletor.total, 0)
+        self.assertIsNone(response.context)
+
+    def test_if_modified_since(self):
+        modificado = self.client.get(reverse('tabela'))['Last-Modified']
+        response = self.client.get(reverse('tabela'), headers={'if-modified-since': modificado})
+        self.assertEqual(response.status_code, 304)
+
+    def test_escrita_muda_etag_e_data(self):
+        primeira = self.client.get(reverse('tabela'))
+        criar_jogo(self.a, self.b, 1, 0)
+
+        response = self.client.get(reverse('tabela'), headers={
+            'if-none-match': primeira['ETag'],
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], primeira['ETag'])
+        response = self.client.get(reverse('tabela'), headers={'if-modified-since': primeira['Last-Modified']})
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_depende_do_usuario(self):
+        anonimo = self.client.get(reverse('tabela'))['ETag']
+        self.client.force_login(User.objects.create_user('torcedor'))
+        response = self.client.get(reverse('tabela'), headers={'if-none-match': anonimo})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+
+
+class EventosAoVivoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a = Time.objects.create(nome='Alfa')
+        cls.b = Time.objects.create(nome='Beta')
+
+    def setUp(self):
+        eventos._barramento = None
+
+    async def test_stream_entrega_eventos_publicados_por_outra_thread(self):
+        response = await self.async_client.get(reverse('eventos_ao_vivo'))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        conteudo = response.streaming_content
+        self.assertEqual(await anext(conteudo), b'retry: 5000\n\n')
+
+        # Como uma view síncrona confirmando um resultado
+        proximo = asyncio.ensure_future(anext(conteudo))
+        await asyncio.sleep(0.05)
+        publicador = threading.Thread(target=eventos.barramento().publicar, args=('placar', {'jogo': 1, 'gols_casa': 2}))
+        publicador.start()
+        publicador.join()
+
+        evento = await asyncio.wait_for(proximo, 1)
+        self.assertEqual(evento.decode(), 'id: 1\nevent: placar\ndata: {"jogo": 1, "gols_casa": 2}\n\n')
+        self.assertEqual(eventos.barramento().total_assinantes, 1)
+
+        # Cliente desconecta: o servidor cancela a tarefa do stream
+        proximo = asyncio.ensure_future(anext(conteudo))
+        await asyncio.sleep(0.05)
+        proximo.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await proximo
+        self.assertEqual(eventos.barramento().total_assinantes, 0)
+
+    def test_reconexao_recebe_apenas_o_que_perdeu(self):
+        bus = eventos.barramento()
+        primeiro = bus.publicar('gol', {'gol': 1})
+        bus.publicar('gol', {'gol': 2})
+
+        response = self.client.get(reverse('eventos_ao_vivo'), headers={'last-event-id': str(primeiro.id)})
+        conteudo = b''.join(response.streaming_content).decode()
+        self.assertNotIn('"gol": 1', conteudo)
+        self.assertIn('id: 2\nevent: gol\ndata: {"gol": 2}', conteudo)
+
+    def test_eventos_publicados_no_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            criar_jogo(self.a, self.b, 0, 0, realizado=False)
+        self.assertEqual(eventos.barramento().recentes(0), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            jogo = criar_jogo(self.a, self.b, 2, 1)
+            jogador = Jogador.objects.create(nome='Camisa 9', time=self.a, posicao='ATA')
+            Gol.objects.create(jogo=jogo, jogador=jogador, time=self.a, minuto=12)
+
+        placar, gol = eventos.barramento().recentes(0)
+        self.assertEqual((placar.tipo, placar.dados['gols_casa'], placar.dados['time_visitante']), ('placar', 2, 'Beta'))
+        self.assertEqual((gol.tipo, gol.dados['jogador'], gol.dados['minuto']), ('gol', 'Camisa 9', 12))
+
+    def test_placar_so_transmitido_quando_muda(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            jogo = criar_jogo(self.a, self.b, 0, 0, realizado=False)
+            jogo.local = 'Estádio Novo'
+            jogo.save()
+            jogo.gols_casa = 1
+            jogo.save()
+        self.assertEqual(eventos.barramento().recentes(0), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            jogo.realizado = True
+            jogo.save()
+            jogo.data_jogo -= timedelta(hours=1)
+            jogo.save()
+        self.assertEqual([evento.dados['gols_casa'] for evento in eventos.barramento().recentes(0)], [1])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            jogo.gols_visitante = 3
+            jogo.save()
+        self.assertEqual([evento.dados['gols_visitante'] for evento in eventos.barramento().recentes(0)], [0, 3])
+
+    async def test_metricas_sob_asgi(self):
+        response = await self.async_client.get(reverse('tabela'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('desc="2 consultas"', response['Server-Timing'])
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        gerar_liga(times=6, jogadores_por_time=5, rodadas=10, rodadas_realizadas=6)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_rotas_da_api_dentro_do_orcamento(self):
+        verificar_orcamentos(self, 'core.urls_api', 'api:')
+
+    def test_tabela_igual_a_pagina(self):
+        dados = self.client.get(reverse('api:tabela')).json()
+        esperado = [linha.time_id for linha in Classificacao.objects.all()]
+        self.assertEqual([linha['time_id'] for linha in dados['resultados']], esperado)
+        self.assertEqual(dados['resultados'][0]['posicao'], 1)
+
+        dados = self.client.get(reverse('api:tabela'), {'rodada': 3}).json()
+        self.assertEqual(dados['rodada'], 3)
+        self.assertEqual(max(linha['jogos'] for linha in dados['resultados']), 3)
+        self.assertEqual(self.client.get(reverse('api:tabela'), {'rodada': 0}).status_code, 404)
+
+    def test_paginacao_por_cursor_percorre_tudo(self):
+        vistos, cursor = [], None
+        while True:
+            params = {'limite': 7, 'rodada': '', **({'cursor': cursor} if cursor else {})}
+            dados = self.client.get(reverse('api:jogos'), params).json()
+            self.assertLessEqual(len(dados['resultados']), 7)
+            vistos += [jogo['id'] for jogo in dados['resultados']]
+            cursor = dados['proximo']
+            if cursor is None:
+                break
+        esperado = list(Jogo.objects.order_by('-data_jogo', '-id').values_list('id', flat=True))
+        self.assertEqual(vistos, esperado)
+
+    def test_cursor_adulterado(self):
+        for rota, valores in (('api:jogos', ['x', 'y']), ('api:jogos', [None, 1]), ('api:artilharia', [[1], 'Nome', 'z'])):
+            with self.subTest(rota=rota, valores=valores):
+                response = self.client.get(reverse(rota), {'cursor': codificar_cursor(valores)})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'erro': 'Cursor inválido.'})
+        # Ilegível (não é base64 de JSON): volta para a primeira página
+        self.assertEqual(self.client.get(reverse('api:jogos'), {'cursor': '%%%'}).status_code, 200)
+
+    def test_artilharia_paginada_na_ordem_do_ranking(self):
+        esperado = list(artilheiros().values_list('id', flat=True))
+        primeira = self.client.get(reverse('api:artilharia'), {'limite': 5}).json()
+        segunda = self.client.get(reverse('api:artilharia'), {'limite': 100, 'cursor': primeira['proximo']}).json()
+        vistos = [linha['id'] for linha in primeira['resultados'] + segunda['resultados']]
+        self.assertEqual(vistos, esperado)
+
+        time = Time.objects.first()
+        primeira = self.client.get(reverse('api:artilharia'), {'time': time.id, 'limite': 2}).json()
+        segunda = self.client.get(reverse('api:artilharia'), {'time': time.id, 'cursor': primeira['proximo']}).json()
+        vistos = [linha['id'] for linha in primeira['resultados'] + segunda['resultados']]
+        self.assertEqual(vistos, list(artilheiros(time).values_list('id', flat=True)))
+
+    def test_detalhe_do_time(self):
+        time = Time.objects.select_related('classificacao').first()
+        dados = self.client.get(reverse('api:detalhe_time', args=[time.id])).json()
+        self.assertEqual(dados['nome'], time.nome)
+        self.assertEqual(dados['campanha']['pontos'], time.classificacao.pontos)
+        self.assertEqual(len(dados['elenco']), time.jogadores.filter(ativo=True).count())
+
+        response = self.client.get(reverse('api:detalhe_time', args=[0]))
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('erro', response.json())
+
+    def test_gzip_e_get_condicional(self):
+        response = self.client.get(reverse('api:jogos'), headers={'accept-encoding': 'gzip'})
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+        with medir_consultas() as coletor:
+            response = self.client.get(reverse('api:jogos'), headers={'if-none-match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(coletor.total, 0)
+
+        # ETag da API não vale para a página HTML da mesma versão
+        response = self.client.get(reverse('tabela'), headers={'if-none-match': response['ETag']})
+        self.assertEqual(response.status_code, 200)
+
+    async def test_sob_asgi(self):
+        response = await self.async_client.get(reverse('api:jogos'), {'rodada': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({jogo['rodada'] for jogo in response.json()['resultados']}, {1})
+
+
+def imagem_png(nome='logo.png', tamanho=(600, 400), cor='red'):
+    saida = BytesIO()
+    Image.new('RGBA', tamanho, cor).save(saida, 'PNG')
+    return SimpleUploadedFile(nome, saida.getvalue(), content_type='image/png')
+
+
+class MiniaturasTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        configuracao = override_settings(MEDIA_ROOT=self.media)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+    def test_miniaturas_por_conteudo(self):
+        assinatura = gerar_miniaturas(imagem_png())
+        self.assertEqual(gerar_miniaturas(imagem_png('outro_nome.png')), assinatura)
+        self.assertNotEqual(gerar_miniaturas(imagem_png(cor='blue')), assinatura)
+
+        with Image.open(f'{self.media}/{caminho_miniatura(assinatura, 64, "webp")}') as miniatura:
+            self.assertEqual((miniatura.format, miniatura.size), ('WEBP', (64, 43)))
+        with Image.open(f'{self.media}/{caminho_miniatura(assinatura, TAMANHOS[-1], "png")}') as miniatura:
+            self.assertEqual(miniatura.size, (320, 213))
+
+        self.assertEqual(gerar_miniaturas(SimpleUploadedFile('logo.png', b'nao e imagem')), '')
+
+    def test_foto_recortada_em_quadrado(self):
+        time = Time.objects.create(nome='Alfa')
+        jogador = Jogador(nome='Camisa 10', time=time, posicao='MEI', foto=imagem_png('foto.png'))
+        assinatura = atualizar_miniaturas(jogador, 'foto')
+        self.assertEqual(jogador.foto_assinatura, assinatura)
+        with Image.open(f'{self.media}/{caminho_miniatura(assinatura, 96, "png")}') as miniatura:
+            self.assertEqual(miniatura.size, (96, 96))
+
+    def test_tag_emite_srcset(self):
+        template = Template('{% load imagens %}{% miniatura time.logo 30 class="logo" alt=time.nome %}')
+        time = Time.objects.create(nome='Alfa & Cia', logo=imagem_png())
+
+        html = template.render(Context({'time': time}))
+        self.assertEqual(html, f'<img src="{time.logo.url}" class="logo" alt="Alfa &amp; Cia">')
+
+        call_command('generate_thumbnails', stdout=StringIO())
+        time.refresh_from_db()
+        html = template.render(Context({'time': time}))
+        assinatura = time.logo_assinatura
+        self.assertIn(
+            f'<source type="image/webp" srcset="/media/{caminho_miniatura(assinatura, 32, "webp")} 1x, '
+            f'/media/{caminho_miniatura(assinatura, 64, "webp")} 2x">', html
+        )
+        self.assertIn(f'<img src="/media/{caminho_miniatura(assinatura, 32, "png")}"', html)
+        self.assertIn('class="logo" alt="Alfa &amp; Cia"></picture>', html)
+
+    def test_generate_thumbnails_check(self):
+        Time.objects.create(nome='Alfa', logo=imagem_png())
+        Time.objects.create(nome='Sem logo')
+        with self.assertRaisesMessage(CommandError, '1 imagem(ns) sem miniaturas.'):
+            call_command('generate_thumbnails', check=True, stdout=StringIO())
+
+        call_command('generate_thumbnails', stdout=StringIO())
+        saida = StringIO()
+        call_command('generate_thumbnails', check=True, stdout=saida)
+        self.assertIn('Todas as imagens têm miniaturas.', saida.getvalue())
+
+
+@tarefa
+def criar_time(nome):
+    if nome == 'erro':
+        raise ValueError('nome inválido')
+    Time.objects.create(nome=nome)
+
+
+@tarefa(visibilidade=timedelta(hours=1))
+def tarefa_longa():
+    pass
+
+
+def rodar_worker():
+    saida = StringIO()
+    call_command('run_worker', processos=0, uma_vez=True, stdout=saida)
+    return saida.getvalue()
+
+
+class FilaTarefasTests(TestCase):
+    def test_executa_em_ordem_e_conclui(self):
+        enfileirar(criar_time, 'Alfa')
+        enfileirar(criar_time, nome='Beta')
+        enfileirar(criar_time, 'Depois', atraso=timedelta(hours=1))
+
+        self.assertIn('2 tarefa(s) concluída(s), 0 com erro.', rodar_worker())
+        self.assertEqual(list(Time.objects.values_list('nome', flat=True)), ['Alfa', 'Beta'])
+        self.assertEqual(Tarefa.objects.filter(estado=Tarefa.CONCLUIDA).count(), 2)
+        self.assertEqual(resumo_fila().pendentes, 1)
+
+    def test_chave_de_idempotencia(self):
+        primeira = enfileirar(criar_time, 'Alfa', chave='time:alfa')
+        self.assertEqual(enfileirar(criar_time, 'Alfa', chave='time:alfa'), primeira)
+        rodar_worker()
+        enfileirar(criar_time, 'Alfa', chave='time:alfa')
+        rodar_worker()
+        self.assertEqual(Time.objects.filter(nome='Alfa').count(), 1)
+
+    def test_novas_tentativas_e_falha(self):
+        obj = enfileirar(criar_time, 'erro', max_tentativas=2)
+        [tarefa_id] = reservar(10)
+        self.assertFalse(executar(tarefa_id))
+        obj.refresh_from_db()
+        self.assertEqual((obj.estado, obj.tentativas), (Tarefa.PENDENTE, 1))
+        self.assertIn('ValueError: nome inválido', obj.erro)
+        self.assertGreaterEqual(obj.executar_em, timezone.now() + ATRASO_TENTATIVA - timedelta(seconds=1))
+        self.assertEqual(reservar(10), [])
+
+        Tarefa.objects.update(executar_em=timezone.now())
+        self.assertIn('0 tarefa(s) concluída(s), 1 com erro.', rodar_worker())
+        obj.refresh_from_db()
+        self.assertEqual((obj.estado, obj.tentativas), (Tarefa.FALHOU, 2))
+        self.assertEqual(resumo_fila().falhas, 1)
+
+    def test_tarefa_de_worker_interrompido_volta_para_a_fila(self):
+        enfileirar(criar_time, 'Alfa')
+        [tarefa_id] = reservar(10)
+        self.assertEqual(reservar(10), [])
+        Tarefa.objects.update(
+            iniciada_em=F('iniciada_em') - VISIBILIDADE, reservada_ate=F('reservada_ate') - VISIBILIDADE,
+        )
+        self.assertEqual(reservar(10), [tarefa_id])
+
+    def test_visibilidade_por_tarefa(self):
+        enfileirar(tarefa_longa)
+        [tarefa_id] = reservar(10)
+        obj = Tarefa.objects.get()
+        self.assertEqual(obj.reservada_ate - obj.iniciada_em, timedelta(hours=1))
+
+        # Passados os 5 minutos padrão, a tarefa longa continua reservada
+        Tarefa.objects.update(
+            iniciada_em=F('iniciada_em') - VISIBILIDADE * 2, reservada_ate=F('reservada_ate') - VISIBILIDADE * 2,
+        )
+        self.assertEqual(reservar(10), [])
+        Tarefa.objects.update(reservada_ate=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(reservar(10), [tarefa_id])
+        self.assertGreater(calcular_probabilidades.visibilidade, VISIBILIDADE)
+
+    def test_somente_funcoes_marcadas(self):
+        Tarefa.objects.create(nome='os.remove', argumentos={'args': ['/tmp/x']}, max_tentativas=1)
+        rodar_worker()
+        self.assertIn('não é uma tarefa', Tarefa.objects.get().erro)
+
+    def test_status(self):
+        enfileirar(criar_time, 'Alfa')
+        saida = StringIO()
+        call_command('run_worker', status=True, stdout=saida)
+        self.assertIn('Pendentes: 1  Executando: 0  Falhas: 0', saida.getvalue())
+
+
+def arquivo(texto):
+    return BytesIO(texto.encode())
+
+
+class ImportacaoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a = Time.objects.create(nome='Alfa')
+        cls.b = Time.objects.create(nome='Beta')
+
+    def test_jogos_e_resultados_em_csv(self):
+        relatorio = importacao.importar(arquivo(
+            'rodada,time_casa,time_visitante,data_jogo,local\n'
+            '1,alfa,Beta,10/02/2026 16:00,Estádio A\n'
+            '2,Beta,Alfa,2026-02-17T16:00,\n'
+            '3,Alfa,Gama,2026-02-24,\n'
+            '4,Alfa,Alfa,2026-03-01,\n'
+            'x,Alfa,Beta,2026-03-01,\n'
+        ), 'jogos', 'csv', tamanho_lote=1)
+        self.assertEqual((relatorio.linhas, relatorio.criados, relatorio.total_erros), (5, 2, 3))
+        self.assertEqual([linha for linha, _ in relatorio.erros], [4, 5, 6])
+        self.assertIn('Time "Gama" não encontrado.', relatorio.erros[0][1])
+        jogo = Jogo.objects.get(rodada=1)
+        self.assertEqual((jogo.local, jogo.realizado), ('Estádio A', False))
+        self.assertEqual(timezone.localtime(jogo.data_jogo).hour, 16)
+
+        # Só placares: atualiza os jogos existentes e mantém data e local
+        relatorio = importacao.importar(arquivo(
+            'rodada,time_casa,time_visitante,gols_casa,gols_visitante\n'
+            '1,Alfa,Beta,2,0\n'
+            '5,Alfa,Beta,1,1\n'
+        ), 'jogos', 'csv')
+        self.assertEqual((relatorio.criados, relatorio.atualizados), (0, 1))
+        self.assertEqual(relatorio.erros, [(3, '"data_jogo" é obrigatório para cadastrar.')])
+        jogo.refresh_from_db()
+        self.assertEqual((jogo.gols_casa, jogo.local, jogo.realizado), (2, 'Estádio A', True))
+        self.assertEqual(reconstruir_classificacao(gravar=False), [])
+        self.assertEqual(Classificacao.objects.get(time=self.a).pontos, 3)
+
+    def test_elenco_em_json_lido_em_blocos(self):
+        self.addCleanup(setattr, importacao, 'BLOCO_JSON', importacao.BLOCO_JSON)
+        importacao.BLOCO_JSON = 7
+        Jogador.objects.create(nome='Camisa 9', time=self.a, posicao='ATA', numero=9)
+        registros = [
+            {'nome': 'Camisa 9', 'time': 'Alfa', 'numero': 19},
+            {'nome': 'Goleiro', 'time': 'Beta', 'posicao': 'Goleiro', 'ativo': 'não'},
+            {'nome': 'Sem posição', 'time': 'Beta'},
+            ['não é objeto'],
+        ]
+        relatorio = importacao.importar(arquivo(json.dumps(registros, ensure_ascii=False)), 'jogadores', 'json')
+        self.assertEqual((relatorio.criados, relatorio.atualizados), (1, 1))
+        self.assertEqual([linha for linha, _ in relatorio.erros], [4, 3])
+        self.assertEqual(Jogador.objects.get(nome='Camisa 9').numero, 19)
+        goleiro = Jogador.objects.get(nome='Goleiro')
+        self.assertEqual((goleiro.posicao, goleiro.ativo, goleiro.nacionalidade), ('GOL', False, 'Brasileiro'))
+
+        linhas = '{"nome": "Gama"}\n{"nome": "alfa"}\n{"nome": "Delta"}\n'
+        relatorio = importacao.importar(arquivo(linhas), 'times', 'json')
+        self.assertEqual((relatorio.criados, relatorio.atualizados), (2, 1))
+        self.assertEqual(Classificacao.objects.count(), 4)
+
+        with self.assertRaises(importacao.ArquivoInvalido):
+            importacao.importar(arquivo('[{"nome": "Épsilon"}, {"nome": '), 'times', 'json')
+
+    def test_comando_check_nao_grava(self):
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta)
+        caminho = os.path.join(pasta, 'times.csv')
+        with open(caminho, 'w', encoding='utf-8') as saida:
+            saida.write('nome\nGama\n\n,\n')
+
+        with self.assertRaisesMessage(CommandError, '1 novo(s) e 0 atualizado(s) a gravar, 1 com erro.'):
+            call_command('import_data', caminho, tipo='times', check=True, stdout=StringIO())
+        self.assertFalse(Time.objects.filter(nome='Gama').exists())
+
+        saida = StringIO()
+        call_command('import_data', caminho, tipo='times', stdout=saida)
+        self.assertIn('Linha 4: "nome" é obrigatório.', saida.getvalue())
+        self.assertTrue(Time.objects.filter(nome='Gama').exists())
+
+
+class ExportacaoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a = Time.objects.create(nome='Alfa')
+        cls.b = Time.objects.create(nome='Beta')
+        for rodada in range(1, 6):
+            criar_jogo(cls.a, cls.b, rodada, 0, rodada=rodada)
+
+    def test_comando_em_blocos_reimportavel(self):
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta)
+        caminho = os.path.join(pasta, 'jogos.csv')
+        call_command('export_data', 'jogos', saida=caminho, bloco=2, rodada='3', stderr=StringIO())
+        with open(caminho, encoding='utf-8') as arquivo:
+            linhas = arquivo.read().splitlines()
+        self.assertEqual(len(linhas), 2)
+
+        # Sem filtro, em blocos de 2 linhas; o CSV volta pelo import_data sem mudanças
+        saida = StringIO()
+        call_command('export_data', 'jogos', bloco=2, stdout=saida)
+        self.assertEqual(len(saida.getvalue().splitlines()), 6)
+        relatorio = importacao.importar(BytesIO(saida.getvalue().encode()), 'jogos', 'csv')
+        self.assertEqual((relatorio.criados, relatorio.atualizados, relatorio.total_erros), (0, 5, 0))
+
+    def test_memoria_nao_depende_do_tamanho_da_tabela(self):
+        def pico(formato):
+            tracemalloc.start()
+            for _ in exportacao.exportar('jogos', formato, tamanho=50):
+                pass
+            _, maximo = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return maximo
+
+        def criar(quantidade):
+            Jogo.objects.bulk_create(
+                Jogo(time_casa=self.a, time_visitante=self.b, data_jogo=timezone.now(), rodada=6)
+                for _ in range(quantidade)
+            )
+
+        criar(200)
+        antes = {formato: pico(formato) for formato in ('csv', 'jsonl')}
+        criar(4000)
+        for formato, maximo in antes.items():
+            self.assertLess(pico(formato), maximo * 1.5)
+
+    def test_opcoes_invalidas(self):
+        with self.assertRaisesMessage(CommandError, 'positivo'):
+            call_command('export_data', 'gols', bloco=0)
+        if exportacao.pyarrow is None:
+            with self.assertRaisesMessage(CommandError, 'pyarrow'):
+                call_command('export_data', 'gols', formato='arrow')
+
+
+class CalendarioTests(TestCase):
+    def test_restricoes_de_mando(self):
+        inicio = timezone.now()
+        for quantidade in (4, 5, 19, 20):
+            times = [Time(id=i, nome=f'Time {i}') for i in range(1, quantidade + 1)]
+            calendario = gerar_calendario(times, inicio, semente=quantidade)
+            partidas = calendario.partidas
+            self.assertEqual(calendario.avisos, [])
+            self.assertEqual(calendario.rodadas, 2 * (quantidade - 1 + quantidade % 2))
+            self.assertEqual(len({(p.casa.id, p.visitante.id) for p in partidas}), quantidade * (quantidade - 1))
+
+            mandos = {time.id: '' for time in times}
+            for rodada, _, jogos in calendario.por_rodada():
+                envolvidos = [time.id for p in jogos for time in (p.casa, p.visitante)]
+                self.assertEqual(len(envolvidos), len(set(envolvidos)))
+                for p in jogos:
+                    mandos[p.casa.id] += 'C'
+                    mandos[p.visitante.id] += 'F'
+            for sequencia in mandos.values():
+                self.assertNotIn('CCC', sequencia)
+                self.assertNotIn('FFF', sequencia)
+
+    def test_gravacao_em_lote(self):
+        times = [Time.objects.create(nome=f'Time {i}') for i in range(20)]
+        calendario = gerar_calendario(times, timezone.now(), turnos=1)
+        with medir_consultas() as coletor:
+            gravar_calendario(calendario)
+        # Um INSERT por lote (o SQLite limita as variáveis por comando) e o savepoint
+        self.assertLessEqual(coletor.total, 4)
+        self.assertEqual(Jogo.objects.count(), 190)
+        self.assertEqual(Jogo.objects.aggregate(Max('rodada'))['rodada__max'], 19)
+
+
+class SimulacaoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.times = [Time.objects.create(nome=nome) for nome in ('Alfa', 'Beta', 'Gama', 'Delta')]
+        a, b, c, d = cls.times
+        # Alfa dispara na frente; falta o returno inteiro
+        for rodada, (casa, fora, gc, gf) in enumerate([
+            (a, b, 5, 0), (c, d, 1, 1), (a, c, 4, 0), (b, d, 1, 0), (a, d, 6, 0), (b, c, 0, 2),
+        ]):
+            criar_jogo(casa, fora, gc, gf, rodada=rodada // 2 + 1)
+        for casa, fora in ((b, a), (d, c), (c, a), (d, b), (d, a), (c, b)):
+            criar_jogo(casa, fora, 0, 0, rodada=4, realizado=False)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_motores_numpy_e_python(self):
+        base = [(12, 4, 15, 15), (3, 1, -4, 1), (4, 1, -1, 3), (1, 0, -10, 1)]
+        jogos = [(1, 0, 1.0, 1.5), (3, 2, 1.2, 1.0), (2, 0, 1.0, 1.5)]
+        motores = [montecarlo._simular_python]
+        if montecarlo.numpy is not None:
+            motores.append(montecarlo._simular_numpy)
+        for motor in motores:
+            with self.subTest(motor=motor.__name__):
+                contagem, pontos = motor(base, jogos, 3000, 7)
+                # Cada simulação põe cada time em exatamente uma posição
+                self.assertEqual([sum(linha) for linha in contagem], [3000] * 4)
+                self.assertEqual([sum(coluna) for coluna in zip(*contagem)], [3000] * 4)
+                # Alfa é campeão mesmo perdendo tudo que falta
+                self.assertEqual(contagem[0][0], 3000)
+                self.assertGreater(pontos[0], 12 * 3000)
+
+    @unittest.skipIf(montecarlo.numpy is None, 'numpy não instalado')
+    def test_numpy_concorda_com_python(self):
+        base = [(3, 1, 1, 2), (3, 1, 1, 1), (1, 0, 0, 1), (0, 0, -2, 0)]
+        jogos = [(0, 1, 1.4, 1.1), (2, 3, 1.4, 1.1), (0, 2, 1.4, 1.1), (1, 3, 1.4, 1.1)]
+        simulacoes = 20_000
+        # Com o numpy instalado, ``simular`` usa o motor vetorizado
+        self.assertEqual(montecarlo.simular(base, jogos, simulacoes, 3), montecarlo._simular_numpy(base, jogos, simulacoes, 3))
+
+        contagem_numpy, pontos_numpy = montecarlo._simular_numpy(base, jogos, simulacoes, 3)
+        contagem_python, pontos_python = montecarlo._simular_python(base, jogos, simulacoes, 3)
+        for time in range(len(base)):
+            self.assertAlmostEqual(pontos_numpy[time] / simulacoes, pontos_python[time] / simulacoes, delta=0.05)
+            for posicao in range(len(base)):
+                self.assertAlmostEqual(
+                    contagem_numpy[time][posicao] / simulacoes, contagem_python[time][posicao] / simulacoes, delta=0.02,
+                )
+
+    def test_empate_total_decidido_pelo_nome_como_na_tabela(self):
+        # Os motores põem à frente o menor índice, que a simulação dá ao primeiro nome
+        motores = [montecarlo._simular_python]
+        if montecarlo.numpy is not None:
+            motores.append(montecarlo._simular_numpy)
+        for motor in motores:
+            with self.subTest(motor=motor.__name__):
+                contagem, _ = motor([(1, 0, 0, 1)] * 3, [], 500, 3)
+                self.assertEqual(contagem, [[500, 0, 0], [0, 500, 0], [0, 0, 500]])
+
+        Jogo.objects.all().delete()
+        zeta, omega = Time.objects.create(nome='Zeta'), Time.objects.create(nome='Omega')
+        criar_jogo(zeta, omega, 1, 1)
+        reconstruir_classificacao()
+        tabela = [linha.time.nome for linha in Classificacao.objects.select_related('time')][:2]
+        linhas = {linha.nome: linha for linha in simular_temporada(500, semente=1).linhas}
+        self.assertEqual(tabela, ['Omega', 'Zeta'])
+        self.assertEqual((linhas['Omega'].posicoes[0], linhas['Zeta'].posicoes[1]), (100, 100))
+
+    def test_probabilidades(self):
+        simulacao = simular_temporada(2000, semente=1)
+        self.assertEqual(simulacao.jogos_restantes, 6)
+        linhas = {linha.nome: linha for linha in simulacao.linhas}
+        self.assertEqual(simulacao.linhas[0].nome, 'Alfa')
+        self.assertGreater(linhas['Alfa'].titulo, 50)
+        self.assertAlmostEqual(sum(linha.titulo for linha in simulacao.linhas), 100)
+        for linha in simulacao.linhas:
+            self.assertAlmostEqual(sum(linha.posicoes), 100)
+            self.assertGreaterEqual(linha.pontos_esperados, linha.pontos)
+
+    @override_settings(SIMULACAO_QUANTIDADE=2000)
+    def test_pagina_enfileira_e_mostra_resultado(self):
+        response = self.client.get(reverse('probabilidades'))
+        self.assertContains(response, 'sendo calculada')
+        self.assertEqual(Tarefa.objects.filter(nome='core.simulacao.calcular_probabilidades').count(), 1)
+        # Recarregar antes do worker não enfileira de novo
+        self.client.get(reverse('probabilidades'))
+        self.assertEqual(Tarefa.objects.count(), 1)
+
+        rodar_worker()
+        response = self.client.get(reverse('probabilidades'))
+        self.assertNotContains(response, 'sendo calculada')
+        self.assertContains(response, 'Alfa')
+        self.assertEqual(response.context['simulacao'].simulacoes, 2000)
+
+        # Um resultado novo agenda a simulação no commit, no lugar da concluída;
+        # a página mostra a anterior enquanto recalcula, sem escrever no banco
+        with self.captureOnCommitCallbacks(execute=True):
+            Jogo.objects.filter(realizado=False).first().delete()
+        self.assertEqual(list(Tarefa.objects.values_list('chave', 'estado')), [(f'simulacao:{versao_dados()}', Tarefa.PENDENTE)])
+        with medir_consultas() as coletor:
+            response = self.client.get(reverse('probabilidades'))
+        self.assertTrue(all(sql.lstrip().startswith('SELECT') for sql in coletor.impressoes))
+        self.assertContains(response, 'Resultados novos em cálculo')
+        self.assertEqual(response.context['simulacao'].jogos_restantes, 6)
+
+        rodar_worker()
+        self.assertEqual(self.client.get(reverse('probabilidades')).context['simulacao'].jogos_restantes, 5)
+
+
+class EloTests(TestCase):
+    def test_variacao(self):
+        # Vantagem de jogar em casa: entre iguais, o mandante é favorito
+        self.assertGreater(esperado(1500, 1500), 0.5)
+        self.assertLess(variacao(1500, 1500, 1, 1), 0)
+        self.assertGreater(variacao(1500, 1500, 1, 0), 0)
+        # Goleada vale mais; zebra vale mais que vitória do favorito
+        self.assertGreater(variacao(1500, 1500, 4, 0), variacao(1500, 1500, 1, 0))
+        self.assertGreater(variacao(1400, 1600, 1, 0), variacao(1600, 1400, 1, 0))
+
+    def test_reconstrucao_e_grafico(self):
+        a = Time.objects.create(nome='Alfa')
+        b = Time.objects.create(nome='Beta')
+        for rodada, placar in enumerate([(2, 0), (1, 1), (3, 1)], start=1):
+            criar_jogo(a, b, *placar, rodada=rodada)
+        call_command('rebuild_elo', stdout=StringIO())
+        self.assertEqual(EloJogo.objects.count(), 6)
+        a.refresh_from_db()
+        b.refresh_from_db()
+        self.assertGreater(a.elo, ELO_INICIAL)
+        self.assertAlmostEqual(a.elo + b.elo, 2 * ELO_INICIAL)
+        self.assertEqual(EloJogo.objects.filter(time=a).order_by('data_jogo').last().elo, a.elo)
+
+        response = self.client.get(reverse('detalhe_time', args=[a.id]))
+        self.assertContains(response, 'Rating Elo')
+        self.assertEqual(len(response.context['grafico_elo'].pontos), 4)
+
+
+class BuscaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.sao_paulo = Time.objects.create(nome='São Paulo')
+        cls.santos = Time.objects.create(nome='Santos')
+        cls.lucas = Jogador.objects.create(nome='Lucas Moura', time=cls.sao_paulo, posicao='MEI')
+        cls.paulo = Jogador.objects.create(nome='Paulo Henrique', time=cls.santos, posicao='LAT')
+
+    def nomes(self, texto):
+        return [(resultado.tipo, resultado.nome) for resultado in busca.buscar(texto)]
+
+    def exigir_fts(self):
+        if not busca.fts_disponivel():
+            self.skipTest('SQLite sem FTS5')
+
+    def test_prefixo_sem_acento_e_relevancia(self):
+        self.exigir_fts()
+        # O time com o nome buscado vem antes do jogador que só joga nele
+        self.assertEqual(self.nomes('sao pau'), [('time', 'São Paulo'), ('jogador', 'Lucas Moura')])
+        self.assertEqual(self.nomes('SÃO'), [('time', 'São Paulo'), ('jogador', 'Lucas Moura')])
+        resultados = self.nomes('paulo')
+        self.assertEqual(set(resultados[:2]), {('time', 'São Paulo'), ('jogador', 'Paulo Henrique')})
+        self.assertEqual(resultados[2], ('jogador', 'Lucas Moura'))
+        self.assertEqual(self.nomes('luc são'), [('jogador', 'Lucas Moura')])
+        self.assertEqual(self.nomes('" OR *'), [])
+        self.assertEqual(self.nomes('  '), [])
+
+    def test_indice_acompanha_as_escritas(self):
+        self.exigir_fts()
+        Time.objects.filter(id=self.santos.id).update(nome='Santos Futebol Clube')
+        self.assertIn(('jogador', 'Paulo Henrique'), self.nomes('futebol'))
+        Jogador.objects.bulk_create([Jogador(nome='Éder Militão', time=self.santos, posicao='ZAG')])
+        self.assertEqual(self.nomes('eder'), [('jogador', 'Éder Militão')])
+        self.lucas.time = self.santos
+        self.lucas.save()
+        self.assertEqual(self.nomes('lucas santos'), [('jogador', 'Lucas Moura')])
+        self.santos.delete()
+        self.assertEqual(self.nomes('santos'), [])
+        self.assertEqual(self.nomes('paulo'), [('time', 'São Paulo')])
+
+    def test_sem_fts(self):
+        resultados = busca._buscar_sem_fts('Paulo', 10)
+        self.assertEqual([r.nome for r in resultados], ['Paulo Henrique', 'São Paulo', 'Lucas Moura'])
+        self.assertEqual(
+            set(Jogador.objects.filter(busca._filtro_sem_fts('santos'))), {self.paulo}
+        )
+
+    def test_endpoint_de_autocompletar(self):
+        cache.clear()
+        dados = self.client.get(reverse('api:busca'), {'q': 'Santos'}).json()
+        primeiro = dados['resultados'][0]
+        self.assertEqual((primeiro['tipo'], primeiro['nome']), ('time', 'Santos'))
+        self.assertEqual(primeiro['url'], reverse('detalhe_time', args=[self.santos.id]))
+        self.assertEqual(self.client.get(reverse('api:busca')).json(), {'resultados': []})
+
+
+
+class PerfilSqliteTests(TransactionTestCase):
+    # Fora da transação do TestCase: a cópia do benchmark (API de backup)
+    # esperaria para sempre pela transação aberta no banco de origem
+
+    def nova_conexao(self, caminho):
+        configuracao = dict(connection.settings_dict, NAME=caminho)
+        conexao = type(connections['default'])(configuracao, 'perfil')
+        conexao.ensure_connection()
+        self.addCleanup(conexao.close)
+        return conexao
+
+    def pragma(self, conexao, nome):
+        return conexao.connection.execute(f'PRAGMA {nome}').fetchone()[0]
+
+    def test_producao_aplica_pragmas_em_cada_conexao(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Só para o SQLite')
+        pasta = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, pasta)
+
+        padrao = self.nova_conexao(os.path.join(pasta, 'padrao.sqlite3'))
+        self.assertEqual(self.pragma(padrao, 'journal_mode'), 'delete')
+        with override_settings(SQLITE_PERFIL='producao'):
+            producao = self.nova_conexao(os.path.join(pasta, 'producao.sqlite3'))
+        self.assertEqual(self.pragma(producao, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(producao, 'busy_timeout'), 5000)
+        self.assertEqual(self.pragma(producao, 'synchronous'), 1)
+
+        with override_settings(SQLITE_PERFIL='turbo'), self.assertRaises(ImproperlyConfigured):
+            self.nova_conexao(os.path.join(pasta, 'turbo.sqlite3'))
+
+    def test_benchmark_compara_os_perfis(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Só para o SQLite')
+        a, b = Time.objects.create(nome='Alfa'), Time.objects.create(nome='Beta')
+        criar_jogo(a, b, 1, 0)
+        saida = StringIO()
+        call_command('benchmark_sqlite', duracao=0.2, escrita_ms=1, leitores=1, escritores=1, stdout=saida)
+        linhas = saida.getvalue().splitlines()
+        self.assertEqual([linha.split()[0] for linha in linhas[1:]], ['padrao', 'producao'])
+
+
+class CacheCompartilhadoTests(TransactionTestCase):
+    def test_comando_em_outro_processo_invalida_as_paginas(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Só para o SQLite')
+        a, b = Time.objects.create(nome='Alfa'), Time.objects.create(nome='Beta')
+        criar_jogo(a, b, 2, 1)
+        cache.clear()
+        etag = self.client.get(reverse('tabela'))['ETag']
+        versao = versao_dados()
+        self.assertEqual(self.client.get(reverse('tabela'), HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        manage_em_outro_processo('rebuild_standings')
+        self.assertNotEqual(versao_dados(), versao)
+        response = self.client.get(reverse('tabela'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_simulacao_do_worker_em_outro_processo(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Só para o SQLite')
+        a, b = Time.objects.create(nome='Alfa'), Time.objects.create(nome='Beta')
+        criar_jogo(a, b, 2, 1)
+        criar_jogo(b, a, 0, 0, rodada=2, realizado=False)
+        cache.clear()
+        self.assertEqual(probabilidades_atuais(), (None, False))
+
+        manage_em_outro_processo('run_worker', '--processos', '0', '--uma-vez')
+        simulacao, atualizada = probabilidades_atuais()
+        self.assertTrue(atualizada)
+        self.assertEqual([linha.nome for linha in simulacao.linhas], ['Alfa', 'Beta'])
+
+
+class ReplicaLeituraTests(TransactionTestCase):
+    """
+    Primário e réplica em dois arquivos SQLite. A réplica só recebe os dados
+    quando o teste chama ``replicar``: o atraso da replicação fica nas mãos
+    do teste.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # A réplica só existe nestes testes: fica fora das configurações e
+        # do banco de teste criado pelo runner
+        if roteamento.replica_configurada():
+            raise unittest.SkipTest('Réplica já configurada (LIGAPRO_REPLICA): no teste ela espelha o primário')
+        cls.pasta = tempfile.mkdtemp()
+        connections.settings[roteamento.REPLICA] = dict(
+            connections['default'].settings_dict, NAME=os.path.join(cls.pasta, 'replica.sqlite3'),
+        )
+        cls.databases = {'default', roteamento.REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[roteamento.REPLICA].close()
+        del connections[roteamento.REPLICA]
+        del connections.settings[roteamento.REPLICA]
+        shutil.rmtree(cls.pasta)
+
+    def setUp(self):
+        cache.clear()
+        Time.objects.create(nome='Alfa')
+        self.replicar()
+
+    def replicar(self):
+        for alias in ('default', roteamento.REPLICA):
+            connections[alias].ensure_connection()
+        connections['default'].connection.backup(connections[roteamento.REPLICA].connection)
+
+    def envelhecer_escritas(self):
+        # Como se a última escrita nos dados fosse de um minuto atrás
+        versao, modificado = estado_dados()
+        cache.set(CHAVE_VERSAO, (versao, modificado - 60), timeout=None)
+
+    def times_na_tabela(self, client=None):
+        response = (client or self.client).get(reverse('api:tabela'))
+        return {linha['time_nome'] for linha in response.json()['resultados']}
+
+    def test_publicas_leem_da_replica_e_o_painel_do_primario(self):
+        Time.objects.create(nome='Beta')
+        self.envelhecer_escritas()
+        self.assertEqual(self.times_na_tabela(), {'Alfa'})
+
+        staff = User.objects.create_user('staff', password='senha', is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(reverse('painel:lista_times'))
+        self.assertEqual({time.nome for time in response.context['times']}, {'Alfa', 'Beta'})
+
+        self.replicar()
+        self.assertEqual(self.times_na_tabela(Client()), {'Alfa', 'Beta'})
+
+    def test_quem_escreveu_le_do_primario(self):
+        staff = User.objects.create_user('staff', password='senha', is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.post(reverse('painel:cadastrar_time'), {'nome': 'Beta'})
+        self.assertEqual(response.cookies[roteamento.COOKIE_PRIMARIO]['max-age'], roteamento.atraso_maximo())
+
+        # Logo depois da escrita todos leem do primário; passado o atraso,
+        # só quem escreveu (pelo cookie) continua lá
+        self.assertEqual(self.times_na_tabela(Client()), {'Alfa', 'Beta'})
+        self.envelhecer_escritas()
+        self.assertEqual(self.times_na_tabela(Client()), {'Alfa'})
+        self.assertEqual(self.times_na_tabela(), {'Alfa', 'Beta'})
+
+    def test_escrita_em_outro_processo_manda_as_leituras_ao_primario(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Só para o SQLite')
+        Time.objects.create(nome='Beta')
+        self.envelhecer_escritas()
+        self.assertEqual(self.times_na_tabela(), {'Alfa'})
+
+        # O horário da última escrita vem do cache compartilhado, não do processo
+        manage_em_outro_processo('rebuild_standings')
+        self.assertEqual(self.times_na_tabela(), {'Alfa', 'Beta'})
+
+    def test_requisicao_fica_no_primario_depois_de_escrever(self):
+        Time.objects.create(nome='Beta')
+        estado, token = roteamento.iniciar_requisicao()
+        self.addCleanup(roteamento.encerrar_requisicao, token)
+        estado.replica = True
+        self.assertEqual(Time.objects.count(), 1)
+        Time.objects.create(nome='Gama')
+        self.assertEqual(Time.objects.count(), 3)
@@ -10,6 +10,8 @@ urlpatterns = [
     path('proximos-jogos/', views.proximos_jogos, name='proximos_jogos'),
     path('tabela/', views.tabela, name='tabela'),
     path('artilharia/', views.artilharia, name='artilharia'),
+    path('probabilidades/', views.probabilidades, name='probabilidades'),
     path('', views.lista_times, name='home'),
     path('dashboard/', views.dashboard_usuario, name='dashboard_usuario'),
+    path('ao-vivo/', views.eventos_ao_vivo, name='eventos_ao_vivo'),
 ]
\ No newline at end of file
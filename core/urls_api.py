@@ -0,0 +1,14 @@
+# core/urls_api.py
+
+from django.urls import path
+from . import api
+
+app_name = 'api'
+
+urlpatterns = [
+    path('tabela/', api.tabela, name='tabela'),
+    path('jogos/', api.jogos, name='jogos'),
+    path('artilharia/', api.artilharia, name='artilharia'),
+    path('times/<int:time_id>/', api.detalhe_time, name='detalhe_time'),
+    path('busca/', api.busca, name='busca'),
+]
@@ -1,169 +1,91 @@
 # core/views.py
 
 from django.shortcuts import render, get_object_or_404
-from django.db.models import Q, Count
-from .models import Time, Jogador, Jogo, Gol
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from .models import Time, Jogador, Jogo, Classificacao, ClassificacaoRodada
+from .standings import LinhaClassificacao, ler_classificacao, classificacao_na_rodada, evolucao_posicoes
+from .scorers import ranking_artilheiros, pagina_artilheiros, ranking_times_gols, total_gols
 from django.utils import timezone
+from .cache import cache_pagina, pagina_condicional
+from .elo import grafico_elo
+from .eventos import barramento
+from .metricas import orcamento_consultas
+from .simulacao import VAGAS_LIBERTADORES, VAGAS_REBAIXAMENTO, probabilidades_atuais
 
+ARTILHEIROS_POR_PAGINA = 20
+# Comentário enviado no stream de eventos para manter a conexão viva
+INTERVALO_PING = 15
+# Espera sugerida ao EventSource antes de reconectar, em milissegundos
+RECONEXAO_MS = 5000
+
+
+@orcamento_consultas(1)
+@pagina_condicional
+@cache_pagina
 def lista_times(request):
-    times = Time.objects.all()
-    dados_times = []
-    
-    for time in times:
-        jogos_casa = Jogo.objects.filter(time_casa=time, realizado=True)
-        jogos_visitante = Jogo.objects.filter(time_visitante=time, realizado=True)
-        
-        pontos = 0
-        jogos_disputados = 0
-        vitorias = 0
-        empates = 0
-        derrotas = 0
-        gols_pro = 0
-        gols_contra = 0
-        
-        for jogo in jogos_casa:
-            gols_pro += jogo.gols_casa
-            gols_contra += jogo.gols_visitante
-            jogos_disputados += 1
-            
-            if jogo.gols_casa > jogo.gols_visitante:
-                vitorias += 1
-                pontos += 3
-            elif jogo.gols_casa == jogo.gols_visitante:
-                empates += 1
-                pontos += 1
-            else:
-                derrotas += 1
-        
-        for jogo in jogos_visitante:
-            gols_pro += jogo.gols_visitante
-            gols_contra += jogo.gols_casa
-            jogos_disputados += 1
-            
-            if jogo.gols_visitante > jogo.gols_casa:
-                vitorias += 1
-                pontos += 3
-            elif jogo.gols_visitante == jogo.gols_casa:
-                empates += 1
-                pontos += 1
-            else:
-                derrotas += 1
-        
-        saldo_gols = gols_pro - gols_contra
-        
-        dados_times.append({
-            'time': time,
-            'pontos': pontos,
-            'jogos': jogos_disputados,
-            'vitorias': vitorias,
-            'empates': empates,
-            'derrotas': derrotas,
-            'gols_pro': gols_pro,
-            'gols_contra': gols_contra,
-            'saldo_gols': saldo_gols,
-        })
-    
-    dados_times.sort(key=lambda x: x['time'].nome)
+    dados_times = ler_classificacao().order_by('time__nome')
     
     return render(request, 'lista_times.html', {'dados_times': dados_times})
 
 
+@orcamento_consultas(7)
+@pagina_condicional
+@cache_pagina
 def detalhe_time(request, time_id):
-    time = get_object_or_404(Time, id=time_id)
+    time = get_object_or_404(Time.objects.select_related('classificacao'), id=time_id)
     
     jogos = Jogo.objects.filter(
         Q(time_casa=time) | Q(time_visitante=time)
-    ).order_by('-data_jogo')
+    ).select_related('time_casa', 'time_visitante').order_by('-data_jogo')
     
     jogos_realizados = jogos.filter(realizado=True)
     jogos_futuros = jogos.filter(realizado=False, data_jogo__gte=timezone.now())
     
-    jogadores = time.jogadores.filter(ativo=True).order_by('posicao', 'numero')
-    
-    goleiros = jogadores.filter(posicao='GOL')
-    zagueiros = jogadores.filter(posicao='ZAG')
-    laterais = jogadores.filter(posicao='LAT')
-    volantes = jogadores.filter(posicao='VOL')
-    meias = jogadores.filter(posicao='MEI')
-    atacantes = jogadores.filter(posicao='ATA')
-    tecnicos = jogadores.filter(posicao='TEC')
-    
-    artilheiros_time = Gol.objects.filter(
-        time=time,
-        contra=False
-    ).values('jogador').annotate(
-        total_gols=Count('id')
-    ).order_by('-total_gols')[:5]
-    
-    artilheiros_lista = []
-    for item in artilheiros_time:
-        jogador = Jogador.objects.get(id=item['jogador'])
-        artilheiros_lista.append({
-            'jogador': jogador,
-            'gols': item['total_gols']
-        })
-    
-    estatisticas = {
-        'jogos': jogos_realizados.count(),
-        'vitorias': 0,
-        'empates': 0,
-        'derrotas': 0,
-        'gols_pro': 0,
-        'gols_contra': 0,
-    }
+    # Elenco em uma única consulta, separado por posição
+    elenco = {sigla: [] for sigla, _ in Jogador.POSICOES}
+    for jogador in time.jogadores.filter(ativo=True).order_by('posicao', 'numero'):
+        elenco[jogador.posicao].append(jogador)
     
-    for jogo in jogos_realizados:
-        if jogo.time_casa == time:
-            estatisticas['gols_pro'] += jogo.gols_casa
-            estatisticas['gols_contra'] += jogo.gols_visitante
-            if jogo.gols_casa > jogo.gols_visitante:
-                estatisticas['vitorias'] += 1
-            elif jogo.gols_casa == jogo.gols_visitante:
-                estatisticas['empates'] += 1
-            else:
-                estatisticas['derrotas'] += 1
-        else:
-            estatisticas['gols_pro'] += jogo.gols_visitante
-            estatisticas['gols_contra'] += jogo.gols_casa
-            if jogo.gols_visitante > jogo.gols_casa:
-                estatisticas['vitorias'] += 1
-            elif jogo.gols_visitante == jogo.gols_casa:
-                estatisticas['empates'] += 1
-            else:
-                estatisticas['derrotas'] += 1
-    
-    estatisticas['saldo_gols'] = estatisticas['gols_pro'] - estatisticas['gols_contra']
-    
-    if estatisticas['jogos'] > 0:
-        pontos = (estatisticas['vitorias'] * 3) + estatisticas['empates']
-        estatisticas['aproveitamento'] = round((pontos / (estatisticas['jogos'] * 3)) * 100, 1)
-    else:
-        estatisticas['aproveitamento'] = 0
+    artilheiros_lista = ranking_artilheiros(time=time, top_n=5)
+    
+    # Campanha vem da classificação persistida
+    try:
+        estatisticas = time.classificacao
+    except Classificacao.DoesNotExist:
+        estatisticas = LinhaClassificacao(time)
     
     context = {
         'time': time,
         'jogos_realizados': jogos_realizados[:5],
         'jogos_futuros': jogos_futuros[:5],
         'estatisticas': estatisticas,
-        'goleiros': goleiros,
-        'zagueiros': zagueiros,
-        'laterais': laterais,
-        'volantes': volantes,
-        'meias': meias,
-        'atacantes': atacantes,
-        'tecnicos': tecnicos,
+        'goleiros': elenco['GOL'],
+        'zagueiros': elenco['ZAG'],
+        'laterais': elenco['LAT'],
+        'volantes': elenco['VOL'],
+        'meias': elenco['MEI'],
+        'atacantes': elenco['ATA'],
+        'tecnicos': elenco['TEC'],
+        'total_elenco': sum(len(jogadores) for jogadores in elenco.values()),
         'artilheiros': artilheiros_lista,
+        'evolucao': evolucao_posicoes(time),
+        'grafico_elo': grafico_elo(time),
     }
     
     return render(request, 'detalhe_time.html', context)
 
 
+@orcamento_consultas(2)
+@pagina_condicional
+@cache_pagina
 def lista_jogos(request):
     # Obter parâmetro de rodada da URL
     rodada = request.GET.get('rodada')
     
     # Query base: jogos realizados
-    jogos = Jogo.objects.filter(realizado=True)
+    jogos = Jogo.objects.filter(realizado=True).select_related('time_casa', 'time_visitante')
     
     # Obter todas as rodadas disponíveis para o filtro
     rodadas_disponiveis = Jogo.objects.filter(
@@ -193,77 +115,47 @@ def lista_jogos(request):
     return render(request, 'lista_jogos.html', context)
 
 
+@orcamento_consultas(2)
+@pagina_condicional
+@cache_pagina
 def tabela(request):
-    times = Time.objects.all()
-    dados_times = []
-    
-    for time in times:
-        jogos_casa = Jogo.objects.filter(time_casa=time, realizado=True)
-        jogos_visitante = Jogo.objects.filter(time_visitante=time, realizado=True)
-        
-        pontos = 0
-        jogos_disputados = 0
-        vitorias = 0
-        empates = 0
-        derrotas = 0
-        gols_pro = 0
-        gols_contra = 0
-        
-        for jogo in jogos_casa:
-            gols_pro += jogo.gols_casa
-            gols_contra += jogo.gols_visitante
-            jogos_disputados += 1
-            
-            if jogo.gols_casa > jogo.gols_visitante:
-                vitorias += 1
-                pontos += 3
-            elif jogo.gols_casa == jogo.gols_visitante:
-                empates += 1
-                pontos += 1
-            else:
-                derrotas += 1
-        
-        for jogo in jogos_visitante:
-            gols_pro += jogo.gols_visitante
-            gols_contra += jogo.gols_casa
-            jogos_disputados += 1
-            
-            if jogo.gols_visitante > jogo.gols_casa:
-                vitorias += 1
-                pontos += 3
-            elif jogo.gols_visitante == jogo.gols_casa:
-                empates += 1
-                pontos += 1
-            else:
-                derrotas += 1
-        
-        saldo_gols = gols_pro - gols_contra
-        
-        dados_times.append({
-            'time': time,
-            'pontos': pontos,
-            'jogos': jogos_disputados,
-            'vitorias': vitorias,
-            'empates': empates,
-            'derrotas': derrotas,
-            'gols_pro': gols_pro,
-            'gols_contra': gols_contra,
-            'saldo_gols': saldo_gols,
-        })
-    
-    from operator import itemgetter
-    dados_times.sort(key=itemgetter('pontos', 'vitorias', 'saldo_gols', 'gols_pro'), reverse=True)
-    
-    return render(request, 'tabela.html', {'dados_times': dados_times})
+    rodada = request.GET.get('rodada')
+    rodada_selecionada = None
+    dados_times = None
+    
+    # Tabela como estava ao fim de uma rodada (retratos acumulados)
+    if rodada:
+        try:
+            rodada_selecionada, dados_times = classificacao_na_rodada(int(rodada))
+        except ValueError:
+            pass
+    
+    if dados_times is None:
+        dados_times = ler_classificacao()
+    
+    rodadas_disponiveis = ClassificacaoRodada.objects.values_list(
+        'rodada', flat=True
+    ).distinct().order_by('rodada')
+    
+    context = {
+        'dados_times': dados_times,
+        'rodadas_disponiveis': rodadas_disponiveis,
+        'rodada_selecionada': rodada_selecionada,
+    }
+    
+    return render(request, 'tabela.html', context)
 
 
+@orcamento_consultas(2)
+@pagina_condicional
+@cache_pagina
 def proximos_jogos(request):
     rodada = request.GET.get('rodada')
     
     jogos_base = Jogo.objects.filter(
         realizado=False,
         data_jogo__gte=timezone.now()
-    )
+    ).select_related('time_casa', 'time_visitante')
     
     todas_rodadas = Jogo.objects.filter(
         realizado=False,
@@ -291,124 +183,117 @@ def proximos_jogos(request):
     return render(request, 'proximos_jogos.html', context)
 
 
+@orcamento_consultas(4)
+@pagina_condicional
+@cache_pagina
 def artilharia(request):
-    artilheiros = Gol.objects.filter(
-        contra=False
-    ).values('jogador').annotate(
-        total_gols=Count('id')
-    ).order_by('-total_gols')
-    
-    ranking = []
-    for item in artilheiros:
-        jogador = Jogador.objects.select_related('time').get(id=item['jogador'])
-        ranking.append({
-            'jogador': jogador,
-            'gols': item['total_gols']
-        })
-    
-    times_gols = Gol.objects.filter(
-        contra=False
-    ).values('time').annotate(
-        total_gols=Count('id')
-    ).order_by('-total_gols')
-    
-    times_ranking = []
-    for item in times_gols:
-        time = Time.objects.get(id=item['time'])
-        times_ranking.append({
-            'time': time,
-            'gols': item['total_gols']
-        })
+    ranking = pagina_artilheiros(request.GET.get('pagina'), por_pagina=ARTILHEIROS_POR_PAGINA)
     
     context = {
         'ranking': ranking,
-        'times_ranking': times_ranking,
-        'total_gols': Gol.objects.filter(contra=False).count(),
+        'times_ranking': ranking_times_gols(),
+        'total_gols': total_gols(),
     }
     
     return render(request, 'artilharia.html', context)
 
+# Sem cache de página: o resultado chega depois, quando o worker termina a
+# simulação agendada pela última escrita
+@orcamento_consultas(4)
+def probabilidades(request):
+    simulacao, atualizada = probabilidades_atuais()
+    
+    context = {
+        'simulacao': simulacao,
+        'atualizada': atualizada,
+        'vagas_libertadores': VAGAS_LIBERTADORES,
+        'vagas_rebaixamento': VAGAS_REBAIXAMENTO,
+    }
+    
+    return render(request, 'probabilidades.html', context)
+
+@orcamento_consultas(8)
+@pagina_condicional
+@cache_pagina
 def dashboard_usuario(request):
     # Estatísticas gerais
     total_times = Time.objects.count()
     total_jogadores = Jogador.objects.count()
     total_jogos = Jogo.objects.filter(realizado=True).count()
-    total_gols = Gol.objects.filter(contra=False).count()
+    total_gols_campeonato = total_gols()
     
     # Últimos jogos
-    ultimos_jogos = Jogo.objects.filter(realizado=True).order_by('-data_jogo')[:5]
+    ultimos_jogos = Jogo.objects.filter(realizado=True).select_related('time_casa', 'time_visitante').order_by('-data_jogo')[:5]
     
     # Próximos jogos
-    proximos_jogos = Jogo.objects.filter(realizado=False, data_jogo__gte=timezone.now()).order_by('data_jogo')[:5]
+    proximos_jogos = Jogo.objects.filter(realizado=False, data_jogo__gte=timezone.now()).select_related('time_casa', 'time_visitante').order_by('data_jogo')[:5]
     
     # Top 5 artilheiros
-    top_artilheiros = Gol.objects.filter(
-        contra=False
-    ).values('jogador').annotate(
-        total=Count('id')
-    ).order_by('-total')[:5]
-    
-    artilheiros_lista = []
-    for item in top_artilheiros:
-        jogador = Jogador.objects.select_related('time').get(id=item['jogador'])
-        artilheiros_lista.append({
-            'jogador': jogador,
-            'gols': item['total']
-        })
+    artilheiros_lista = ranking_artilheiros(top_n=5)
     
     # Classificação (top 5)
-    times = Time.objects.all()
-    classificacao = []
-    
-    for time in times:
-        jogos_casa = Jogo.objects.filter(time_casa=time, realizado=True)
-        jogos_visitante = Jogo.objects.filter(time_visitante=time, realizado=True)
-        
-        pontos = 0
-        vitorias = 0
-        gols_pro = 0
-        gols_contra = 0
-        
-        for jogo in jogos_casa:
-            gols_pro += jogo.gols_casa
-            gols_contra += jogo.gols_visitante
-            if jogo.gols_casa > jogo.gols_visitante:
-                vitorias += 1
-                pontos += 3
-            elif jogo.gols_casa == jogo.gols_visitante:
-                pontos += 1
-        
-        for jogo in jogos_visitante:
-            gols_pro += jogo.gols_visitante
-            gols_contra += jogo.gols_casa
-            if jogo.gols_visitante > jogo.gols_casa:
-                vitorias += 1
-                pontos += 3
-            elif jogo.gols_visitante == jogo.gols_casa:
-                pontos += 1
-        
-        saldo_gols = gols_pro - gols_contra
-        
-        classificacao.append({
-            'time': time,
-            'pontos': pontos,
-            'jogos': jogos_casa.count() + jogos_visitante.count(),
-            'vitorias': vitorias,
-            'saldo_gols': saldo_gols,
-        })
-    
-    # Ordenar por pontos
-    classificacao.sort(key=lambda x: x['pontos'], reverse=True)
-    top_5_classificacao = classificacao[:5]
+    top_5_classificacao = ler_classificacao()[:5]
     
     context = {
         'total_times': total_times,
         'total_jogadores': total_jogadores,
         'total_jogos': total_jogos,
-        'total_gols': total_gols,
+        'total_gols': total_gols_campeonato,
         'ultimos_jogos': ultimos_jogos,
         'proximos_jogos': proximos_jogos,
         'artilheiros': artilheiros_lista,
         'classificacao': top_5_classificacao,
     }
-    return render(request, 'dashboard_usuario.html', context)
\ No newline at end of file
+    return render(request, 'dashboard_usuario.html', context)
+
+
+async def _stream_eventos(desde):
+    bus = barramento()
+    # Assina antes de ler o histórico para não perder nada entre os dois
+    assinatura = bus.assinar()
+    try:
+        yield f'retry: {RECONEXAO_MS}\n\n'
+        ultimo = desde
+        for evento in bus.recentes(desde):
+            ultimo = evento.id
+            yield evento.sse()
+        while not assinatura.atrasada:
+            evento = await assinatura.proximo(INTERVALO_PING)
+            if evento is None:
+                yield ': ping\n\n'
+            elif evento.id > ultimo:
+                ultimo = evento.id
+                yield evento.sse()
+    finally:
+        bus.cancelar(assinatura)
+
+
+def _eventos_recentes(desde):
+    yield f'retry: {RECONEXAO_MS}\n\n'
+    for evento in barramento().recentes(desde):
+        yield evento.sse()
+
+
+@orcamento_consultas(0)
+async def eventos_ao_vivo(request):
+    """
+    Placares e gols ao vivo por Server-Sent Events. Sob ASGI cada conexão
+    é só uma tarefa no event loop, sem thread própria. Sob WSGI a resposta
+    entrega os eventos pendentes e termina; o EventSource reconecta com o
+    Last-Event-ID, o que vira um polling.
+    """
+    try:
+        desde = int(request.headers.get('Last-Event-ID') or request.GET.get('desde') or 0)
+    except ValueError:
+        desde = 0
+
+    if isinstance(request, ASGIRequest):
+        conteudo = _stream_eventos(desde)
+    else:
+        conteudo = _eventos_recentes(desde)
+
+    response = StreamingHttpResponse(conteudo, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Sem buffer no nginx, para cada evento sair na hora
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,3 +1,518 @@
-from django.test import TestCase
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import exportacao
+from core.cache import _nova_versao, versao_elencos
+from core.elo import ELO_INICIAL, reprocessar_elo
+from core.models import Time, Jogador, Jogo, Gol, Classificacao, EloJogo, Tarefa
+from core.paginacao import contagem_aproximada
+from core.scorers import reconstruir_contadores
+from core.standings import reconstruir_classificacao
+from core.gerador import gerar_liga
+from core.tests import imagem_png, verificar_orcamentos
+
+
+class PainelTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='senha', is_staff=True, is_superuser=True)
+        cls.casa = Time.objects.create(nome='Casa')
+        cls.visitante = Time.objects.create(nome='Visitante')
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def criar_jogo(self, **kwargs):
+        dados = {
+            'time_casa': self.casa,
+            'time_visitante': self.visitante,
+            'data_jogo': timezone.now() - timedelta(days=1),
+        }
+        dados.update(kwargs)
+        return Jogo.objects.create(**dados)
+
+    def assertTabelaConsistente(self):
+        self.assertEqual(reconstruir_classificacao(gravar=False), [])
+
+    def assertEloConsistente(self):
+        # O histórico mantido a cada alteração é igual ao refeito do zero
+        def estado():
+            historico = sorted(EloJogo.objects.values_list('jogo_id', 'time_id', 'elo_anterior', 'elo'))
+            return historico, dict(Time.objects.values_list('id', 'elo'))
+        mantido = estado()
+        reprocessar_elo()
+        self.assertEqual(mantido, estado())
+
+
+class ResultadoClassificacaoTests(PainelTestCase):
+    def test_lancar_editar_e_excluir_resultado(self):
+        jogo = self.criar_jogo()
+
+        self.client.post(reverse('painel:lancar_resultado', args=[jogo.id]), {'gols_casa': 2, 'gols_visitante': 1})
+        self.assertTabelaConsistente()
+        self.assertEqual(Classificacao.objects.get(time=self.casa).pontos, 3)
+
+        self.client.post(reverse('painel:editar_jogo', args=[jogo.id]), {
+            'time_casa': self.casa.id,
+            'time_visitante': self.visitante.id,
+            'data_jogo': '2026-01-10T16:00',
+            'rodada': 1,
+            'realizado': 'on',
+            'gols_casa': 0,
+            'gols_visitante': 3,
+        })
+        self.assertTabelaConsistente()
+        self.assertEqual(Classificacao.objects.get(time=self.visitante).pontos, 3)
+
+        self.client.post(reverse('painel:excluir_jogo', args=[jogo.id]))
+        self.assertTabelaConsistente()
+        self.assertEqual(Classificacao.objects.get(time=self.casa).jogos, 0)
+
+    def test_acoes_em_massa_do_admin(self):
+        jogos = [self.criar_jogo(gols_casa=1), self.criar_jogo(gols_visitante=2)]
+        url = reverse('admin:core_jogo_changelist')
+        ids = [jogo.id for jogo in jogos]
+
+        self.client.post(url, {'action': 'marcar_como_realizado', '_selected_action': ids})
+        self.assertTabelaConsistente()
+        self.assertEqual(Classificacao.objects.get(time=self.casa).jogos, 2)
+
+        self.client.post(url, {'action': 'marcar_como_nao_realizado', '_selected_action': ids})
+        self.assertTabelaConsistente()
+        self.assertEqual(Classificacao.objects.get(time=self.casa).jogos, 0)
+
+    def test_excluir_time_recalcula_adversarios(self):
+        self.client.post(reverse('painel:lancar_resultado', args=[self.criar_jogo().id]), {'gols_casa': 1, 'gols_visitante': 0})
+        self.client.post(reverse('painel:excluir_time', args=[self.casa.id]))
+        self.assertTabelaConsistente()
+        self.assertEqual(Classificacao.objects.get(time=self.visitante).jogos, 0)
+
+
+class SumulaTests(PainelTestCase):
+    def setUp(self):
+        super().setUp()
+        self.atacante = Jogador.objects.create(nome='Atacante', time=self.casa, posicao='ATA')
+        self.zagueiro = Jogador.objects.create(nome='Zagueiro', time=self.visitante, posicao='ZAG')
+        self.jogo = self.criar_jogo()
+        self.url = reverse('painel:lancar_resultado', args=[self.jogo.id])
+
+    def lancar(self, placar, gols):
+        jogadores, minutos, tipos = zip(*gols) if gols else ((), (), ())
+        return self.client.post(self.url, {
+            'gols_casa': placar[0], 'gols_visitante': placar[1],
+            'gol_jogador': [jogador.id for jogador in jogadores], 'gol_minuto': minutos, 'gol_tipo': tipos,
+        })
+
+    def test_placar_e_gols_gravados_juntos(self):
+        # Gol contra do zagueiro visitante conta para a casa
+        self.lancar((2, 1), [
+            (self.atacante, 10, 'PENALTI'), (self.zagueiro, 30, 'CONTRA'), (self.zagueiro, 80, 'NORMAL'),
+        ])
+        self.jogo.refresh_from_db()
+        self.assertEqual((self.jogo.realizado, self.jogo.gols_casa, self.jogo.gols_visitante), (True, 2, 1))
+        self.assertEqual(self.jogo.gols.filter(contra=True, time=self.visitante).count(), 1)
+        self.assertEqual(reconstruir_contadores(gravar=False), [])
+        self.assertTabelaConsistente()
+
+        # Relançar mantém os gols iguais e troca só os que mudaram
+        mantido = self.jogo.gols.get(minuto=10).id
+        self.lancar((1, 1), [(self.atacante, 10, 'PENALTI'), (self.zagueiro, 85, 'NORMAL')])
+        self.assertEqual(sorted(self.jogo.gols.values_list('minuto', flat=True)), [10, 85])
+        self.assertTrue(self.jogo.gols.filter(id=mantido).exists())
+        self.assertEqual(reconstruir_contadores(gravar=False), [])
+
+    def test_gols_que_nao_batem_com_o_placar(self):
+        response = self.lancar((2, 0), [(self.atacante, 10, 'NORMAL')])
+        self.assertContains(response, 'Os gols informados dão 1 x 0')
+        self.jogo.refresh_from_db()
+        self.assertFalse(self.jogo.realizado)
+        self.assertFalse(Gol.objects.exists())
+
+        # Jogador de fora do jogo também não entra
+        outro = Jogador.objects.create(nome='Outro', time=Time.objects.create(nome='Outro'), posicao='ATA')
+        self.assertContains(self.lancar((1, 0), [(outro, 10, 'NORMAL')]), 'Gol 1: selecione um jogador')
+        self.assertFalse(Gol.objects.exists())
+
+    def test_listas_de_gols_de_tamanhos_diferentes(self):
+        response = self.client.post(self.url, {
+            'gols_casa': 1, 'gols_visitante': 0,
+            'gol_jogador': [self.atacante.id, self.atacante.id], 'gol_minuto': [10], 'gol_tipo': ['NORMAL', 'NORMAL'],
+        })
+        self.assertContains(response, 'A súmula veio incompleta')
+        self.assertEqual(len(response.context['linhas_gols']), 2)
+        self.jogo.refresh_from_db()
+        self.assertFalse(self.jogo.realizado)
+        self.assertFalse(Gol.objects.exists())
+
+    def test_uma_invalidacao_por_lancamento(self):
+        self.lancar((3, 0), [(self.atacante, minuto, 'NORMAL') for minuto in (10, 20, 30)])
+
+        # Placar, tabela, dois gols excluídos e um novo: uma troca de versão no commit
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.lancar((2, 0), [(self.atacante, 10, 'NORMAL'), (self.atacante, 50, 'PENALTI')])
+        trocas = [callback for callback in callbacks if getattr(callback, 'func', None) is _nova_versao]
+        self.assertEqual(len(trocas), 1)
+        self.assertEqual(sorted(self.jogo.gols.values_list('minuto', flat=True)), [10, 50])
+        self.assertEqual(reconstruir_contadores(gravar=False), [])
+        self.atacante.refresh_from_db()
+        self.assertEqual((self.atacante.gols_marcados, self.atacante.gols_penalti), (2, 1))
+
+
+class EloTests(PainelTestCase):
+    def elo(self, time):
+        return Time.objects.get(id=time.id).elo
+
+    def test_resultados_atualizam_e_edicoes_refazem_os_seguintes(self):
+        terceiro = Time.objects.create(nome='Terceiro')
+        agora = timezone.now()
+        jogos = [
+            self.criar_jogo(data_jogo=agora - timedelta(days=3)),
+            self.criar_jogo(time_casa=self.visitante, time_visitante=terceiro, data_jogo=agora - timedelta(days=2)),
+            self.criar_jogo(time_casa=terceiro, time_visitante=self.casa, data_jogo=agora - timedelta(days=1)),
+        ]
+        for jogo, placar in zip(jogos, [(3, 0), (1, 1), (0, 2)]):
+            self.client.post(
+                reverse('painel:lancar_resultado', args=[jogo.id]),
+                {'gols_casa': placar[0], 'gols_visitante': placar[1]},
+            )
+        self.assertEloConsistente()
+        self.assertGreater(self.elo(self.casa), ELO_INICIAL)
+        self.assertAlmostEqual(sum(Time.objects.values_list('elo', flat=True)), 3 * ELO_INICIAL)
+
+        # Corrigir o primeiro jogo refaz os dois seguintes
+        primeiro = list(EloJogo.objects.filter(jogo=jogos[0]).values_list('id', flat=True))
+        self.client.post(reverse('painel:editar_jogo', args=[jogos[0].id]), {
+            'time_casa': self.casa.id,
+            'time_visitante': self.visitante.id,
+            'data_jogo': (agora - timedelta(days=3)).strftime('%Y-%m-%dT%H:%M'),
+            'rodada': 1,
+            'realizado': 'on',
+            'gols_casa': 0,
+            'gols_visitante': 1,
+        })
+        self.assertEloConsistente()
+        self.assertFalse(EloJogo.objects.filter(id__in=primeiro).exists())
+
+        self.client.post(reverse('painel:excluir_jogo', args=[jogos[1].id]))
+        self.assertEloConsistente()
+        self.assertEqual(EloJogo.objects.filter(time=terceiro).count(), 1)
+
+    def test_lancar_ultimo_resultado_nao_refaz_historico(self):
+        agora = timezone.now()
+        for dias in range(30, 10, -1):
+            jogo = self.criar_jogo(data_jogo=agora - timedelta(days=dias))
+            self.client.post(reverse('painel:lancar_resultado', args=[jogo.id]), {'gols_casa': dias % 3, 'gols_visitante': 1})
+        anteriores = set(EloJogo.objects.values_list('id', flat=True))
+
+        jogo = self.criar_jogo(data_jogo=agora)
+        self.client.post(reverse('painel:lancar_resultado', args=[jogo.id]), {'gols_casa': 2, 'gols_visitante': 0})
+        self.assertEqual(set(EloJogo.objects.exclude(jogo=jogo).values_list('id', flat=True)), anteriores)
+        self.assertEqual(EloJogo.objects.filter(jogo=jogo).count(), 2)
+        self.assertEloConsistente()
+
+
+class BuscaJogadoresTests(PainelTestCase):
+    def test_busca_sem_acento_por_jogador_ou_time(self):
+        sao_paulo = Time.objects.create(nome='São Paulo')
+        lucas = Jogador.objects.create(nome='Lucas Moura', time=sao_paulo, posicao='MEI')
+        Jogador.objects.create(nome='Outro', time=self.casa, posicao='ATA')
+        for busca in ('sao paulo', 'luc', 'Lucas Moura'):
+            with self.subTest(busca=busca):
+                response = self.client.get(reverse('painel:lista_jogadores'), {'busca': busca})
+                self.assertEqual(list(response.context['jogadores']), [lucas])
+
+
+class ElencosTests(PainelTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_jogadores_ativos_por_time(self):
+        bruno = Jogador.objects.create(nome='Bruno', time=self.casa, posicao='ATA', numero=9)
+        ana = Jogador.objects.create(nome='Ana', time=self.casa, posicao='GOL')
+        Jogador.objects.create(nome='Inativo', time=self.casa, posicao='MEI', ativo=False)
+        dados = self.client.get(reverse('painel:elencos')).json()
+        self.assertEqual(dados['versao'], versao_elencos())
+        self.assertEqual(dados['times'], {
+            str(self.casa.id): [[ana.id, None, 'Ana', 'GOL'], [bruno.id, 9, 'Bruno', 'ATA']],
+        })
+        self.assertEqual(dados['posicoes']['ATA'], 'Atacante')
+
+    def test_versao_muda_so_com_jogadores(self):
+        jogador = Jogador.objects.create(nome='Bruno', time=self.casa, posicao='ATA')
+        versao = versao_elencos()
+        jogo = self.criar_jogo(realizado=True)
+        Gol.objects.create(jogo=jogo, jogador=jogador, time=self.casa, minuto=10)
+        self.assertEqual(versao_elencos(), versao)
+
+        jogador.time = self.visitante
+        jogador.save()
+        self.assertNotEqual(versao_elencos(), versao)
+        versao = versao_elencos()
+        jogador.delete()
+        self.assertNotEqual(versao_elencos(), versao)
+
+    def test_cache_do_navegador_e_do_servidor(self):
+        Jogador.objects.create(nome='Bruno', time=self.casa, posicao='ATA')
+        versao = versao_elencos()
+        url = reverse('painel:elencos')
+        response = self.client.get(url, {'v': versao})
+        self.assertIn('immutable', response['Cache-Control'])
+
+        # Já no cache: só as consultas da sessão e do usuário
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        # Versão antiga na URL: volta o conteúdo atual, sem cache longo
+        Jogador.objects.create(nome='Ana', time=self.casa, posicao='GOL')
+        response = self.client.get(url, {'v': versao})
+        self.assertNotIn('immutable', response['Cache-Control'])
+        self.assertEqual(len(response.json()['times'][str(self.casa.id)]), 2)
+
+
+class OrcamentoConsultasTests(PainelTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        gerar_liga(times=6, jogadores_por_time=5, rodadas=10, rodadas_realizadas=6)
+
+    def test_rotas_do_painel_dentro_do_orcamento(self):
+        verificar_orcamentos(self, 'painel.urls', namespace='painel:')
+
+
+class ListagemKeysetTests(PainelTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        data = timezone.now()
+        # Três jogos por horário, para exercitar o desempate pelo id
+        Jogo.objects.bulk_create([
+            Jogo(time_casa=cls.casa, time_visitante=cls.visitante, data_jogo=data - timedelta(hours=i // 3), rodada=i % 4 + 1)
+            for i in range(120)
+        ])
+
+    def percorrer(self, url, parametro, cursor_inicial=None):
+        ids, cursor = [], cursor_inicial
+        while True:
+            response = self.client.get(url, {parametro: cursor} if cursor else {})
+            pagina = response.context['pagina']
+            ids.append([jogo.id for jogo in pagina])
+            cursor = pagina.cursor_proximo if parametro == 'depois' else pagina.cursor_anterior
+            if cursor is None:
+                return ids, pagina
+
+    def test_paginas_cobrem_todos_os_jogos_na_ordem(self):
+        url = reverse('painel:lista_jogos')
+        esperado = list(Jogo.objects.order_by('-data_jogo', '-id').values_list('id', flat=True))
+
+        paginas, ultima = self.percorrer(url, 'depois')
+        self.assertEqual([len(p) for p in paginas], [50, 50, 20])
+        self.assertEqual(sum(paginas, []), esperado)
+
+        # Voltando da última página pelo cursor "antes"
+        anteriores, primeira = self.percorrer(url, 'antes', ultima.cursor_anterior)
+        self.assertEqual(anteriores, paginas[-2::-1])
+        self.assertFalse(primeira.tem_anterior)
+
+    def test_cursor_preserva_filtros(self):
+        response = self.client.get(reverse('painel:lista_jogos'), {'rodada': 2, 'time': self.casa.id})
+        pagina = response.context['pagina']
+        self.assertEqual(len(pagina), 30)
+        self.assertFalse(pagina.tem_proxima)
+        self.assertEqual(pagina.filtros, f'rodada=2&time={self.casa.id}')
+
+    def test_cursor_invalido_volta_para_a_primeira_pagina(self):
+        response = self.client.get(reverse('painel:lista_jogos'), {'depois': 'lixo|x'})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['pagina'].tem_anterior)
+
+    def test_contagem_aproximada(self):
+        self.assertEqual(contagem_aproximada(Jogo.objects.all(), limite=100), (100, False))
+        self.assertEqual(contagem_aproximada(Jogo.objects.all(), limite=120), (120, True))
+
+        response = self.client.get(reverse('painel:lista_jogos'), {'contar': 'todos'})
+        self.assertEqual((response.context['total_resultados'], response.context['contagem_exata']), (120, True))
+
+
+class FiltrosSobDemandaTests(PainelTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.artilheiro = Jogador.objects.create(nome='Artilheiro', time=cls.casa, posicao='ATA')
+        cls.goleiro = Jogador.objects.create(nome='Goleiro', time=cls.visitante, posicao='GOL')
+        jogo = Jogo.objects.create(
+            time_casa=cls.casa, time_visitante=cls.visitante, data_jogo=timezone.now(), realizado=True, gols_casa=1,
+        )
+        Gol.objects.create(jogo=jogo, jogador=cls.artilheiro, time=cls.casa, minuto=10)
+
+    def test_lista_de_gols_nao_carrega_jogadores_nem_jogos(self):
+        response = self.client.get(reverse('painel:lista_gols'))
+        self.assertNotContains(response, 'Goleiro')
+        self.assertIsNone(response.context['jogador_filtro'])
+
+        response = self.client.get(reverse('painel:lista_gols'), {'jogador': self.artilheiro.id})
+        self.assertContains(response, f'<option value="{self.artilheiro.id}" selected>')
+
+    def test_opcoes_filtradas_pelo_time(self):
+        response = self.client.get(reverse('painel:opcoes_filtro_jogadores'), {'time_id': self.casa.id})
+        self.assertContains(response, 'Artilheiro')
+        self.assertNotContains(response, 'Goleiro')
+
+        response = self.client.get(reverse('painel:opcoes_filtro_jogos'), {'time_id': self.visitante.id})
+        self.assertContains(response, 'Casa x Visitante')
+
+
+class UploadMiniaturasTests(PainelTestCase):
+    def setUp(self):
+        super().setUp()
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        configuracao = override_settings(MEDIA_ROOT=media)
+        configuracao.enable()
+        self.addCleanup(configuracao.disable)
+
+    def test_upload_enfileira_miniaturas(self):
+        self.client.post(reverse('painel:cadastrar_time'), {'nome': 'Novo', 'logo': imagem_png()})
+        time = Time.objects.get(nome='Novo')
+        self.assertEqual(time.logo_assinatura, '')
+        self.assertEqual(Tarefa.objects.filter(estado=Tarefa.PENDENTE).count(), 1)
+
+        call_command('run_worker', processos=0, uma_vez=True, stdout=StringIO())
+        time.refresh_from_db()
+        self.assertTrue(time.logo_assinatura)
+
+        # Trocar a imagem volta para o original até o worker processar a nova
+        self.client.post(reverse('painel:editar_time', args=[time.id]), {'nome': 'Novo', 'logo': imagem_png(cor='blue')})
+        assinatura = time.logo_assinatura
+        time.refresh_from_db()
+        self.assertEqual(time.logo_assinatura, '')
+        call_command('run_worker', processos=0, uma_vez=True, stdout=StringIO())
+        time.refresh_from_db()
+        self.assertNotIn(time.logo_assinatura, ('', assinatura))
+
+        self.client.post(reverse('painel:cadastrar_jogador'), {
+            'nome': 'Camisa 9', 'time': time.id, 'posicao': 'ATA', 'foto': imagem_png('foto.png'),
+        })
+        call_command('run_worker', processos=0, uma_vez=True, stdout=StringIO())
+        self.assertTrue(Jogador.objects.get(nome='Camisa 9').foto_assinatura)
+
+
+class ExportacaoTests(PainelTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.artilheiro = Jogador.objects.create(nome='Artilheiro', time=cls.casa, posicao='ATA')
+        cls.realizado = Jogo.objects.create(
+            time_casa=cls.casa, time_visitante=cls.visitante, data_jogo=timezone.now() - timedelta(days=7),
+            rodada=1, realizado=True, gols_casa=2, gols_visitante=1, local='Estádio "Central"',
+        )
+        Jogo.objects.create(
+            time_casa=cls.visitante, time_visitante=cls.casa, data_jogo=timezone.now() + timedelta(days=7), rodada=2,
+        )
+        for minuto in (10, 80):
+            Gol.objects.create(jogo=cls.realizado, jogador=cls.artilheiro, time=cls.casa, minuto=minuto)
+        reconstruir_classificacao()
+
+    def baixar(self, nome, **parametros):
+        response = self.client.get(reverse(f'painel:exportar_{nome}'), parametros)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_jogos_em_csv_com_os_filtros_da_lista(self):
+        conteudo = self.baixar('jogos', status='realizado')
+        linhas = conteudo.splitlines()
+        self.assertEqual(linhas[0], 'id,rodada,data_jogo,time_casa,time_visitante,gols_casa,gols_visitante,realizado,local')
+        self.assertEqual(len(linhas), 2)
+        self.assertIn(',Casa,Visitante,2,1,True,"Estádio ""Central"""', linhas[1])
+
+        response = self.client.get(reverse('painel:lista_jogos'), {'status': 'realizado'})
+        self.assertEqual([jogo.id for jogo in response.context['jogos']], [self.realizado.id])
+        self.assertContains(response, 'exportar/jogos/?status=realizado&formato=csv')
+
+    def test_gols_em_json_lines(self):
+        gols = [json.loads(linha) for linha in self.baixar('gols', formato='jsonl', jogador=self.artilheiro.id).splitlines()]
+        self.assertEqual([gol['minuto'] for gol in gols], [10, 80])
+        self.assertEqual((gols[0]['jogador'], gols[0]['rodada'], gols[0]['contra']), ('Artilheiro', 1, False))
+        self.assertEqual(self.baixar('gols', formato='jsonl', jogador=0), '')
+
+    def test_classificacao(self):
+        linhas = self.baixar('classificacao').splitlines()
+        self.assertEqual(linhas[1:], ['1,Casa,3,1,1,0,0,2,1,1', '2,Visitante,0,1,0,0,1,1,2,-1'])
+        self.assertTrue(self.baixar('classificacao', rodada=1).startswith('rodada,posicao,time'))
+
+    def test_formato_indisponivel(self):
+        response = self.client.get(reverse('painel:exportar_jogos'), {'formato': 'xls'})
+        self.assertEqual(response.status_code, 404)
+        if exportacao.pyarrow is None:
+            response = self.client.get(reverse('painel:exportar_jogos'), {'formato': 'arrow'})
+            self.assertEqual(response.status_code, 404)
+
+
+class CalendarioTests(PainelTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.outros = [Time.objects.create(nome=nome) for nome in ('Alfa', 'Beta', 'Gama', 'Delta')]
+        # Casa e Visitante dividem o estádio (local do último jogo em casa)
+        for mandante, adversario in ((cls.casa, cls.outros[0]), (cls.visitante, cls.outros[1])):
+            Jogo.objects.create(
+                time_casa=mandante, time_visitante=adversario, data_jogo=timezone.now() - timedelta(days=30),
+                rodada=1, local='Estádio Municipal',
+            )
+
+    def dados(self, **extra):
+        dados = {
+            'times': [time.id for time in Time.objects.all()],
+            'turnos': '2', 'inicio': '2026-08-02T16:00', 'intervalo': '7', 'rodada_inicial': '2', 'semente': '42',
+        }
+        dados.update(extra)
+        return dados
+
+    def test_previa_nao_grava_e_confirmacao_grava_o_mesmo_calendario(self):
+        response = self.client.post(reverse('painel:novo_calendario'), self.dados(acao='visualizar'))
+        calendario = response.context['calendario']
+        self.assertEqual((len(calendario.partidas), calendario.rodadas), (30, 10))
+        self.assertEqual(calendario.avisos, [])
+        self.assertEqual(Jogo.objects.count(), 2)
+        self.assertContains(response, 'Confirmar e Gravar 30 Jogos')
+        previa = [(p.rodada, p.casa.id, p.visitante.id) for p in calendario.partidas]
+
+        response = self.client.post(reverse('painel:novo_calendario'), self.dados(acao='confirmar'))
+        self.assertRedirects(response, reverse('painel:lista_jogos'))
+        jogos = Jogo.objects.filter(rodada__gte=2)
+        self.assertEqual(
+            sorted(jogos.values_list('rodada', 'time_casa_id', 'time_visitante_id')), sorted(previa)
+        )
+        self.assertEqual(jogos.filter(realizado=False).count(), 30)
+
+        # Cada par se enfrenta uma vez em cada mando
+        confrontos = {(casa, fora) for _, casa, fora in previa}
+        self.assertEqual(len(confrontos), 30)
+        # Os dois times do estádio nunca são mandantes na mesma rodada
+        for rodada in range(2, 12):
+            mandantes = set(jogos.filter(rodada=rodada, local='Estádio Municipal').values_list('time_casa_id', flat=True))
+            self.assertLessEqual(len(mandantes), 1)
+        primeira = timezone.localtime(jogos.filter(rodada=2).first().data_jogo)
+        self.assertEqual((primeira.day, primeira.hour), (2, 16))
+        self.assertEqual(timezone.localtime(jogos.filter(rodada=11).first().data_jogo).day, 4)
+
+    def test_dados_invalidos(self):
+        response = self.client.post(reverse('painel:novo_calendario'), self.dados(times=[self.casa.id]))
+        self.assertIsNone(response.context['calendario'])
+        self.assertContains(response, 'São necessários pelo menos 2 times.')
+
+        response = self.client.post(reverse('painel:novo_calendario'), self.dados(intervalo='0'))
+        self.assertContains(response, 'Confira a data de início')
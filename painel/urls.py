@@ -25,6 +25,7 @@ urlpatterns = [
     # Jogos
     path('jogos/', views.lista_jogos, name='lista_jogos'),
     path('jogos/cadastrar/', views.cadastrar_jogo, name='cadastrar_jogo'),
+    path('jogos/calendario/', views.novo_calendario, name='novo_calendario'),
     path('jogos/<int:jogo_id>/editar/', views.editar_jogo, name='editar_jogo'),
     path('jogos/<int:jogo_id>/excluir/', views.excluir_jogo, name='excluir_jogo'),
     path('jogos/<int:jogo_id>/lancar/', views.lancar_resultado, name='lancar_resultado'),
@@ -36,6 +37,16 @@ urlpatterns = [
     path('gols/<int:gol_id>/editar/', views.editar_gol, name='editar_gol'),
     path('gols/<int:gol_id>/excluir/', views.excluir_gol, name='excluir_gol'),
     
-    # AJAX (para carregar jogadores dinamicamente)
-    path('ajax/carregar-jogadores/', views.carregar_jogadores_por_time, name='carregar_jogadores'),
+    # Importação em massa (CSV/JSON)
+    path('importar/', views.importar_dados, name='importar_dados'),
+    
+    # Exportação em stream (CSV, JSON Lines ou Arrow), com os filtros das listas
+    path('exportar/jogos/', views.exportar_jogos, name='exportar_jogos'),
+    path('exportar/gols/', views.exportar_gols, name='exportar_gols'),
+    path('exportar/classificacao/', views.exportar_classificacao, name='exportar_classificacao'),
+    
+    # AJAX (elencos de todos os times em um JSON, filtrados no navegador)
+    path('ajax/elencos/', views.elencos, name='elencos'),
+    path('ajax/filtro-jogadores/', views.opcoes_filtro_jogadores, name='opcoes_filtro_jogadores'),
+    path('ajax/filtro-jogos/', views.opcoes_filtro_jogos, name='opcoes_filtro_jogos'),
 ]
\ No newline at end of file
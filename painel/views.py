@@ -1,58 +1,84 @@
 # painel/views.py
 
+import json
+import random
+from datetime import timedelta
+from itertools import zip_longest
+
 from django.shortcuts import render, redirect, get_object_or_404
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_datetime
+from django.utils.http import quote_etag
+from django.db import transaction
 from core.models import Time, Jogador, Jogo, Gol
-from django.db.models import Count, Sum, Q
-
+from core.standings import contribuicao, atualizar_classificacao, reconstruir_classificacao
+from core.scorers import placar_dos_gols, ranking_artilheiros, substituir_gols, total_gols
+from core.imagens import agendar_miniaturas
+from core.busca import filtro_jogadores
+from core.cache import guardar_por_versao, invalidacao_unica, ler_por_versao, versao_elencos
+from core.calendario import gerar_calendario, gravar_calendario, locais_dos_times
+from core.exportacao import FORMATOS, FormatoIndisponivel, exportar, filtrar_gols, filtrar_jogos
+from core.importacao import IMPORTADORES, ArquivoInvalido, formato_do_arquivo, importar
+from core.metricas import orcamento_consultas
+from core.tarefas import resumo_fila
+from core.paginacao import paginar_keyset, contagem_aproximada
+from django.db.models import Count, Max, Sum, Q
+
+# Validade no navegador do JSON dos elencos pedido com a versão na URL: a
+# versão muda a cada alteração de jogador, então o conteúdo nunca fica velho
+ELENCOS_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def _total_resultados(request, queryset):
+    """Contagem limitada por padrão; ``?contar=todos`` pede a contagem exata."""
+    if request.GET.get('contar') == 'todos':
+        return queryset.count(), True
+    return contagem_aproximada(queryset)
+
+
+@orcamento_consultas(10)
 @staff_member_required
 def dashboard(request):
     # Estatísticas gerais
     total_times = Time.objects.count()
     total_jogadores = Jogador.objects.count()
     total_jogos = Jogo.objects.count()
-    total_gols = Gol.objects.filter(contra=False).count()
+    total_gols_campeonato = total_gols()
     
     # Jogos recentes
-    jogos_recentes = Jogo.objects.filter(realizado=True).order_by('-data_jogo')[:5]
+    jogos_recentes = Jogo.objects.filter(realizado=True).select_related('time_casa', 'time_visitante').order_by('-data_jogo')[:5]
     
     # Próximos jogos
-    proximos_jogos = Jogo.objects.filter(realizado=False, data_jogo__gte=timezone.now()).order_by('data_jogo')[:5]
+    proximos_jogos = Jogo.objects.filter(realizado=False, data_jogo__gte=timezone.now()).select_related('time_casa', 'time_visitante').order_by('data_jogo')[:5]
     
     # Top artilheiros
-    top_artilheiros = Gol.objects.filter(
-        contra=False
-    ).values('jogador').annotate(
-        total=Count('id')
-    ).order_by('-total')[:5]
-    
-    artilheiros_lista = []
-    for item in top_artilheiros:
-        jogador = Jogador.objects.select_related('time').get(id=item['jogador'])
-        artilheiros_lista.append({
-            'jogador': jogador,
-            'gols': item['total']
-        })
+    artilheiros_lista = ranking_artilheiros(top_n=5)
+    
+    # Fila de tarefas do worker (miniaturas etc.)
+    fila = resumo_fila()
     
     context = {
         'total_times': total_times,
         'total_jogadores': total_jogadores,
         'total_jogos': total_jogos,
-        'total_gols': total_gols,
+        'total_gols': total_gols_campeonato,
         'jogos_recentes': jogos_recentes,
         'proximos_jogos': proximos_jogos,
         'artilheiros': artilheiros_lista,
+        'fila': fila,
     }
     return render(request, 'painel/dashboard.html', context)
 
 
+@orcamento_consultas(3)
 @staff_member_required
 def lista_times(request):
     times = Time.objects.all().annotate(
-        num_jogadores=Count('jogadores'),
-        num_gols=Count('gols')
+        num_jogadores=Count('jogadores')
     ).order_by('nome')
     
     context = {
@@ -61,6 +87,7 @@ def lista_times(request):
     return render(request, 'painel/times.html', context)
 
 
+@orcamento_consultas(4)
 @staff_member_required
 def detalhe_time(request, time_id):
     time = get_object_or_404(Time, id=time_id)
@@ -73,6 +100,7 @@ def detalhe_time(request, time_id):
     return render(request, 'painel/detalhe_time.html', context)
 
 
+@orcamento_consultas(2)
 @staff_member_required
 def cadastrar_time(request):
     if request.method == 'POST':
@@ -84,6 +112,7 @@ def cadastrar_time(request):
                 nome=nome,
                 logo=logo
             )
+            agendar_miniaturas(time, 'logo')
             messages.success(request, f'Time "{nome}" cadastrado com sucesso!')
             return redirect('painel:lista_times')
         else:
@@ -92,6 +121,7 @@ def cadastrar_time(request):
     return render(request, 'painel/cadastrar_time.html')
 
 
+@orcamento_consultas(3)
 @staff_member_required
 def editar_time(request, time_id):
     time = get_object_or_404(Time, id=time_id)
@@ -104,7 +134,10 @@ def editar_time(request, time_id):
             time.nome = nome
             if logo:
                 time.logo = logo
+                time.logo_assinatura = ''
             time.save()
+            if logo:
+                agendar_miniaturas(time, 'logo')
             messages.success(request, f'Time "{nome}" atualizado com sucesso!')
             return redirect('painel:lista_times')
         else:
@@ -116,13 +149,17 @@ def editar_time(request, time_id):
     return render(request, 'painel/editar_time.html', context)
 
 
+@orcamento_consultas(4)
 @staff_member_required
 def excluir_time(request, time_id):
     time = get_object_or_404(Time, id=time_id)
     
     if request.method == 'POST':
         nome = time.nome
-        time.delete()
+        with transaction.atomic():
+            time.delete()
+            # Os jogos do time somem em cascata; os adversários precisam ser recalculados
+            reconstruir_classificacao()
         messages.success(request, f'Time "{nome}" excluído com sucesso!')
         return redirect('painel:lista_times')
     
@@ -132,6 +169,7 @@ def excluir_time(request, time_id):
     return render(request, 'painel/excluir_time.html', context)
 
 
+@orcamento_consultas(5)
 @staff_member_required
 def lista_jogadores(request):
     times = Time.objects.all().order_by('nome')
@@ -157,16 +195,14 @@ def lista_jogadores(request):
             jogadores = jogadores.filter(ativo=False)
     
     if busca:
-        jogadores = jogadores.filter(
-            Q(nome__icontains=busca) | 
-            Q(time__nome__icontains=busca)
-        )
+        jogadores = jogadores.filter(filtro_jogadores(busca))
     
-    jogadores = jogadores.order_by('time', 'posicao', 'numero')
-    total_resultados = jogadores.count()
+    total_resultados, contagem_exata = _total_resultados(request, jogadores)
+    pagina = paginar_keyset(jogadores, 'data_cadastro', request.GET)
     
     context = {
-        'jogadores': jogadores,
+        'jogadores': pagina.itens,
+        'pagina': pagina,
         'times': times,
         'posicoes': posicoes,
         'filtros': {
@@ -176,10 +212,12 @@ def lista_jogadores(request):
             'busca': busca,
         },
         'total_resultados': total_resultados,
+        'contagem_exata': contagem_exata,
     }
     return render(request, 'painel/jogadores.html', context)
 
 
+@orcamento_consultas(3)
 @staff_member_required
 def cadastrar_jogador(request):
     times = Time.objects.all()
@@ -206,6 +244,7 @@ def cadastrar_jogador(request):
                 nacionalidade=nacionalidade if nacionalidade else 'Brasileiro',
                 ativo=ativo
             )
+            agendar_miniaturas(jogador, 'foto')
             messages.success(request, f'Jogador "{nome}" cadastrado com sucesso!')
             return redirect('painel:lista_jogadores')
         else:
@@ -221,6 +260,7 @@ def cadastrar_jogador(request):
     return render(request, 'painel/cadastrar_jogador.html', context)
 
 
+@orcamento_consultas(5)
 @staff_member_required
 def editar_jogador(request, jogador_id):
     jogador = get_object_or_404(Jogador, id=jogador_id)
@@ -247,8 +287,11 @@ def editar_jogador(request, jogador_id):
             
             if foto:
                 jogador.foto = foto
+                jogador.foto_assinatura = ''
                 
             jogador.save()
+            if foto:
+                agendar_miniaturas(jogador, 'foto')
             messages.success(request, f'Jogador "{nome}" atualizado com sucesso!')
             return redirect('painel:lista_jogadores')
         else:
@@ -262,6 +305,7 @@ def editar_jogador(request, jogador_id):
     return render(request, 'painel/editar_jogador.html', context)
 
 
+@orcamento_consultas(4)
 @staff_member_required
 def excluir_jogador(request, jogador_id):
     jogador = get_object_or_404(Jogador, id=jogador_id)
@@ -278,6 +322,7 @@ def excluir_jogador(request, jogador_id):
     return render(request, 'painel/excluir_jogador.html', context)
 
 
+@orcamento_consultas(6)
 @staff_member_required
 def lista_jogos(request):
     times = Time.objects.all().order_by('nome')
@@ -289,45 +334,19 @@ def lista_jogos(request):
     data_inicio = request.GET.get('data_inicio')
     data_fim = request.GET.get('data_fim')
     
-    # Query base
-    jogos = Jogo.objects.select_related('time_casa', 'time_visitante').all()
-    
-    # Aplicar filtros
-    if time_id and time_id != 'todos':
-        jogos = jogos.filter(
-            Q(time_casa_id=time_id) | Q(time_visitante_id=time_id)
-        )
-    
-    if rodada and rodada != 'todos':
-        try:
-            rodada_int = int(rodada)
-            jogos = jogos.filter(rodada=rodada_int)
-        except ValueError:
-            pass
-    
-    if status and status != 'todos':
-        if status == 'realizado':
-            jogos = jogos.filter(realizado=True)
-        elif status == 'agendado':
-            jogos = jogos.filter(realizado=False, data_jogo__gte=timezone.now())
-        elif status == 'atrasado':
-            jogos = jogos.filter(realizado=False, data_jogo__lt=timezone.now())
-    
-    if data_inicio:
-        jogos = jogos.filter(data_jogo__date__gte=data_inicio)
-    
-    if data_fim:
-        jogos = jogos.filter(data_jogo__date__lte=data_fim)
+    # Query base, com os mesmos filtros da exportação
+    jogos = filtrar_jogos(Jogo.objects.select_related('time_casa', 'time_visitante').all(), request.GET)
     
     # Obter lista de rodadas únicas para o filtro
     rodadas_disponiveis = Jogo.objects.values_list('rodada', flat=True).distinct().order_by('rodada')
     
-    # Ordenar
-    jogos = jogos.order_by('-data_jogo')
-    total_resultados = jogos.count()
+    # Paginar, dos jogos mais recentes para os mais antigos
+    total_resultados, contagem_exata = _total_resultados(request, jogos)
+    pagina = paginar_keyset(jogos, 'data_jogo', request.GET)
     
     context = {
-        'jogos': jogos,
+        'jogos': pagina.itens,
+        'pagina': pagina,
         'times': times,
         'rodadas_disponiveis': rodadas_disponiveis,
         'filtros': {
@@ -338,10 +357,12 @@ def lista_jogos(request):
             'data_fim': data_fim,
         },
         'total_resultados': total_resultados,
+        'contagem_exata': contagem_exata,
     }
     return render(request, 'painel/jogos.html', context)
 
 
+@orcamento_consultas(3)
 @staff_member_required
 def cadastrar_jogo(request):
     times = Time.objects.all()
@@ -358,14 +379,16 @@ def cadastrar_jogo(request):
             time_casa = Time.objects.get(id=time_casa_id)
             time_visitante = Time.objects.get(id=time_visitante_id)
             
-            jogo = Jogo.objects.create(
-                time_casa=time_casa,
-                time_visitante=time_visitante,
-                data_jogo=data_jogo,
-                local=local,
-                rodada=rodada if rodada else 1,
-                realizado=realizado
-            )
+            with transaction.atomic():
+                jogo = Jogo.objects.create(
+                    time_casa=time_casa,
+                    time_visitante=time_visitante,
+                    data_jogo=data_jogo,
+                    local=local,
+                    rodada=rodada if rodada else 1,
+                    realizado=realizado
+                )
+                atualizar_classificacao(depois=contribuicao(jogo))
             messages.success(request, 'Jogo cadastrado com sucesso!')
             return redirect('painel:lista_jogos')
         else:
@@ -377,9 +400,10 @@ def cadastrar_jogo(request):
     return render(request, 'painel/cadastrar_jogo.html', context)
 
 
+@orcamento_consultas(4)
 @staff_member_required
 def editar_jogo(request, jogo_id):
-    jogo = get_object_or_404(Jogo, id=jogo_id)
+    jogo = get_object_or_404(Jogo.objects.select_related('time_casa', 'time_visitante'), id=jogo_id)
     times = Time.objects.all()
     
     if request.method == 'POST':
@@ -393,6 +417,7 @@ def editar_jogo(request, jogo_id):
         gols_visitante = request.POST.get('gols_visitante', 0)
         
         if time_casa_id and time_visitante_id and data_jogo and time_casa_id != time_visitante_id:
+            antes = contribuicao(jogo)
             jogo.time_casa_id = time_casa_id
             jogo.time_visitante_id = time_visitante_id
             jogo.data_jogo = data_jogo
@@ -401,7 +426,9 @@ def editar_jogo(request, jogo_id):
             jogo.realizado = realizado
             jogo.gols_casa = int(gols_casa)
             jogo.gols_visitante = int(gols_visitante)
-            jogo.save()
+            with transaction.atomic():
+                jogo.save()
+                atualizar_classificacao(antes, contribuicao(jogo))
             
             messages.success(request, 'Jogo atualizado com sucesso!')
             return redirect('painel:lista_jogos')
@@ -415,13 +442,17 @@ def editar_jogo(request, jogo_id):
     return render(request, 'painel/editar_jogo.html', context)
 
 
+@orcamento_consultas(3)
 @staff_member_required
 def excluir_jogo(request, jogo_id):
-    jogo = get_object_or_404(Jogo, id=jogo_id)
+    jogo = get_object_or_404(Jogo.objects.select_related('time_casa', 'time_visitante'), id=jogo_id)
     
     if request.method == 'POST':
         descricao = str(jogo)
-        jogo.delete()
+        antes = contribuicao(jogo)
+        with transaction.atomic():
+            jogo.delete()
+            atualizar_classificacao(antes)
         messages.success(request, f'Jogo "{descricao}" excluído com sucesso!')
         return redirect('painel:lista_jogos')
     
@@ -431,82 +462,219 @@ def excluir_jogo(request, jogo_id):
     return render(request, 'painel/excluir_jogo.html', context)
 
 
+def _colunas_gols(dados):
+    return [dados.getlist(campo) for campo in ('gol_jogador', 'gol_minuto', 'gol_tipo')]
+
+
+def _gols_do_formulario(dados, jogadores):
+    """
+    Gols da súmula enviada com o resultado: listas paralelas ``gol_jogador``,
+    ``gol_minuto`` e ``gol_tipo``, uma posição por gol. ``jogadores`` são os
+    elencos do jogo por id. Retorna (gols não salvos, erros).
+    """
+    gols, erros = [], []
+    tipos = dict(Gol.TIPOS_GOL)
+    colunas = _colunas_gols(dados)
+    if len({len(coluna) for coluna in colunas}) > 1:
+        # Um formulário adulterado ou cortado: não dá para saber que gol é qual
+        return [], ['A súmula veio incompleta: cada gol precisa de jogador, minuto e tipo.']
+    for numero, (jogador_id, minuto, tipo) in enumerate(zip(*colunas), start=1):
+        jogador = jogadores.get(int(jogador_id)) if jogador_id.isdigit() else None
+        if jogador is None:
+            erros.append(f'Gol {numero}: selecione um jogador de um dos times.')
+            continue
+        if not minuto.isdigit() or not 1 <= int(minuto) <= 120:
+            erros.append(f'Gol {numero}: minuto deve estar entre 1 e 120.')
+            continue
+        if tipo not in tipos:
+            tipo = 'NORMAL'
+        gols.append(Gol(
+            jogador=jogador, time_id=jogador.time_id, minuto=int(minuto), tipo=tipo, contra=tipo == 'CONTRA',
+        ))
+    return gols, erros
+
+
+@orcamento_consultas(5)
 @staff_member_required
 def lancar_resultado(request, jogo_id):
-    jogo = get_object_or_404(Jogo, id=jogo_id)
-    jogadores_casa = jogo.time_casa.jogadores.filter(ativo=True)
-    jogadores_visitante = jogo.time_visitante.jogadores.filter(ativo=True)
+    """
+    Lança o placar e a súmula do jogo de uma vez. A lista de gols substitui a
+    do jogo e precisa bater com o placar (gols contra valem para o
+    adversário); sem gols na lista e no jogo, grava-se só o placar.
+    """
+    jogo = get_object_or_404(Jogo.objects.select_related('time_casa', 'time_visitante'), id=jogo_id)
+    # Elencos ativos, mais quem já tem gol no jogo, nos dois times em uma consulta
+    elencos = Jogador.objects.filter(time_id__in=(jogo.time_casa_id, jogo.time_visitante_id)).filter(
+        Q(ativo=True) | Q(id__in=jogo.gols.values('jogador_id'))
+    ).order_by('nome')
+    jogadores = {jogador.id: jogador for jogador in elencos}
     
     if request.method == 'POST':
-        gols_casa = request.POST.get('gols_casa', 0)
-        gols_visitante = request.POST.get('gols_visitante', 0)
-        
-        jogo.gols_casa = int(gols_casa)
-        jogo.gols_visitante = int(gols_visitante)
-        jogo.realizado = True
-        jogo.save()
+        gols, erros = _gols_do_formulario(request.POST, jogadores)
+        try:
+            gols_casa = int(request.POST.get('gols_casa', 0))
+            gols_visitante = int(request.POST.get('gols_visitante', 0))
+        except ValueError:
+            gols_casa = gols_visitante = -1
+        if gols_casa < 0 or gols_visitante < 0:
+            erros.append('Informe o placar com números inteiros.')
+        elif not erros and (gols or jogo.gols.exists()):
+            placar = placar_dos_gols(jogo, gols)
+            if placar != (gols_casa, gols_visitante):
+                erros.append(
+                    f'Os gols informados dão {placar[0]} x {placar[1]}, '
+                    f'mas o placar é {gols_casa} x {gols_visitante}.'
+                )
         
-        messages.success(request, 'Resultado lançado com sucesso!')
-        return redirect('painel:lista_jogos')
+        if not erros:
+            antes = contribuicao(jogo)
+            jogo.gols_casa = gols_casa
+            jogo.gols_visitante = gols_visitante
+            jogo.realizado = True
+            # Placar, tabela e súmula mudam juntos: uma invalidação do cache no fim
+            with transaction.atomic(), invalidacao_unica():
+                jogo.save()
+                atualizar_classificacao(antes, contribuicao(jogo))
+                substituir_gols(jogo, gols)
+            
+            messages.success(request, 'Resultado lançado com sucesso!')
+            return redirect('painel:lista_jogos')
+        for erro in erros:
+            messages.error(request, erro)
+        placar = {'gols_casa': request.POST.get('gols_casa', 0), 'gols_visitante': request.POST.get('gols_visitante', 0)}
+        linhas_gols = [
+            {'jogador': jogador, 'minuto': minuto, 'tipo': tipo}
+            for jogador, minuto, tipo in zip_longest(*_colunas_gols(request.POST), fillvalue='')
+        ]
+    else:
+        placar = {'gols_casa': jogo.gols_casa, 'gols_visitante': jogo.gols_visitante}
+        linhas_gols = [
+            {'jogador': str(jogador_id), 'minuto': str(minuto), 'tipo': tipo}
+            for jogador_id, minuto, tipo in jogo.gols.order_by('minuto', 'id').values_list('jogador_id', 'minuto', 'tipo')
+        ]
     
     context = {
         'jogo': jogo,
-        'jogadores_casa': jogadores_casa,
-        'jogadores_visitante': jogadores_visitante,
+        'jogadores_casa': [jogador for jogador in jogadores.values() if jogador.time_id == jogo.time_casa_id],
+        'jogadores_visitante': [jogador for jogador in jogadores.values() if jogador.time_id == jogo.time_visitante_id],
+        'placar': placar,
+        'linhas_gols': linhas_gols,
+        'tipos_gol': Gol.TIPOS_GOL,
     }
     return render(request, 'painel/lancar_resultado.html', context)
 
 
+@orcamento_consultas(4)
+@staff_member_required
+def novo_calendario(request):
+    """
+    Gera a temporada inteira (todos contra todos, turno e returno) e mostra
+    a prévia; os jogos só são gravados quando a prévia é confirmada. A prévia
+    fixa a semente do sorteio, então a confirmação grava o mesmo calendário.
+    """
+    times = Time.objects.all().order_by('nome')
+    ultima_rodada = Jogo.objects.aggregate(Max('rodada'))['rodada__max'] or 0
+    dados = request.POST if request.method == 'POST' else {}
+    inicio_padrao = timezone.localtime().replace(hour=16, minute=0, second=0, microsecond=0) + timedelta(days=7)
+    
+    valores = {
+        'times': dados.getlist('times') if dados else [str(time.id) for time in times],
+        'turnos': dados.get('turnos', '2'),
+        'inicio': dados.get('inicio', f'{inicio_padrao:%Y-%m-%dT%H:%M}'),
+        'intervalo': dados.get('intervalo', '7'),
+        'rodada_inicial': dados.get('rodada_inicial', str(ultima_rodada + 1)),
+        'semente': dados.get('semente') or str(random.randrange(1, 1_000_000)),
+    }
+    calendario = None
+    
+    if request.method == 'POST':
+        selecionados = [time for time in times if str(time.id) in valores['times']]
+        inicio = parse_datetime(valores['inicio'])
+        try:
+            turnos = int(valores['turnos'])
+            intervalo = timedelta(days=int(valores['intervalo']))
+            rodada_inicial = int(valores['rodada_inicial'])
+            semente = int(valores['semente'])
+        except ValueError:
+            inicio = None
+        
+        if inicio is None or intervalo <= timedelta() or rodada_inicial < 1:
+            messages.error(request, 'Confira a data de início, o intervalo e a rodada inicial.')
+        else:
+            if timezone.is_naive(inicio):
+                inicio = timezone.make_aware(inicio)
+            try:
+                calendario = gerar_calendario(
+                    selecionados, inicio, turnos=turnos, intervalo=intervalo, rodada_inicial=rodada_inicial,
+                    locais=locais_dos_times(selecionados), semente=semente,
+                )
+            except ValueError as erro:
+                messages.error(request, str(erro))
+            else:
+                if request.POST.get('acao') == 'confirmar':
+                    jogos = gravar_calendario(calendario)
+                    messages.success(request, f'{len(jogos)} jogos cadastrados em {calendario.rodadas} rodadas!')
+                    return redirect('painel:lista_jogos')
+    
+    context = {
+        'times': times,
+        'valores': valores,
+        'calendario': calendario,
+        'ultima_rodada': ultima_rodada,
+    }
+    return render(request, 'painel/calendario.html', context)
+
+
 # ========== NOVAS VIEWS PARA GOLS ==========
 
+@orcamento_consultas(7)
 @staff_member_required
 def lista_gols(request):
     times = Time.objects.all().order_by('nome')
-    jogadores = Jogador.objects.all().order_by('nome')
     
     # Obter parâmetros dos filtros
     time_id = request.GET.get('time')
     jogador_id = request.GET.get('jogador')
     jogo_id = request.GET.get('jogo')
     
-    # Query base
-    gols = Gol.objects.select_related('jogo', 'jogador', 'time').all().order_by('-data_cadastro')
+    # Query base, com os mesmos filtros da exportação
+    gols = filtrar_gols(Gol.objects.select_related(
+        'jogo__time_casa', 'jogo__time_visitante', 'jogador', 'time'
+    ).all(), request.GET)
     
-    # Aplicar filtros
-    if time_id and time_id != 'todos':
-        gols = gols.filter(time_id=time_id)
+    total_resultados, contagem_exata = _total_resultados(request, gols)
+    pagina = paginar_keyset(gols, 'data_cadastro', request.GET)
     
-    if jogador_id and jogador_id != 'todos':
-        gols = gols.filter(jogador_id=jogador_id)
-    
-    if jogo_id and jogo_id != 'todos':
-        gols = gols.filter(jogo_id=jogo_id)
-    
-    total_resultados = gols.count()
-    
-    # Obter lista de jogos para o filtro
-    jogos_disponiveis = Jogo.objects.filter(realizado=True).order_by('-data_jogo')
+    # Jogador e jogo dos filtros são carregados sob demanda (opcoes_filtro_*);
+    # aqui basta o que já está selecionado
+    jogador_filtro = Jogador.objects.filter(id=jogador_id).first() if jogador_id and jogador_id.isdigit() else None
+    jogo_filtro = (
+        Jogo.objects.select_related('time_casa', 'time_visitante').filter(id=jogo_id).first()
+        if jogo_id and jogo_id.isdigit() else None
+    )
     
     context = {
-        'gols': gols,
+        'gols': pagina.itens,
+        'pagina': pagina,
         'times': times,
-        'jogadores': jogadores,
-        'jogos_disponiveis': jogos_disponiveis,
+        'jogador_filtro': jogador_filtro,
+        'jogo_filtro': jogo_filtro,
         'filtros': {
             'time_id': time_id,
             'jogador_id': jogador_id,
             'jogo_id': jogo_id,
         },
         'total_resultados': total_resultados,
+        'contagem_exata': contagem_exata,
     }
     return render(request, 'painel/gols.html', context)
 
 
+@orcamento_consultas(4)
 @staff_member_required
 def cadastrar_gol(request):
     times = Time.objects.all().order_by('nome')
-    jogos = Jogo.objects.filter(realizado=True).order_by('-data_jogo')
-    jogadores = Jogador.objects.filter(ativo=True).order_by('nome')
+    jogos = Jogo.objects.filter(realizado=True).select_related('time_casa', 'time_visitante').order_by('-data_jogo')
     
     if request.method == 'POST':
         jogo_id = request.POST.get('jogo')
@@ -521,14 +689,16 @@ def cadastrar_gol(request):
             jogador = Jogador.objects.get(id=jogador_id)
             time = Time.objects.get(id=time_id)
             
-            gol = Gol.objects.create(
-                jogo=jogo,
-                jogador=jogador,
-                time=time,
-                minuto=minuto,
-                tipo=tipo,
-                contra=contra
-            )
+            # Os contadores de gols são atualizados junto (core.signals)
+            with transaction.atomic():
+                Gol.objects.create(
+                    jogo=jogo,
+                    jogador=jogador,
+                    time=time,
+                    minuto=minuto,
+                    tipo=tipo,
+                    contra=contra
+                )
             messages.success(request, f'Gol de {jogador.nome} cadastrado com sucesso!')
             return redirect('painel:lista_gols')
         else:
@@ -539,28 +709,25 @@ def cadastrar_gol(request):
     time_selecionado = request.GET.get('time')
     jogador_selecionado = request.GET.get('jogador')
     
-    # Filtrar jogadores por time se time selecionado
-    if time_selecionado:
-        jogadores = jogadores.filter(time_id=time_selecionado)
-    
+    # Os jogadores do time vêm do JSON dos elencos, filtrados no navegador
     context = {
         'times': times,
         'jogos': jogos,
-        'jogadores': jogadores,
         'tipos_gol': Gol.TIPOS_GOL,
         'jogo_selecionado': jogo_selecionado,
         'time_selecionado': time_selecionado,
         'jogador_selecionado': jogador_selecionado,
+        'versao_elencos': versao_elencos(),
     }
     return render(request, 'painel/cadastrar_gol.html', context)
 
 
+@orcamento_consultas(6)
 @staff_member_required
 def editar_gol(request, gol_id):
-    gol = get_object_or_404(Gol, id=gol_id)
+    gol = get_object_or_404(Gol.objects.select_related('jogador', 'jogo__time_casa', 'jogo__time_visitante'), id=gol_id)
     times = Time.objects.all().order_by('nome')
-    jogos = Jogo.objects.filter(realizado=True).order_by('-data_jogo')
-    jogadores = Jogador.objects.filter(ativo=True).order_by('nome')
+    jogos = Jogo.objects.filter(realizado=True).select_related('time_casa', 'time_visitante').order_by('-data_jogo')
     
     if request.method == 'POST':
         jogo_id = request.POST.get('jogo')
@@ -577,7 +744,8 @@ def editar_gol(request, gol_id):
             gol.minuto = minuto
             gol.tipo = tipo
             gol.contra = contra
-            gol.save()
+            with transaction.atomic():
+                gol.save()
             
             messages.success(request, 'Gol atualizado com sucesso!')
             return redirect('painel:lista_gols')
@@ -588,19 +756,21 @@ def editar_gol(request, gol_id):
         'gol': gol,
         'times': times,
         'jogos': jogos,
-        'jogadores': jogadores,
         'tipos_gol': Gol.TIPOS_GOL,
+        'versao_elencos': versao_elencos(),
     }
     return render(request, 'painel/editar_gol.html', context)
 
 
+@orcamento_consultas(4)
 @staff_member_required
 def excluir_gol(request, gol_id):
-    gol = get_object_or_404(Gol, id=gol_id)
+    gol = get_object_or_404(Gol.objects.select_related('jogador', 'jogo__time_casa', 'jogo__time_visitante'), id=gol_id)
     
     if request.method == 'POST':
         descricao = str(gol)
-        gol.delete()
+        with transaction.atomic():
+            gol.delete()
         messages.success(request, f'Gol excluído com sucesso!')
         return redirect('painel:lista_gols')
     
@@ -610,8 +780,132 @@ def excluir_gol(request, gol_id):
     return render(request, 'painel/excluir_gol.html', context)
 
 
+@orcamento_consultas(3)
+@staff_member_required
+def elencos(request):
+    """
+    Jogadores ativos de todos os times em um JSON só, para os formulários de
+    gol filtrarem por time no navegador: {"versao", "posicoes": {sigla:
+    nome}, "times": {time_id: [[id, numero, nome, posicao], ...]}}, por nome.
+
+    O conteúdo fica no cache pela versão dos elencos, que só muda quando um
+    jogador é criado, editado ou excluído. Pedido com ``?v=<versão>``, a URL
+    identifica o conteúdo e o navegador pode guardá-lo sem revalidar.
+    """
+    versao = versao_elencos()
+    conteudo = ler_por_versao('elencos', versao)
+    if conteudo is None:
+        times = {}
+        jogadores = Jogador.objects.filter(ativo=True).order_by('nome').values_list(
+            'time_id', 'id', 'numero', 'nome', 'posicao'
+        )
+        for time_id, *jogador in jogadores:
+            times.setdefault(str(time_id), []).append(jogador)
+        conteudo = json.dumps(
+            {'versao': versao, 'posicoes': dict(Jogador.POSICOES), 'times': times},
+            ensure_ascii=False, separators=(',', ':'),
+        )
+        guardar_por_versao('elencos', conteudo, versao)
+
+    response = HttpResponse(conteudo, content_type='application/json')
+    if request.GET.get('v') == versao:
+        patch_cache_control(response, private=True, max_age=ELENCOS_MAX_AGE, immutable=True)
+    else:
+        response['ETag'] = quote_etag(versao)
+        patch_cache_control(response, private=True, no_cache=True)
+        response = get_conditional_response(request, etag=response['ETag'], response=response)
+    return response
+
+
+@orcamento_consultas(3)
 @staff_member_required
-def carregar_jogadores_por_time(request):
+def opcoes_filtro_jogadores(request):
+    jogadores = Jogador.objects.order_by('nome')
     time_id = request.GET.get('time_id')
-    jogadores = Jogador.objects.filter(time_id=time_id, ativo=True).order_by('nome')
-    return render(request, 'painel/jogadores_dropdown.html', {'jogadores': jogadores})
\ No newline at end of file
+    if time_id and time_id.isdigit():
+        jogadores = jogadores.filter(time_id=time_id)
+    opcoes = [(jogador.id, jogador.nome) for jogador in jogadores]
+    return render(request, 'painel/opcoes_filtro.html', {'opcoes': opcoes, 'rotulo_todos': 'Todos os jogadores'})
+
+
+@orcamento_consultas(3)
+@staff_member_required
+def opcoes_filtro_jogos(request):
+    jogos = Jogo.objects.filter(realizado=True).select_related('time_casa', 'time_visitante').order_by('-data_jogo')
+    time_id = request.GET.get('time_id')
+    if time_id and time_id.isdigit():
+        jogos = jogos.filter(Q(time_casa_id=time_id) | Q(time_visitante_id=time_id))
+    opcoes = [
+        (jogo.id, f'{jogo.time_casa.nome} x {jogo.time_visitante.nome} ({timezone.localtime(jogo.data_jogo):%d/%m/%Y})')
+        for jogo in jogos
+    ]
+    return render(request, 'painel/opcoes_filtro.html', {'opcoes': opcoes, 'rotulo_todos': 'Todos os jogos'})
+
+
+# ========== IMPORTAÇÃO ==========
+
+@orcamento_consultas(2)
+@staff_member_required
+def importar_dados(request):
+    relatorio = None
+    
+    if request.method == 'POST':
+        tipo = request.POST.get('tipo')
+        arquivo = request.FILES.get('arquivo')
+        
+        if tipo in IMPORTADORES and arquivo:
+            try:
+                relatorio = importar(
+                    arquivo, tipo, formato_do_arquivo(arquivo.name),
+                    gravar=request.POST.get('apenas_validar') != 'on',
+                )
+            except ArquivoInvalido as erro:
+                messages.error(request, str(erro))
+            else:
+                if relatorio.gravado and not relatorio.total_erros:
+                    messages.success(request, f'{relatorio.linhas} linha(s) importada(s) com sucesso!')
+        else:
+            messages.error(request, 'Escolha o tipo de dado e o arquivo.')
+    
+    context = {
+        'tipos': sorted(IMPORTADORES),
+        'relatorio': relatorio,
+    }
+    return render(request, 'painel/importar.html', context)
+
+
+# ========== EXPORTAÇÃO ==========
+
+def _exportar(request, tipo):
+    """
+    Resposta em stream com a exportação de ``tipo`` no ``?formato=`` pedido
+    (csv, jsonl ou arrow), aplicando os filtros da querystring. As linhas
+    são lidas do banco enquanto a resposta é enviada.
+    """
+    formato = request.GET.get('formato', 'csv')
+    try:
+        conteudo = exportar(tipo, formato, request.GET)
+    except FormatoIndisponivel as erro:
+        raise Http404(str(erro))
+    tipo_conteudo, extensao = FORMATOS[formato]
+    response = StreamingHttpResponse(conteudo, content_type=tipo_conteudo)
+    response['Content-Disposition'] = f'attachment; filename="{tipo}-{timezone.localdate():%Y%m%d}.{extensao}"'
+    return response
+
+
+@orcamento_consultas(3)
+@staff_member_required
+def exportar_jogos(request):
+    return _exportar(request, 'jogos')
+
+
+@orcamento_consultas(3)
+@staff_member_required
+def exportar_gols(request):
+    return _exportar(request, 'gols')
+
+
+@orcamento_consultas(3)
+@staff_member_required
+def exportar_classificacao(request):
+    return _exportar(request, 'classificacao')